@@ -0,0 +1,113 @@
+import threading
+import queue
+import time
+from concurrent.futures import Future
+
+class ActionBatcher:
+    """
+    Micro-batcher for AI action requests.
+
+    Request threads submit single game states. A background thread collects
+    the states that arrive within a short window and evaluates them together
+    with one call to a batch function (one vectorized network pass).
+    """
+
+    def __init__(self, batch_function, max_wait=0.001, max_batch_size=256):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_function: Function taking a list of game states and returning
+                a list of actions in the same order
+            max_wait (float): Seconds to wait for more requests after the first
+                one of a batch arrives
+            max_batch_size (int): Largest number of states evaluated together
+        """
+        self.batch_function = batch_function
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Counters for monitoring how well requests are being batched
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, game_state):
+        """
+        Queue a single game state for evaluation.
+
+        Args:
+            game_state: The game state to evaluate
+
+        Returns:
+            Future: Resolves to the action for the game state
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((game_state, future))
+        return future
+
+    def get_action(self, game_state, timeout=1.0):
+        """
+        Evaluate a single game state, batched with concurrent requests.
+
+        Args:
+            game_state: The game state to evaluate
+            timeout (float): Seconds to wait for the result
+
+        Returns:
+            The action for the game state
+        """
+        return self.submit(game_state).result(timeout)
+
+    def _ensure_started(self):
+        """
+        Start the background batching thread on first use.
+        """
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    thread = threading.Thread(target=self._run, name='action-batcher', daemon=True)
+                    thread.start()
+                    self._thread = thread
+
+    def _collect(self):
+        """
+        Block for one request, then gather the others arriving within max_wait.
+
+        Returns:
+            list: (game_state, future) pairs
+        """
+        batch = [self._queue.get()]
+        wait_until = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = wait_until - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """
+        Evaluate batches until the process exits.
+        """
+        while True:
+            batch = self._collect()
+            states = [state for state, _ in batch]
+            try:
+                actions = self.batch_function(states)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), action in zip(batch, actions):
+                future.set_result(action)
@@ -1,18 +1,196 @@
-from flask import Flask, render_template, jsonify, request
+# Started first so the startup timings include the imports below
+from startup import StartupTimer, LazyModel
+startup = StartupTimer()
+
+from flask import Flask, render_template, jsonify, request, g
+from werkzeug.exceptions import HTTPException
 import os
+import re
+import json
+import uuid
+import atexit
 import base64
 import io
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+import hashlib
+import importlib
+import threading
+import time
+from functools import lru_cache, wraps
 import numpy as np
-from dino_ai import DinoGameAI
-from flappy_ai import FlappyBirdAI
+from action_batcher import ActionBatcher
+from training_jobs import TrainingJobManager
+from population_registry import PopulationRegistry
+from tictactoe_ai import TicTacToeSolver
+from chess_engine import Board, ChessEngine, START_FEN
+from opening_book import OpeningBook
+from position_cache import PositionCache
+from metrics_registry import MetricsRegistry, CONTENT_TYPE
+
+# WebSocket support is optional, clients fall back to HTTP polling without it
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
 
 app = Flask(__name__)
+sock = Sock(app) if Sock is not None else None
+
+startup.mark('imports')
+
+# The NEAT stack is imported and the AIs built on first use (or by warm_up)
+GAME_CLASSES = { 'dino': ('dino_ai', 'DinoGameAI'), 'flappy': ('flappy_ai', 'FlappyBirdAI') }
+
+def game_ai_class(game):
+    module, name = GAME_CLASSES[game]
+    return getattr(importlib.import_module(module), name)
+
+# Shared models, continuing from the checkpoints and best genomes of the
+# previous run. They serve visitors who haven't trained their own AI yet
+dino_ai   = LazyModel('dino_ai', lambda: game_ai_class('dino')(restore=True), startup)
+flappy_ai = LazyModel('flappy_ai', lambda: game_ai_class('flappy')(restore=True), startup)
+GAME_AIS  = { 'dino': dino_ai, 'flappy': flappy_ai }
+
+# --- SESSIONS ---
+# Each browser session trains its own populations, which start as a copy of
+# the shared model. Idle ones are spilled to disk and reloaded on demand
+SESSION_COOKIE   = 'arcade_session'
+SESSION_MAX_AGE  = 30 * 24 * 3600  # seconds
+SESSION_ID       = re.compile(r'^[0-9a-f]{32}$')
+SESSION_DIR      = os.path.join('checkpoints', 'sessions')
+SESSION_LIMITS   = { 'max_resident': 64, 'max_bytes': 256 * 2**20, 'idle_timeout': 15 * 60 }
+session_writer   = LazyModel('checkpoint_writer',
+                             lambda: importlib.import_module('checkpoints').CheckpointWriter())
+
+def build_session_ai(game, checkpoint_dir):
+    if not os.path.isdir(checkpoint_dir):
+        GAME_AIS[game].neat_algorithm.copy_checkpoints(checkpoint_dir)
+    return game_ai_class(game)(checkpoint_dir=checkpoint_dir, checkpoint_writer=session_writer.get(),
+                               restore=True)
+
+populations = PopulationRegistry(build_session_ai, SESSION_DIR, **SESSION_LIMITS)
+atexit.register(populations.spill_all)
+
+def session_id(create=False):
+    # Sessions are identified by a random cookie, set when a game page is
+    # opened or training is started
+    if 'session_id' not in g:
+        sid = request.cookies.get(SESSION_COOKIE, '')
+        g.session_id = sid if SESSION_ID.match(sid) else None
+    if g.session_id is None and create:
+        g.session_id = g.new_session_id = uuid.uuid4().hex
+    return g.session_id
+
+@app.after_request
+def set_session_cookie(response):
+    if 'new_session_id' in g:
+        response.set_cookie(SESSION_COOKIE, g.new_session_id, max_age=SESSION_MAX_AGE,
+                            httponly=True, samesite='Lax')
+    return response
+
+def session_ai(game):
+    # The session's own AI once it has trained one, the shared model before
+    sid = session_id()
+    if sid is not None and populations.has(game, sid):
+        return populations.get(game, sid)
+    return GAME_AIS[game]
+
+@app.route('/api/sessions/stats')
+def session_stats():
+    return jsonify(populations.stats())
+
+# --- METRICS ---
+# Request rates, latencies and errors of the game API, and the state of the
+# AIs, scraped from /metrics
+metrics = MetricsRegistry()
+request_count   = metrics.counter('arcade_http_requests_total', 'Requests served.', ('route', 'status'))
+request_errors  = metrics.counter('arcade_http_request_errors_total',
+                                  'Requests answered with a 4xx or 5xx status.', ('route',))
+request_latency = metrics.histogram('arcade_http_request_duration_seconds',
+                                    'Time spent handling a request.', ('route',))
+
+def instrumented(route):
+    # Wraps a view rather than using request hooks, which would go through
+    # Flask's context proxies and cost several times more per request
+    latency = request_latency.labels(route)
+    errors  = request_errors.labels(route)
+    counts  = {}
+    def decorate(view):
+        @wraps(view)
+        def timed_view(*args, **kwargs):
+            start  = time.perf_counter()
+            status = 500
+            try:
+                response = view(*args, **kwargs)
+                status   = response[1] if isinstance(response, tuple) else response.status_code
+                return response
+            except HTTPException as e:
+                status = e.code
+                raise
+            finally:
+                latency.observe(time.perf_counter() - start)
+                count = counts.get(status)
+                if count is None:
+                    count = counts[status] = request_count.labels(route, status)
+                count.inc()
+                if status >= 400:
+                    errors.inc()
+        return timed_view
+    return decorate
+
+def ai_gauge(read, combine=max):
+    # Gauges read the shared AI and the resident session AIs, which do the
+    # web training, when scraped, without building unloaded ones. Each
+    # game reports the combined value, e.g. the furthest trained AI
+    def samples():
+        values = {}
+        for game, shared in GAME_AIS.items():
+            ais = ([shared] if shared.loaded else []) + populations.resident(game)
+            game_values = [value for value in map(read, ais) if value is not None]
+            if game_values:
+                values[(game,)] = combine(game_values)
+        return values
+    return samples
+
+def model_age(ai):
+    updated_at = ai.neat_algorithm.best_genome_updated_at
+    return None if updated_at is None else time.time() - updated_at
+
+metrics.gauge('arcade_ai_generation', 'Most generations trained by any resident AI.', ('game',),
+              ai_gauge(lambda ai: ai.current_generation))
+metrics.gauge('arcade_ai_best_fitness', 'Best fitness of any resident AI.', ('game',),
+              ai_gauge(lambda ai: ai.best_fitness))
+metrics.gauge('arcade_ai_model_age_seconds', 'Seconds since any resident AI\'s best genome changed.',
+              ('game',), ai_gauge(model_age, min))
+metrics.gauge('arcade_sessions_resident', 'Session AIs held in memory.', (),
+              lambda: { (): populations.stats()['resident'] })
 
-# Initialize AI instances
-dino_ai   = DinoGameAI()
-flappy_ai = FlappyBirdAI()
+@app.route('/metrics')
+def prometheus_metrics():
+    return app.response_class(metrics.render(), content_type=CONTENT_TYPE)
+
+# Training runs on background threads, one queue per session and game
+training_jobs = TrainingJobManager(populations.lease, GAME_AIS)
+
+def batch_actions(requests):
+    # Concurrent single-state requests are evaluated together, one batch per
+    # AI since every session may have its own network
+    batches = {}
+    for i, (ai, state) in enumerate(requests):
+        batches.setdefault(id(ai), (ai, [], []))
+        batches[id(ai)][1].append(i)
+        batches[id(ai)][2].append(state)
+    actions = [None] * len(requests)
+    for ai, indices, states in batches.values():
+        for i, action in zip(indices, ai.get_actions(states)):
+            actions[i] = action
+    return actions
+
+ACTION_BATCH_WINDOW = 0.001  # seconds
+action_batcher = ActionBatcher(batch_actions, max_wait=ACTION_BATCH_WINDOW)
+
+def is_game_state(state):
+    return (isinstance(state, list) and len(state) == 3 and
+            all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in state))
 
 @app.route('/')
 def home():
@@ -20,6 +198,7 @@ def home():
 
 @app.route('/dino')
 def dino():
+    session_id(create=True)
     return render_template('dino.html')
 
 @app.route('/chess')
@@ -28,56 +207,213 @@ def chess():
 
 @app.route('/flappy')
 def flappy():
+    session_id(create=True)
     return render_template('flappy.html')
 
-@app.route('/api/dino/train', methods=['POST'])
-def train_dino_ai():
+def start_training(game):
     generations = request.json.get('generations', 5)
-    dino_ai.train(generations)
-    return jsonify({
-        'success': True,
-        'generation':     dino_ai.current_generation,
-        'best_fitness':   dino_ai.best_fitness,
-        'fitness_chart':  dino_ai.get_fitness_chart(),
-        'species_chart':  dino_ai.get_species_chart(),
-        'network_chart':  dino_ai.get_network_chart()
+    if not isinstance(generations, int) or isinstance(generations, bool) or generations < 1:
+        return jsonify({ 'error': 'generations must be a positive integer' }), 400
+    profile = request.json.get('profile', False)
+    if not isinstance(profile, bool):
+        return jsonify({ 'error': 'profile must be true or false' }), 400
+    job = training_jobs.submit(game, generations, session_id(create=True), profile)
+    return jsonify({ 'success': True, **job.to_dict() }), 202
+
+def get_metrics(game):
+    since = request.args.get('since', 0, type=int)
+    return jsonify(session_ai(game).get_metrics(since))
+
+def get_profile(game):
+    since = request.args.get('since', 0, type=int)
+    return jsonify(session_ai(game).get_profile(since))
+
+def conditional_json(etag, build):
+    # Clients revalidating an unchanged resource get a 304 and nothing is built
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    return response
+
+def get_model(game):
+    # Browsers poll with If-None-Match and get a 304 until the best genome changes
+    try:
+        exported = session_ai(game).export_model()
+    except ValueError as e:
+        return jsonify({ 'error': str(e) }), 422
+    if exported is None:
+        return jsonify({ 'error': 'no trained model yet' }), 404
+    model, etag = exported
+    response = conditional_json(etag, lambda: model)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def get_charts(game):
+    sid = session_id()
+    if sid is None or not populations.has(game, sid):
+        return render_charts(GAME_AIS[game])
+    # Rendered charts are cached on the AI, so the lease re-measures its size
+    with populations.lease(game, sid, modifies=False) as ai:
+        return render_charts(ai)
+
+def render_charts(ai):
+    etag = hashlib.sha1(
+        f"{ai.get_charts_key()}:{ai.current_generation}:{ai.best_fitness}".encode()
+    ).hexdigest()
+    return conditional_json(etag, lambda: {
+        'generation':     ai.current_generation,
+        'best_fitness':   ai.best_fitness,
+        'fitness_chart':  ai.get_fitness_chart(),
+        'species_chart':  ai.get_species_chart(),
+        'network_chart':  ai.get_network_chart()
     })
 
+@app.route('/api/dino/train', methods=['POST'])
+@instrumented('/api/dino/train')
+def train_dino_ai():
+    return start_training('dino')
+
 @app.route('/api/flappy/train', methods=['POST'])
+@instrumented('/api/flappy/train')
 def train_flappy_ai():
-    generations = request.json.get('generations', 5)
-    flappy_ai.train(generations)
-    return jsonify({
-        'success': True,
-        'generation':     flappy_ai.current_generation,
-        'best_fitness':   flappy_ai.best_fitness,
-        'fitness_chart':  flappy_ai.get_fitness_chart(),
-        'species_chart':  flappy_ai.get_species_chart(),
-        'network_chart':  flappy_ai.get_network_chart()
-    })
+    return start_training('flappy')
+
+@app.route('/api/dino/metrics')
+def get_dino_metrics():
+    return get_metrics('dino')
+
+@app.route('/api/flappy/metrics')
+def get_flappy_metrics():
+    return get_metrics('flappy')
+
+@app.route('/api/dino/profile')
+def get_dino_profile():
+    return get_profile('dino')
+
+@app.route('/api/flappy/profile')
+def get_flappy_profile():
+    return get_profile('flappy')
+
+@app.route('/api/dino/model')
+@instrumented('/api/dino/model')
+def get_dino_model():
+    return get_model('dino')
+
+@app.route('/api/flappy/model')
+@instrumented('/api/flappy/model')
+def get_flappy_model():
+    return get_model('flappy')
+
+@app.route('/api/dino/charts')
+def get_dino_charts():
+    return get_charts('dino')
+
+@app.route('/api/flappy/charts')
+def get_flappy_charts():
+    return get_charts('flappy')
+
+@app.route('/api/jobs/<job_id>')
+def get_training_job(job_id):
+    job = training_jobs.get(job_id)
+    if job is None or job.session != session_id():
+        return jsonify({ 'error': 'unknown job' }), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_training_job(job_id):
+    job = training_jobs.get(job_id)
+    if job is None or job.session != session_id():
+        return jsonify({ 'error': 'unknown job' }), 404
+    training_jobs.cancel(job_id)
+    return jsonify(job.to_dict())
 
 @app.route('/api/dino/action', methods=['POST'])
+@instrumented('/api/dino/action')
 def get_dino_action():
     game_state = request.json.get('game_state', [100, 20, 10])
-    action     = dino_ai.get_action(game_state)
+    if not is_game_state(game_state):
+        return jsonify({ 'error': 'game_state must be a list of 3 numbers' }), 400
+    action     = action_batcher.get_action((session_ai('dino'), game_state))
     return jsonify({ 'action': action })
 
 @app.route('/api/flappy/action', methods=['POST'])
+@instrumented('/api/flappy/action')
 def get_flappy_action():
     game_state = request.json.get('game_state', [100, 50, 50])
-    action     = flappy_ai.get_action(game_state)
+    if not is_game_state(game_state):
+        return jsonify({ 'error': 'game_state must be a list of 3 numbers' }), 400
+    action     = action_batcher.get_action((session_ai('flappy'), game_state))
     return jsonify({ 'action': action })
 
+@app.route('/api/dino/actions', methods=['POST'])
+def get_dino_actions():
+    game_states = request.json.get('game_states', [])
+    if not isinstance(game_states, list) or not all(map(is_game_state, game_states)):
+        return jsonify({ 'error': 'game_states must be a list of 3-number lists' }), 400
+    actions     = session_ai('dino').get_actions(game_states)
+    return jsonify({ 'actions': actions })
+
+@app.route('/api/flappy/actions', methods=['POST'])
+def get_flappy_actions():
+    game_states = request.json.get('game_states', [])
+    if not isinstance(game_states, list) or not all(map(is_game_state, game_states)):
+        return jsonify({ 'error': 'game_states must be a list of 3-number lists' }), 400
+    actions     = session_ai('flappy').get_actions(game_states)
+    return jsonify({ 'actions': actions })
+
+# --- REAL-TIME ACTION STREAM ---
+def stream_actions(ws, game):
+    """
+    Answer one game session's per-frame states over a WebSocket.
+
+    The client sends {"seq": n, "game_state": [...]} each frame and gets
+    {"seq": n, "action": bool} back, so it can drop stale replies.
+    """
+    if game not in GAME_AIS:
+        ws.close(reason=1008, message='unknown game')
+        return
+
+    while True:
+        try:
+            message = json.loads(ws.receive())
+        except (TypeError, ValueError):
+            message = None
+        if not isinstance(message, dict):
+            ws.send(json.dumps({ 'error': 'messages must be JSON objects' }))
+            continue
+
+        game_state = message.get('game_state')
+        if not is_game_state(game_state):
+            reply = { 'seq': message.get('seq'), 'error': 'game_state must be a list of 3 numbers' }
+        else:
+            reply = { 'seq': message.get('seq'), 'action': session_ai(game).get_action(game_state) }
+        ws.send(json.dumps(reply))
+
+if sock is not None:
+    sock.route('/ws/<game>')(stream_actions)
+
 @app.route('/api/placeholder_charts')
 def placeholder_charts():
-    # Create placeholder charts for initial display
+    charts, etag = render_placeholder_charts()
+    return conditional_json(etag, lambda: charts)
+
+@lru_cache(maxsize=1)
+def render_placeholder_charts():
+    # Create placeholder charts for initial display, once per process. The
+    # data is seeded so the charts and their ETag survive restarts
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+
+    rng = np.random.RandomState(0)
 
     # Fitness chart
     fig1 = Figure(figsize=(10, 6))
     canvas1 = FigureCanvas(fig1)
     ax1 = fig1.add_subplot(111)
     x = np.arange(10)
-    y = np.random.rand(10) * 100
+    y = rng.rand(10) * 100
     ax1.plot(x, y, 'b-', label='Best Fitness')
     ax1.set_xlabel('Generation')
     ax1.set_ylabel('Fitness')
@@ -92,7 +428,7 @@ def placeholder_charts():
     fig2 = Figure(figsize=(10, 6))
     canvas2 = FigureCanvas(fig2)
     ax2 = fig2.add_subplot(111)
-    y2 = np.random.randint(1, 10, 10)
+    y2 = rng.randint(1, 10, 10)
     ax2.plot(x, y2, 'g-')
     ax2.set_xlabel('Generation')
     ax2.set_ylabel('Number of Species')
@@ -134,66 +470,92 @@ def placeholder_charts():
     canvas3.print_png(buf3)
     network_chart = base64.b64encode(buf3.getbuffer()).decode('ascii')
 
-    return jsonify({
+    charts = {
         'fitness_chart':  fitness_chart,
         'species_chart':  species_chart,
         'network_chart':  network_chart
+    }
+    return charts, hashlib.sha1(json.dumps(charts, sort_keys=True).encode()).hexdigest()
+
+# --- CHESS ---
+# Each difficulty level is a search time budget in seconds
+CHESS_TIME_LIMITS = {
+    'beginner':     0.05,
+    'intermediate': 0.2,
+    'advanced':     0.5,
+    'expert':       1.0,
+    'grandmaster':  2.0
+}
+# Searched positions are cached on disk and shared by all worker processes
+CHESS_CACHE_FILE = os.path.join('checkpoints', 'chess_positions.bin')
+with startup.phase('chess_ai'):
+    chess_ai = ChessEngine(opening_book=OpeningBook(), position_cache=PositionCache(CHESS_CACHE_FILE))
+
+@app.route('/api/chess/best_move', methods=['POST'])
+def chess_best_move():
+    data  = request.json
+    level = data.get('level', 'beginner')
+    if level not in CHESS_TIME_LIMITS:
+        return jsonify({ 'error': f"level must be one of {', '.join(CHESS_TIME_LIMITS)}" }), 400
+    try:
+        board = Board(data.get('fen', START_FEN))
+    except ValueError as e:
+        return jsonify({ 'error': str(e) }), 400
+    return jsonify(chess_ai.best_move(board, CHESS_TIME_LIMITS[level]))
+
+@app.route('/api/chess/stats')
+def chess_stats():
+    book = chess_ai.opening_book
+    lookups = book.hits + book.misses
+    return jsonify({
+        'book':  {
+            'positions': len(book),
+            'hits':      book.hits,
+            'misses':    book.misses,
+            'hit_rate':  book.hits / lookups if lookups else 0.0
+        },
+        'cache': chess_ai.position_cache.stats()
     })
 
 # --- TIC TAC TOE ---
+# Every position reachable in play is solved once by warm_up, requests are
+# table lookups after that (and searched on demand before)
+tictactoe_solver = TicTacToeSolver()
+
 @app.route('/tictactoe')
 def tic_tac_toe():
     return render_template('tictactoe.html')
 
-def check_winner(board):
-    wins = [
-        (0,1,2),(3,4,5),(6,7,8),
-        (0,3,6),(1,4,7),(2,5,8),
-        (0,4,8),(2,4,6)
-    ]
-    for a, b, c in wins:
-        if board[a] and board[a] == board[b] == board[c]:
-            return board[a]
-    if all(cell for cell in board):
-        return 'Draw'
-    return None
-
-def minimax(board, player, ai_symbol, human_symbol):
-    winner = check_winner(board)
-    if winner == ai_symbol:
-        return 1, None
-    if winner == human_symbol:
-        return -1, None
-    if winner == 'Draw':
-        return 0, None
-
-    moves = []
-    for idx, cell in enumerate(board):
-        if not cell:
-            new_board = board.copy()
-            new_board[idx] = player
-            next_p = human_symbol if player == ai_symbol else ai_symbol
-            score, _ = minimax(new_board, next_p, ai_symbol, human_symbol)
-            moves.append((score, idx))
-
-    if player == ai_symbol:
-        max_score = max(moves, key=lambda x: x[0])[0]
-        best_idxs = [idx for score, idx in moves if score == max_score]
-        return max_score, best_idxs[0]
-    else:
-        min_score = min(moves, key=lambda x: x[0])[0]
-        best_idxs = [idx for score, idx in moves if score == min_score]
-        return min_score, best_idxs[0]
-
 @app.route('/api/tictactoe/ai_move', methods=['POST'])
+@instrumented('/api/tictactoe/ai_move')
 def tictactoe_ai_move():
     data         = request.json
     board        = data.get('board', [''] * 9)
     ai_symbol    = data.get('ai', 'O')
     human_symbol = 'X' if ai_symbol == 'O' else 'O'
-    _, move      = minimax(board, ai_symbol, ai_symbol, human_symbol)
+    _, move      = tictactoe_solver.best_move(board, ai_symbol, human_symbol)
     return jsonify({ 'move': move })
 
+# --- STARTUP ---
+@app.route('/api/startup')
+def startup_stats():
+    return jsonify({
+        **startup.to_dict(),
+        'loaded': { name: ai.loaded for name, ai in GAME_AIS.items() }
+    })
+
+def warm_up():
+    # Build what the first requests need in the background, so importing the
+    # app (and a restarted worker becoming ready) doesn't wait for it
+    for ai in GAME_AIS.values():
+        ai.get()
+    with startup.phase('tictactoe_precompute'):
+        tictactoe_solver.precompute()
+    startup.mark('warm')
+
+startup.mark('imported')
+threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
 if __name__ == '__main__':
     # Ensure directories exist
     os.makedirs('static/images', exist_ok=True)
@@ -0,0 +1,86 @@
+"""
+Measure the latency of the AI action path.
+
+Times get_action with the cached compiled network against rebuilding a
+neat-python network on every call (the previous behaviour), then times the
+full /api/<game>/action route through the Flask test client.
+
+Usage:
+    python benchmarks/bench_action_latency.py [--game dino|flappy] [--requests 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import neat
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as arcade
+
+GAME_STATES = {
+    'dino': [80, 20, 10],
+    'flappy': [200, 30, 70],
+}
+
+def percentiles(samples):
+    """
+    Summarize latency samples.
+
+    Returns:
+        str: p50/p99 in microseconds
+    """
+    p50, p99 = np.percentile(np.array(samples) * 1e6, [50, 99])
+    return f"p50 {p50:8.1f} us   p99 {p99:8.1f} us"
+
+def time_calls(function, count):
+    """
+    Time a function call repeatedly.
+
+    Returns:
+        list: Seconds per call
+    """
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def run(game, count, generations):
+    """
+    Train briefly, then time the action path.
+
+    Args:
+        game (str): 'dino' or 'flappy'
+        count (int): Calls per measurement
+        generations (int): Generations to train before measuring
+    """
+    ai = arcade.dino_ai if game == 'dino' else arcade.flappy_ai
+    ai.train(generations)
+    state = GAME_STATES[game]
+    config = ai.neat_algorithm.config
+
+    def rebuild_every_call():
+        net = neat.nn.FeedForwardNetwork.create(ai.best_genome, config)
+        return net.activate([state[0] / 100.0, state[1] / 50.0, state[2] / 20.0])
+
+    client = arcade.app.test_client()
+
+    def request_action():
+        return client.post(f'/api/{game}/action', json={'game_state': state})
+
+    print(f"rebuild per call:  {percentiles(time_calls(rebuild_every_call, count))}")
+    print(f"cached get_action: {percentiles(time_calls(lambda: ai.get_action(state), count))}")
+    print(f"HTTP route:        {percentiles(time_calls(request_action, count))}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(GAME_STATES), default='flappy')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--generations', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.game, args.requests, args.generations)
@@ -0,0 +1,112 @@
+"""
+Load test: HTTP polling of /api/<game>/action against the /ws/<game> stream.
+
+Starts the app on a local threaded Werkzeug server, then runs the same number
+of concurrent clients over each transport. Polling clients open a new HTTP
+connection per decision, as the browser's fetch does against the dev server.
+Stream clients keep one WebSocket open and send one state per reply.
+
+Usage:
+    python benchmarks/bench_action_transport.py [--clients 8] [--decisions 500]
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+from simple_websocket import Client
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as arcade
+
+GAME_STATE = [200, 30, 70]
+
+def poll_client(port, game, decisions, samples):
+    """
+    Ask for decisions over plain HTTP, one connection per request.
+    """
+    body = json.dumps({'game_state': GAME_STATE})
+    headers = {'Content-Type': 'application/json'}
+    for _ in range(decisions):
+        start = time.perf_counter()
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        connection.request('POST', f'/api/{game}/action', body, headers)
+        json.loads(connection.getresponse().read())
+        connection.close()
+        samples.append(time.perf_counter() - start)
+
+def stream_client(port, game, decisions, samples):
+    """
+    Ask for decisions over a single WebSocket connection.
+    """
+    ws = Client.connect(f'ws://127.0.0.1:{port}/ws/{game}')
+    try:
+        for seq in range(decisions):
+            start = time.perf_counter()
+            ws.send(json.dumps({'seq': seq, 'game_state': GAME_STATE}))
+            json.loads(ws.receive())
+            samples.append(time.perf_counter() - start)
+    finally:
+        ws.close()
+
+def load(client_function, port, game, clients, decisions):
+    """
+    Run concurrent clients and summarize throughput and latency.
+
+    Returns:
+        str: decisions/s, p50 and p99 latency
+    """
+    samples = []
+    threads = [
+        threading.Thread(target=client_function, args=(port, game, decisions, samples))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    p50, p99 = np.percentile(np.array(samples) * 1000, [50, 99])
+    return f"{len(samples) / elapsed:9.0f} decisions/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms"
+
+def run(game, clients, decisions, generations):
+    """
+    Train briefly, serve the app and load it over both transports.
+
+    Args:
+        game (str): 'dino' or 'flappy'
+        clients (int): Concurrent clients per transport
+        decisions (int): Decisions requested by each client
+        generations (int): Generations to train before measuring
+    """
+    if arcade.sock is None:
+        sys.exit('flask-sock is not installed, the WebSocket route is unavailable')
+
+    arcade.GAME_AIS[game].train(generations)
+    server = make_server('127.0.0.1', 0, arcade.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        print(f"{clients} clients x {decisions} decisions ({game})")
+        print(f"HTTP polling: {load(poll_client, server.port, game, clients, decisions)}")
+        print(f"WebSocket:    {load(stream_client, server.port, game, clients, decisions)}")
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(arcade.GAME_AIS), default='flappy')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--decisions', type=int, default=500)
+    parser.add_argument('--generations', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.game, args.clients, args.decisions, args.generations)
@@ -0,0 +1,103 @@
+"""
+Benchmark: neat.Checkpointer (gzipped pickle) against the compact checkpoint format.
+
+Builds a population of mutated genomes, then measures for each format the
+time the training thread is blocked per checkpoint, the file size, and the
+time to restore. For the compact format the blocking time is only the
+snapshot; encoding and writing happen on the writer thread and are reported
+separately.
+
+Usage:
+    python benchmarks/bench_checkpoints.py [--pop-size 500] [--mutations 20] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import neat
+import numpy as np
+
+import checkpoints
+
+def build_population(pop_size, mutations, seed=0):
+    """
+    Create a population and grow its genomes with repeated mutation.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'neat_config.txt')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, config_path)
+    config.pop_size = pop_size
+    population = neat.Population(config)
+    for genome in population.population.values():
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+        genome.fitness = random.random() * 100
+    population.species.speciate(config, population.population, population.generation)
+    return population
+
+def best_of(function, repeat):
+    """
+    Run a function several times.
+
+    Returns:
+        tuple: (fastest time in seconds, last result)
+    """
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run(pop_size, mutations, repeat):
+    population = build_population(pop_size, mutations)
+    config = population.config
+    genes = sum(len(g.nodes) + len(g.connections) for g in population.population.values())
+    print(f"{pop_size} genomes, {genes} genes, {len(population.species.species)} species")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # neat.Checkpointer: pickling, compressing and writing all block training
+        legacy = neat.Checkpointer(filename_prefix=os.path.join(directory, 'legacy-'))
+        legacy_save, _ = best_of(lambda: legacy.save_checkpoint(
+            config, population.population, population.species, population.generation), repeat)
+        legacy_path = os.path.join(directory, f'legacy-{population.generation}')
+        legacy_size = os.path.getsize(legacy_path)
+        legacy_restore, _ = best_of(lambda: neat.Checkpointer.restore_checkpoint(legacy_path), repeat)
+
+        # Compact format: only the snapshot blocks training
+        compact_path = os.path.join(directory, 'compact.ckpt')
+        snapshot_time, snapshot = best_of(lambda: checkpoints.snapshot_population(population), repeat)
+        encode_time, data = best_of(lambda: snapshot.to_bytes(), repeat)
+        write_time, _ = best_of(lambda: checkpoints.write_atomic(compact_path, data), repeat)
+        compact_restore, restored = best_of(lambda: checkpoints.restore_population(
+            checkpoints.read_snapshot(compact_path), config), repeat)
+
+    same = all(
+        restored[0].population[key].distance(genome, config.genome_config) == 0
+        for key, genome in population.population.items()
+    )
+
+    print(f"  {'':24s} {'blocking':>10s} {'background':>11s} {'size':>10s} {'restore':>10s}")
+    print(f"  {'neat.Checkpointer':24s} {legacy_save * 1000:8.1f}ms {'-':>11s} "
+          f"{legacy_size / 1024:8.1f}KB {legacy_restore * 1000:8.1f}ms")
+    print(f"  {'compact (async)':24s} {snapshot_time * 1000:8.1f}ms {(encode_time + write_time) * 1000:9.1f}ms "
+          f"{len(data) / 1024:8.1f}KB {compact_restore * 1000:8.1f}ms")
+    print(f"  restore speedup {legacy_restore / compact_restore:.1f}x, "
+          f"blocking time {legacy_save / snapshot_time:.1f}x lower, genomes identical: {same}")
+    return same
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pop-size', type=int, default=500)
+    parser.add_argument('--mutations', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.pop_size, args.mutations, args.repeat) else 1)
@@ -0,0 +1,90 @@
+"""
+Benchmark: chess engine move generation (perft) and search speed (nodes/sec).
+
+Perft counts every legal move sequence to a fixed depth and checks the total
+against the published values, which catches move generator bugs (castling,
+en passant, promotions, pins). The search benchmark runs the engine on each
+difficulty level's time budget and reports depth reached and nodes/sec.
+
+Usage:
+    python benchmarks/bench_chess.py [--perft-depth 3] [--levels beginner expert]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_engine import Board, ChessEngine, START_FEN, perft
+
+# Standard perft positions with their node counts by depth
+PERFT_POSITIONS = {
+    'start': (START_FEN, [20, 400, 8902, 197281, 4865609]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 [48, 2039, 97862, 4085603]),
+    'endgame': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                [14, 191, 2812, 43238, 674624]),
+    'promotions': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+                   [6, 264, 9467, 422333]),
+    'pins': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+             [44, 1486, 62379, 2103487]),
+    'middlegame': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                   [46, 2079, 89890, 3894594]),
+}
+
+# Positions for the search benchmark
+SEARCH_POSITIONS = {
+    'opening': START_FEN,
+    'italian': 'r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3',
+    'kiwipete': PERFT_POSITIONS['kiwipete'][0],
+    'endgame': PERFT_POSITIONS['endgame'][0],
+}
+
+def run_perft(depth):
+    """
+    Run perft on every position and check the counts.
+
+    Returns:
+        bool: True if every count matched
+    """
+    ok = True
+    print(f"Perft to depth {depth}")
+    for name, (fen, expected) in PERFT_POSITIONS.items():
+        board = Board(fen)
+        d = min(depth, len(expected))
+        start = time.perf_counter()
+        nodes = perft(board, d)
+        elapsed = time.perf_counter() - start
+        status = 'ok' if nodes == expected[d - 1] else f'FAIL (expected {expected[d - 1]})'
+        ok = ok and nodes == expected[d - 1]
+        print(f"  {name:12s} depth {d}  {nodes:9d} nodes  {elapsed:7.2f}s  "
+              f"{nodes / elapsed:9.0f} nodes/s  {status}")
+    return ok
+
+def run_search(levels):
+    """
+    Search every position at each level's time budget with a fresh engine.
+
+    Args:
+        levels (list): Difficulty level names
+    """
+    from app import CHESS_TIME_LIMITS
+
+    print("Search")
+    for level in levels:
+        time_limit = CHESS_TIME_LIMITS[level]
+        for name, fen in SEARCH_POSITIONS.items():
+            result = ChessEngine().search(Board(fen), time_limit)
+            print(f"  {level:12s} {name:10s} {result['move']}  depth {result['depth']:2d}  "
+                  f"{result['nodes']:8d} nodes  {result['time']:5.2f}s  {result['nps']:7d} nodes/s")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--perft-depth', type=int, default=3)
+    parser.add_argument('--levels', nargs='+', default=['beginner', 'advanced', 'grandmaster'])
+    args = parser.parse_args()
+
+    ok = run_perft(args.perft_depth)
+    run_search(args.levels)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,209 @@
+"""
+Compare selection quality with shared (common) courses and independent ones.
+
+Trains a seeded population for a few generations, then estimates each
+genome's expected fitness from --reference courses. In every trial, each
+genome is scored with K episodes in two ways: on K courses of its own, or
+on a CourseSet of K courses shared by the whole population. The report
+shows how well each estimate selects genomes, per K:
+- rank: Spearman correlation with the reference fitness
+- top: share of the reference top survival_threshold (20%) selected
+- efficiency: reference fitness gained by the selected genomes over the
+  population mean, as a share of what selecting the true top would gain
+
+It also scores a generation through NEATAlgorithm.evaluate_genomes with
+worker processes attached to the shared courses, and checks that the
+result matches the serial path. Finally it trains with the default budget
+and checks that every elite carried over to the next generation takes its
+fitness from the fitness cache. The script exits with status 1 if either
+check fails.
+
+Usage:
+    python benchmarks/bench_common_courses.py [--game dino|flappy] [--generations 3] [--trials 10]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiled_network import CompiledNetwork
+from course_sets import CourseSet
+from dino_ai import DinoCourse, DinoGameAI, simulate_dino_game
+from flappy_ai import FlappyBirdAI, FlappyCourse, simulate_flappy_game
+
+GAMES = {
+    'dino': (DinoGameAI, DinoCourse, simulate_dino_game, lambda ai: {'game_speed': ai.game_speed}),
+    'flappy': (FlappyBirdAI, FlappyCourse, simulate_flappy_game, lambda ai: {}),
+}
+
+def ranks(values):
+    """
+    Ranks of values, ties sharing their mean rank.
+    """
+    values = np.asarray(values)
+    order = np.argsort(values, kind='mergesort')
+    result = np.empty(len(values))
+    result[order] = np.arange(len(values))
+    for value in np.unique(values):
+        tied = values == value
+        result[tied] = result[tied].mean()
+    return result
+
+def spearman(a, b):
+    a, b = ranks(a), ranks(b)
+    if a.std() == 0 or b.std() == 0:
+        return 0.0
+    return float(np.corrcoef(a, b)[0, 1])
+
+def selection(estimate, reference, survivors):
+    """
+    Returns:
+        tuple: (share of the true top selected, selection efficiency)
+    """
+    chosen = np.argsort(-estimate, kind='mergesort')[:survivors]
+    best = np.argsort(-reference, kind='mergesort')[:survivors]
+    top = len(set(chosen) & set(best)) / survivors
+    possible = reference[best].mean() - reference.mean()
+    efficiency = (reference[chosen].mean() - reference.mean()) / possible if possible > 0 else 1.0
+    return top, efficiency
+
+def score_shared(networks, simulate_function, params, course_class, course_kwargs, seeds, frames):
+    courses = CourseSet.generate(course_class, seeds, frames, **course_kwargs)
+    return np.array([simulate_function(network, courses=courses, max_frames=frames, **params)
+                     for network in networks])
+
+def score_independent(networks, simulate_function, params, seeds, frames):
+    """
+    Score each network on courses of its own, seeds[i] being network i's.
+    """
+    return np.array([
+        np.mean([simulate_function(network, rng=np.random.RandomState(int(seed)), max_frames=frames, **params)
+                 for seed in network_seeds])
+        for network, network_seeds in zip(networks, seeds)
+    ])
+
+def check_workers(ai, game, genomes, frames, episodes, workers):
+    """
+    Score the population through evaluate_genomes serially and with worker
+    processes on the same shared courses.
+
+    Returns:
+        tuple: (fitness identical, serial seconds, worker seconds)
+    """
+    course_class, simulate_function, course_kwargs = GAMES[game][1], GAMES[game][2], GAMES[game][3](ai)
+    params = dict(ai.simulation_params(), max_frames=frames)
+    results = []
+    for num_workers in (1, workers):
+        neat_algorithm = ai.neat_algorithm
+        neat_algorithm.num_workers = num_workers
+        np.random.seed(0)
+        courses = neat_algorithm.course_set(course_class, episodes, frames, **course_kwargs)
+        start = time.perf_counter()
+        fitnesses = neat_algorithm.evaluate_genomes(genomes, simulate_function, dict(params, courses=courses))
+        results.append((fitnesses, time.perf_counter() - start))
+    ai.neat_algorithm.close()
+    return results[0][0] == results[1][0], results[0][1], results[1][1]
+
+def check_elite_cache(game, seed, generations):
+    """
+    Train with the default budget, one generation at a time, and count the
+    genomes carried over unchanged from the previous generation that were
+    not answered by the fitness cache.
+
+    Returns:
+        tuple: (elites carried over, elites simulated again)
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        ai = GAMES[game][0](seed=seed, checkpoint_dir=directory)
+        neat_algorithm = ai.neat_algorithm
+        evaluate_genomes = neat_algorithm.evaluate_genomes
+        carried, missed = 0, 0
+        previous = {}
+
+        def counting(genomes, *args, **kwargs):
+            nonlocal carried, missed
+            elites = [genome for _, genome in genomes if previous.get(genome.key) is genome]
+            hits = neat_algorithm.fitness_cache.hits
+            fitnesses = evaluate_genomes(genomes, *args, **kwargs)
+            carried += len(elites)
+            missed += max(0, len(elites) - (neat_algorithm.fitness_cache.hits - hits))
+            previous.clear()
+            previous.update((genome.key, genome) for _, genome in genomes)
+            return fitnesses
+
+        neat_algorithm.evaluate_genomes = counting
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai.train(generations)
+        neat_algorithm.close()
+    return carried, missed
+
+def run(game, generations, trials, reference, episodes, frames, seed, workers):
+    ai_class, course_class, simulate_function, course_kwargs = GAMES[game]
+    with tempfile.TemporaryDirectory() as directory:
+        ai = ai_class(seed=seed, checkpoint_dir=directory)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai.train(generations)
+        genomes = list(ai.neat_algorithm.population.population.items())
+        config = ai.neat_algorithm.config
+        networks = [CompiledNetwork.create(genome, config) for _, genome in genomes]
+        params = ai.simulation_params()
+        kwargs = course_kwargs(ai)
+        survivors = max(1, int(round(config.reproduction_config.survival_threshold * len(genomes))))
+
+        rng = np.random.RandomState(seed)
+        start = time.perf_counter()
+        truth = score_shared(networks, simulate_function, params, course_class, kwargs,
+                             rng.randint(0, 2**31 - 1, size=reference), frames)
+        print(f"{game}: {len(genomes)} genomes after {generations} generation(s), reference from "
+              f"{reference} courses ({time.perf_counter() - start:.1f}s), keeping the top {survivors}")
+        print(f"{'K':>3s}  {'courses':12s} {'rank':>6s} {'top':>6s} {'efficiency':>10s} {'episodes/s':>10s}")
+
+        for k in episodes:
+            for name in ('independent', 'shared'):
+                rank, top, efficiency, seconds = [], [], [], 0.0
+                for _ in range(trials):
+                    start = time.perf_counter()
+                    if name == 'shared':
+                        estimate = score_shared(networks, simulate_function, params, course_class, kwargs,
+                                                rng.randint(0, 2**31 - 1, size=k), frames)
+                    else:
+                        estimate = score_independent(networks, simulate_function, params,
+                                                     rng.randint(0, 2**31 - 1, size=(len(networks), k)), frames)
+                    seconds += time.perf_counter() - start
+                    rank.append(spearman(estimate, truth))
+                    top.append(selection(estimate, truth, survivors)[0])
+                    efficiency.append(selection(estimate, truth, survivors)[1])
+                rate = trials * k * len(networks) / seconds
+                print(f"{k:3d}  {name:12s} {np.mean(rank):6.3f} {np.mean(top):6.1%} "
+                      f"{np.mean(efficiency):10.1%} {rate:10.0f}")
+
+        same, serial, parallel = check_workers(ai, game, genomes, frames, max(episodes), workers)
+        print(f"evaluate_genomes with {max(episodes)} shared courses: serial {serial * 1000:.0f} ms, "
+              f"{workers} workers {parallel * 1000:.0f} ms, fitness identical: {same}")
+
+    carried, missed = check_elite_cache(game, seed, generations + 2)
+    print(f"default budget: {carried} elites carried over, {missed} simulated again")
+    return same and carried > 0 and missed == 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(GAMES), default='flappy')
+    parser.add_argument('--generations', type=int, default=3)
+    parser.add_argument('--trials', type=int, default=10)
+    parser.add_argument('--reference', type=int, default=100)
+    parser.add_argument('--episodes', default='1,2,3,5,10')
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    episodes = [int(k) for k in args.episodes.split(',')]
+    sys.exit(0 if run(args.game, args.generations, args.trials, args.reference, episodes,
+                      args.frames, args.seed, args.workers) else 1)
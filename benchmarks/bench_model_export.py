@@ -0,0 +1,129 @@
+"""
+Check the browser evaluator against the server and time model polling.
+
+Exports fuzzed genomes (see bench_network_simplifier.py) and evaluates them
+with static/js/neat_model.js under Node.js. The script compares the result
+with CompiledNetwork on the same inputs, and exits with status 1 if any
+output differs by more than --tolerance. It then reports the exported
+model's size and times /api/dino/model (training the shared Dino AI for
+a generation first if it has no model yet) with and without a matching
+If-None-Match, against the /api/dino/action call it replaces on every
+frame.
+
+Usage:
+    python benchmarks/bench_model_export.py [--mixed] [--rows 100] [--requests 500]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_network_simplifier import fuzz_genome, fuzz_inputs, write_config
+from compiled_network import CompiledNetwork, export_genome
+from neat_algorithm import NEATAlgorithm
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loads neat_model.js with a stand-in window and evaluates every model on every row
+NODE_SCRIPT = """
+const fs = require('fs');
+global.window = {};
+eval(fs.readFileSync(process.argv[1], 'utf8'));
+const job = JSON.parse(fs.readFileSync(0, 'utf8'));
+const outputs = job.models.map(data => {
+    const model = new window.NeatModel(data);
+    return job.inputs.map(row => model.activate(row));
+});
+process.stdout.write(JSON.stringify(outputs));
+"""
+
+def check_parity(rows, mutations, seed, mixed):
+    """
+    Evaluate fuzzed genomes in Node.js and on the server.
+
+    Returns:
+        tuple: (number of genomes, max abs difference)
+    """
+    rng = np.random.RandomState(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        config_file = write_config(directory, mixed)
+        algorithm = NEATAlgorithm(config_file, 'bench-checkpoint-', checkpoint_dir=directory, seed=seed)
+        config = algorithm.config
+        genomes = list(algorithm.population.population.values())
+        for genome in genomes:
+            fuzz_genome(genome, config, rng, mutations, mixed)
+        inputs = fuzz_inputs(rng, rows, len(config.genome_config.input_keys))
+
+        job = {
+            'models': [{ **export_genome(genome, config), 'game': 'bench' } for genome in genomes],
+            'inputs': inputs.tolist(),
+        }
+        result = subprocess.run(
+            ['node', '-e', NODE_SCRIPT, os.path.join(ROOT, 'static', 'js', 'neat_model.js')],
+            input=json.dumps(job), capture_output=True, text=True, check=True
+        )
+        browser = np.array(json.loads(result.stdout))
+        server = np.array([CompiledNetwork.create(genome, config).activate_batch(inputs) for genome in genomes])
+        algorithm.close()
+    return len(genomes), float(np.abs(browser - server).max())
+
+def time_requests(client, count, method, path, **kwargs):
+    """
+    Returns:
+        float: Median latency in microseconds
+    """
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        getattr(client, method)(path, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1e6)
+
+def time_polling(count):
+    import app as arcade
+
+    client = arcade.app.test_client()
+    if arcade.dino_ai.best_genome is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            arcade.dino_ai.train(1)
+    response = client.get('/api/dino/model')
+    etag = response.headers['ETag']
+    print(f"model: {len(response.data)} bytes of JSON, ETag {etag}")
+    print(f"/api/dino/model p50:  {time_requests(client, count, 'get', '/api/dino/model'):7.1f} us (200)")
+    print(f"/api/dino/model p50:  {time_requests(client, count, 'get', '/api/dino/model', headers={'If-None-Match': etag}):7.1f} us (304)")
+    print(f"/api/dino/action p50: {time_requests(client, count, 'post', '/api/dino/action', json={'game_state': [80, 20, 10]}):7.1f} us per frame")
+
+def run(rows, mutations, seed, mixed, tolerance, requests):
+    passed = True
+    if shutil.which('node') is None:
+        print("node not found, skipping the browser evaluator check")
+    else:
+        count, max_error = check_parity(rows, mutations, seed, mixed)
+        print(f"{count} exported genomes ({'mixed' if mixed else 'default'} config), {rows} fuzzed rows each")
+        print(f"max abs difference, neat_model.js vs CompiledNetwork: {max_error:.3e} (tolerance {tolerance:.0e})")
+        passed = max_error <= tolerance
+
+    time_polling(requests)
+    return passed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--mutations', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mixed', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1e-9)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.rows, args.mutations, args.seed, args.mixed, args.tolerance, args.requests) else 1)
@@ -0,0 +1,147 @@
+"""
+Check simplified inference networks against neat-python and report savings.
+
+Grows a seeded population by mutation, then fuzzes the genomes so every
+simplification is exercised: some weights and responses are zeroed, and
+with --mixed, nodes get identity, relu, tanh or clamped activations and
+sum, product or max aggregation. Each genome's simplified CompiledNetwork
+(single-vector and batched) and a CompiledPopulation of all of them are
+compared with neat.nn.FeedForwardNetwork on fuzzed inputs. The script exits
+with status 1 if any output differs by more than --tolerance.
+
+Usage:
+    python benchmarks/bench_network_simplifier.py [--mixed] [--rows 200] [--mutations 30]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+import neat
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiled_network import CompiledNetwork, CompiledPopulation
+from neat_algorithm import NEATAlgorithm
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MIXED_OPTIONS = {
+    'activation_options': 'sigmoid identity relu tanh clamped',
+    'activation_mutate_rate': '0.3',
+    'aggregation_options': 'sum product max',
+    'aggregation_mutate_rate': '0.1',
+}
+
+def write_config(directory, mixed):
+    """
+    Copy neat_config.txt, with mixed activations and aggregations if asked.
+
+    Returns:
+        str: Path of the copy
+    """
+    with open(os.path.join(ROOT, 'neat_config.txt')) as f:
+        text = f.read()
+    if mixed:
+        for name, value in MIXED_OPTIONS.items():
+            text = re.sub(rf'(?m)^{name}\s*=.*$', f'{name} = {value}', text)
+    path = os.path.join(directory, 'neat_config.txt')
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+def fuzz_genome(genome, config, rng, mutations, mixed):
+    """
+    Mutate a genome, then zero some weights and responses and, in mixed
+    mode, switch some nodes to identity/sum so there are linear chains.
+    """
+    for _ in range(mutations):
+        genome.mutate(config.genome_config)
+    for cg in genome.connections.values():
+        if rng.rand() < 0.1:
+            cg.weight = 0.0
+    for node in genome.nodes.values():
+        if rng.rand() < 0.05:
+            node.response = 0.0
+        if mixed and rng.rand() < 0.3:
+            node.activation, node.aggregation = 'identity', 'sum'
+
+def fuzz_inputs(rng, rows, n_inputs):
+    """
+    Random inputs at several scales, plus all-zero and large rows.
+    """
+    inputs = rng.uniform(-1.0, 1.0, (rows, n_inputs)) * rng.choice([0.1, 1.0, 10.0], (rows, 1))
+    inputs[0] = 0.0
+    inputs[1] = 100.0
+    inputs[2] = -100.0
+    return inputs
+
+def run(rows, mutations, seed, mixed, tolerance):
+    rng = np.random.RandomState(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        config_file = write_config(directory, mixed)
+        algorithm = NEATAlgorithm(config_file, 'bench-checkpoint-', checkpoint_dir=directory, seed=seed)
+        config = algorithm.config
+        genomes = list(algorithm.population.population.values())
+        for genome in genomes:
+            fuzz_genome(genome, config, rng, mutations, mixed)
+
+        inputs = fuzz_inputs(rng, rows, len(config.genome_config.input_keys))
+        input_rows = inputs.tolist()
+
+        totals = {}
+        reference_time = simplified_time = 0.0
+        max_error = 0.0
+        expected_all = []
+        for genome in genomes:
+            network = neat.nn.FeedForwardNetwork.create(genome, config)
+            start = time.perf_counter()
+            expected = np.array([network.activate(row) for row in input_rows])
+            reference_time += time.perf_counter() - start
+            expected_all.append(expected)
+
+            compiled = CompiledNetwork.create(genome, config)
+            start = time.perf_counter()
+            single = np.array([compiled.activate(row) for row in input_rows])
+            simplified_time += time.perf_counter() - start
+            batch = compiled.activate_batch(inputs)
+            max_error = max(max_error, float(np.abs(single - expected).max()),
+                            float(np.abs(batch - expected).max()))
+
+            for stage in ('genome', 'pruned', 'simplified'):
+                for name, count in compiled.report[stage].items():
+                    totals[(stage, name)] = totals.get((stage, name), 0) + count
+            for name in ('folded', 'inlined'):
+                totals[name] = totals.get(name, 0) + compiled.report[name]
+
+        population = CompiledPopulation.create(genomes, config)
+        agents = np.arange(len(genomes))
+        for r, row in enumerate(inputs):
+            outputs = population.activate(np.tile(row, (len(genomes), 1)), agents)
+            expected = np.array([e[r] for e in expected_all])
+            max_error = max(max_error, float(np.abs(outputs - expected).max()))
+        algorithm.close()
+
+    print(f"{len(genomes)} genomes ({'mixed' if mixed else 'default'} config), {rows} fuzzed rows each")
+    for stage in ('genome', 'pruned', 'simplified'):
+        print(f"{stage:10s} {totals[(stage, 'nodes')]:6d} nodes {totals[(stage, 'connections')]:6d} connections")
+    print(f"folded {totals['folded']} constant nodes, inlined {totals['inlined']} linear nodes")
+    print(f"activate: {len(genomes) * rows / reference_time:9.0f} rows/s FeedForwardNetwork, "
+          f"{len(genomes) * rows / simplified_time:9.0f} rows/s simplified "
+          f"({reference_time / simplified_time:.2f}x)")
+    print(f"max abs difference: {max_error:.3e} (tolerance {tolerance:.0e})")
+    return max_error <= tolerance
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--mutations', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mixed', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1e-9)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.rows, args.mutations, args.seed, args.mixed, args.tolerance) else 1)
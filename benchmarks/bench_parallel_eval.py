@@ -0,0 +1,75 @@
+"""
+Benchmark genome evaluation throughput against the number of worker processes.
+
+Scores the same seeded population once per worker count and checks that every
+run produces the same fitness values as the serial path.
+
+Usage:
+    python benchmarks/bench_parallel_eval.py [--game dino|flappy] [--workers 1 2 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dino_ai import DinoGameAI, simulate_dino_game
+from flappy_ai import FlappyBirdAI, simulate_flappy_game
+
+GAMES = {
+    'dino': (DinoGameAI, simulate_dino_game),
+    'flappy': (FlappyBirdAI, simulate_flappy_game),
+}
+
+def run(game, worker_counts, seed, repeats):
+    """
+    Evaluate one seeded population with each worker count.
+
+    Args:
+        game (str): 'dino' or 'flappy'
+        worker_counts (list): Worker counts to measure
+        seed (int): Seed for the population and the episodes
+        repeats (int): Number of evaluation passes per worker count
+    """
+    ai_class, simulate_function = GAMES[game]
+    reference = None
+
+    print(f"{'workers':>8} {'genomes/s':>12} {'speedup':>8}  matches serial")
+    baseline_rate = None
+    for workers in worker_counts:
+        ai = ai_class(num_workers=workers, seed=seed)
+        genomes = list(ai.neat_algorithm.population.population.items())
+        params = ai.simulation_params()
+
+        # Warm up the pool so process start-up is not measured
+        ai.neat_algorithm.evaluate_genomes(genomes[:workers], simulate_function, params)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            ai.neat_algorithm.evaluate_genomes(genomes, simulate_function, params)
+        elapsed = time.perf_counter() - start
+
+        # Score once more with a fixed episode seed to compare against serial
+        np.random.seed(seed)
+        fitnesses = ai.neat_algorithm.evaluate_genomes(genomes, simulate_function, params)
+        ai.neat_algorithm.close()
+        if reference is None:
+            reference = fitnesses
+
+        rate = repeats * len(genomes) / elapsed
+        baseline_rate = baseline_rate or rate
+        print(f"{workers:>8} {rate:>12.1f} {rate / baseline_rate:>7.2f}x  {fitnesses == reference}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(GAMES), default='flappy')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.game, sorted(set(args.workers)), args.seed, args.repeats)
@@ -0,0 +1,331 @@
+"""
+Check the headless game simulators against the browser games and time them.
+
+Trains a seeded population for a few generations, then plays every genome
+through the unmodified static/js/dino.js or flappy.js under Node.js: the
+page is stubbed (canvas, DOM, requestAnimationFrame), Math.random is seeded,
+and the network decides each frame through static/js/neat_model.js, pressing
+Space like a player would. The recorded trace (the Math.random draws that
+built the course, and per frame the AI's inputs, the score and whether the
+game ended) is replayed through DinoCourse/FlappyCourse and the simulator.
+The script exits with status 1 if any frame, crash or fitness differs. It
+then reports episodes per second for the serial and vectorized simulators.
+
+Usage:
+    python benchmarks/bench_physics.py [--game dino|flappy] [--generations 5] [--frames 1000]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiled_network import CompiledNetwork, CompiledPopulation, export_genome
+from dino_ai import DinoCourse, DinoGameAI, simulate_dino_game, simulate_dino_population
+from flappy_ai import (FlappyBirdAI, FlappyCourse, flappy_game_state, simulate_flappy_game,
+                       simulate_flappy_population)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GAMES = {
+    'dino': (DinoGameAI, DinoCourse, simulate_dino_game, simulate_dino_population),
+    'flappy': (FlappyBirdAI, FlappyCourse, simulate_flappy_game, simulate_flappy_population),
+}
+
+# Plays each model once through the game script, in a fresh context per episode
+NODE_SCRIPT = r"""
+const fs = require('fs');
+const vm = require('vm');
+const [gamePath, modelPath] = process.argv.slice(1);
+global.window = {};
+eval(fs.readFileSync(modelPath, 'utf8'));
+const NeatModel = window.NeatModel;
+const gameSource = fs.readFileSync(gamePath, 'utf8');
+const job = JSON.parse(fs.readFileSync(0, 'utf8'));
+
+// Game states built like getDinoGameState/getFlappyGameState in ai_connector.js
+const GAMES = {
+    dino: {
+        height: 400,
+        course: /Obstacle/,
+        score: 'dino-score',
+        player: w => w.dino,
+        start: page => page.keydown(),
+        state: w => {
+            const next = w.obstacles.find(o => o.x + o.width > w.dino.x);
+            return next && [
+                (next.x - w.dino.x) / w.canvas.width * 100,
+                next.height / w.canvas.height * 50,
+                w.gameSpeed / 20 * 20
+            ];
+        }
+    },
+    flappy: {
+        height: 600,
+        course: /createPipe/,
+        score: 'score',
+        player: w => w.bird,
+        start: page => page.element('start-button').listeners.click(),
+        state: w => {
+            const next = w.pipes.find(p => p.x + w.PIPE_WIDTH > w.bird.x);
+            return next && [
+                (next.x - w.bird.x) / w.canvas.width * 500,
+                (w.bird.y - next.y) / w.canvas.height * 400,
+                (next.y + w.PIPE_GAP - w.bird.y) / w.canvas.height * 400
+            ];
+        }
+    }
+};
+
+function mulberry32(seed) {
+    return function() {
+        seed = seed + 0x6D2B79F5 | 0;
+        let t = Math.imul(seed ^ seed >>> 15, 1 | seed);
+        t = t + Math.imul(t ^ t >>> 7, 61 | t) ^ t;
+        return ((t ^ t >>> 14) >>> 0) / 4294967296;
+    };
+}
+
+function createElement(props) {
+    const listeners = {};
+    // Every drawing call is a no-op
+    const ctx = new Proxy({}, { get: (target, key) => key in target ? target[key] : () => {} });
+    return Object.assign({
+        textContent: '',
+        style: {},
+        listeners: listeners,
+        addEventListener: (type, listener) => { listeners[type] = listener; },
+        getContext: () => ctx
+    }, props);
+}
+
+function play(game, data, seed, frames) {
+    const rules = GAMES[game];
+    const random = mulberry32(seed);
+    const draws = [];
+    const math = Object.create(Math);
+    math.random = () => {
+        const value = random();
+        // Keep the draws that build the course, not the clouds
+        if (rules.course.test(new Error().stack)) draws.push(value);
+        return value;
+    };
+
+    const elements = {};
+    const documentListeners = {};
+    let frameCallback = null;
+    const page = {
+        element: id => elements[id] || (elements[id] = createElement(
+            id === 'gameCanvas' ? { width: 800, height: rules.height } : {})),
+        keydown: () => documentListeners.keydown({ code: 'Space', preventDefault: () => {} })
+    };
+    const w = {};
+    const context = vm.createContext({
+        window: w,
+        Math: math,
+        console: console,
+        fetch: () => new Promise(() => {}),
+        requestAnimationFrame: callback => { frameCallback = callback; return 1; },
+        document: {
+            getElementById: page.element,
+            querySelectorAll: () => [],
+            addEventListener: (type, listener) => { documentListeners[type] = listener; }
+        }
+    });
+    vm.runInContext(gameSource, context);
+    documentListeners.DOMContentLoaded();
+    rules.start(page);
+
+    const model = new NeatModel(data);
+    const trace = { draws: draws, inputs: [], speed: [], y: [], score: [], crash: -1 };
+    for (let frame = 0; frame < frames; frame++) {
+        const state = rules.state(w);
+        trace.inputs.push(state ? state.map((value, i) => value / model.inputScale[i]) : null);
+        trace.speed.push(w.gameSpeed);
+        trace.y.push(rules.player(w).y);
+        if (state && model.decide(state)) page.keydown();
+        frameCallback();
+        trace.score.push(Number(page.element(rules.score).textContent));
+        if (w.gameOver) {
+            trace.crash = frame;
+            break;
+        }
+    }
+    return trace;
+}
+
+process.stdout.write(JSON.stringify(job.models.map((data, i) =>
+    play(job.game, data, job.seed + i, job.frames))));
+"""
+
+class ReplayRandom:
+    """
+    Stands in for an episode's RandomState, returning the course draws
+    Math.random made in the browser, then a filler value once they run out.
+    """
+
+    def __init__(self, draws, filler=0.5):
+        self.draws = list(draws)
+        self.filler = filler
+        self.position = 0
+
+    def random_sample(self, size=None):
+        if size is None:
+            return self._next()
+        return np.array([self._next() for _ in range(size)])
+
+    def _next(self):
+        self.position += 1
+        if self.position <= len(self.draws):
+            return self.draws[self.position - 1]
+        return self.filler
+
+def trained_population(game, generations, seed, directory):
+    """
+    Returns:
+        tuple: (AI after training, list of genomes)
+    """
+    ai_class = GAMES[game][0]
+    ai = ai_class(seed=seed, checkpoint_dir=directory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ai.train(generations)
+    return ai, list(ai.neat_algorithm.population.population.values())
+
+def record_traces(game, ai, genomes, frames, seed):
+    """
+    Play every genome through the browser game under Node.js.
+
+    Returns:
+        list: One trace per genome
+    """
+    job = {
+        'game': game,
+        'frames': frames,
+        'seed': seed,
+        'models': [{ **export_genome(genome, ai.neat_algorithm.config), 'input_scale': ai.INPUT_SCALE,
+                     'threshold': 0.5 } for genome in genomes],
+    }
+    result = subprocess.run(
+        ['node', '-e', NODE_SCRIPT, os.path.join(ROOT, 'static', 'js', f'{game}.js'),
+         os.path.join(ROOT, 'static', 'js', 'neat_model.js')],
+        input=json.dumps(job), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+def course_mismatch(game, course, trace, frames):
+    """
+    Returns:
+        str: The first frame where the course differs from the trace, or None
+    """
+    last = trace['crash'] if trace['crash'] >= 0 else frames - 1
+    for frame in range(last + 1):
+        expected = trace['inputs'][frame]
+        if game == 'dino':
+            inputs = list(course.inputs[frame]) if course.ahead[frame] else None
+        else:
+            inputs = (flappy_game_state(course.ahead_x[frame], course.ahead_y[frame], trace['y'][frame])
+                      if course.ahead[frame] else None)
+        if inputs != expected:
+            return f"frame {frame}: inputs {inputs} != browser {expected}"
+        if course.score[frame] != trace['score'][frame]:
+            return f"frame {frame}: score {course.score[frame]} != browser {trace['score'][frame]}"
+    return None
+
+def browser_fitness(game, trace, frames):
+    """
+    The fitness the simulator should give the browser episode.
+    """
+    last = trace['crash'] if trace['crash'] >= 0 else frames - 1
+    if game == 'dino':
+        distance = 0.0
+        for speed in trace['speed'][:last + 1]:
+            distance += speed
+        return distance
+    return trace['score'][last] + (last + 1) / (frames + 1)
+
+def check_parity(game, ai, genomes, frames, seed):
+    """
+    Returns:
+        tuple: (number of episodes, frames played in the browser, list of mismatches)
+    """
+    course_class, simulate_function = GAMES[game][1], GAMES[game][2]
+    config = ai.neat_algorithm.config
+    params = ai.simulation_params()
+    traces = record_traces(game, ai, genomes, frames, seed)
+
+    mismatches = []
+    for genome, trace in zip(genomes, traces):
+        course = course_class.generate(ReplayRandom(trace['draws']).random_sample, frames)
+        problem = course_mismatch(game, course, trace, frames)
+        fitness = simulate_function(CompiledNetwork.create(genome, config), rng=ReplayRandom(trace['draws']),
+                                    max_frames=frames, **params)
+        expected = browser_fitness(game, trace, frames)
+        if problem is None and fitness != expected:
+            problem = f"fitness {fitness!r} != browser {expected!r} (crash frame {trace['crash']})"
+        if problem is not None:
+            mismatches.append(f"genome {genome.key}: {problem}")
+    return len(traces), sum(len(trace['score']) for trace in traces), mismatches
+
+def time_episodes(game, ai, genomes, frames, seed, repeats):
+    """
+    Returns:
+        dict: Episodes per second for the serial and vectorized simulators
+    """
+    simulate_function, population_function = GAMES[game][2], GAMES[game][3]
+    config = ai.neat_algorithm.config
+    params = ai.simulation_params()
+    rates = {}
+
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        for i, genome in enumerate(genomes):
+            rng = np.random.RandomState(seed + repeat * len(genomes) + i)
+            simulate_function(CompiledNetwork.create(genome, config), rng=rng, max_frames=frames, **params)
+    rates['serial'] = repeats * len(genomes) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        rngs = [np.random.RandomState(seed + repeat * len(genomes) + i) for i in range(len(genomes))]
+        population_function(CompiledPopulation.create(genomes, config), rngs=rngs, max_frames=frames, **params)
+    rates['vectorized'] = repeats * len(genomes) / (time.perf_counter() - start)
+    return rates
+
+def run(game, generations, frames, seed, repeats):
+    passed = True
+    with tempfile.TemporaryDirectory() as directory:
+        ai, genomes = trained_population(game, generations, seed, directory)
+
+        if shutil.which('node') is None:
+            print("node not found, skipping the browser parity check")
+        else:
+            episodes, played, mismatches = check_parity(game, ai, genomes, frames, seed)
+            print(f"{game}: {episodes} browser episodes, {played} frames, {len(mismatches)} mismatches")
+            for mismatch in mismatches[:10]:
+                print(f"  {mismatch}")
+            passed = not mismatches
+
+        rates = time_episodes(game, ai, genomes, frames, seed, repeats)
+        print(f"serial:     {rates['serial']:8.0f} episodes/s ({frames}-frame episodes)")
+        print(f"vectorized: {rates['vectorized']:8.0f} episodes/s")
+        ai.neat_algorithm.close()
+    return passed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(GAMES), default='dino')
+    parser.add_argument('--generations', type=int, default=5)
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.game, args.generations, args.frames, args.seed, args.repeats) else 1)
@@ -0,0 +1,77 @@
+"""
+Benchmark: many sessions training their own populations under a memory cap.
+
+Each simulated visitor opens the dino page (getting a session cookie),
+trains a generation of their own population and asks for an action. With
+the registry capped at a few resident populations, the process's resident
+memory should level off while the number of sessions keeps growing, and a
+spilled session should come back with its progress when it returns.
+
+Usage:
+    python benchmarks/bench_sessions.py [--sessions 40] [--max-resident 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def rss_mb():
+    """
+    Get the process's current resident memory.
+    """
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def wait_for(client, job_id):
+    while client.get(f'/api/jobs/{job_id}').json['status'] not in ('completed', 'failed', 'cancelled'):
+        time.sleep(0.02)
+
+def run(sessions, max_resident):
+    import app as arcade
+    arcade.populations.max_resident = max_resident
+    state = {'game_state': [100, 20, 10]}
+
+    clients = []
+    start = time.perf_counter()
+    for i in range(sessions):
+        client = arcade.app.test_client()
+        client.get('/dino')
+        job_id = client.post('/api/dino/train', json={'generations': 1}).json['job_id']
+        wait_for(client, job_id)
+        client.post('/api/dino/action', json=state)
+        clients.append(client)
+        if (i + 1) % max(1, sessions // 8) == 0:
+            stats = arcade.populations.stats()
+            print(f"  {i + 1:4d} sessions  resident {stats['resident']:3d}  "
+                  f"{stats['resident_bytes'] / 1024:8.1f} KB estimated  rss {rss_mb():7.1f} MB")
+    elapsed = time.perf_counter() - start
+    print(f"{sessions} sessions trained in {elapsed:.1f}s ({elapsed / sessions * 1000:.0f} ms each)")
+
+    # The first session was spilled long ago; its next request reloads it
+    first = clients[0]
+    start = time.perf_counter()
+    cursor = first.get('/api/dino/metrics').json['cursor']
+    print(f"Spilled session reloaded in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"with {cursor} generation(s) of history")
+
+    stats = arcade.populations.stats()
+    print(f"Registry: {stats}")
+    arcade.populations.spill_all()
+    return stats['resident'] <= max_resident and cursor >= 1
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=40)
+    parser.add_argument('--max-resident', type=int, default=8)
+    args = parser.parse_args()
+
+    # Session checkpoints go to a scratch directory
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        ok = run(args.sessions, args.max_resident)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,94 @@
+"""
+Benchmark: app cold start, time to the first served action, and warm restore.
+
+Each measurement runs in a fresh interpreter inside a scratch directory, so
+nothing is cached between runs. The first run starts with no checkpoints;
+then the dino and flappy AIs are trained for a few generations and the app
+is started again, which should restore their best genomes and answer the
+first action request with a trained network.
+
+Usage:
+    python benchmarks/bench_startup.py [--generations 5] [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter and prints one JSON line
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter() - start
+client = app.app.test_client()
+client.post('/api/dino/action', json={'game_state': [100, 20, 10]})
+first_action = time.perf_counter() - start
+while not app.startup.to_dict()['events'].get('warm'):
+    time.sleep(0.005)
+stats = app.startup.to_dict()
+print(json.dumps({
+    'import': imported,
+    'first_action': first_action,
+    'warm': stats['events']['warm'],
+    'phases': {name: phase['seconds'] for name, phase in stats['phases'].items()},
+    'restored': {game: app.GAME_AIS[game].best_genome is not None for game in app.GAME_AIS},
+    'matplotlib': 'matplotlib' in __import__('sys').modules,
+}))
+"""
+
+TRAIN = """
+from dino_ai import DinoGameAI
+from flappy_ai import FlappyBirdAI
+for ai in (DinoGameAI(restore=True), FlappyBirdAI(restore=True)):
+    ai.train({generations})
+    ai.neat_algorithm.close()
+"""
+
+def run_python(code, directory):
+    """
+    Run code in a fresh interpreter with the repository importable.
+
+    Returns:
+        str: The last line of output
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, '-c', code], cwd=directory, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+def measure(directory, runs):
+    """
+    Start the app several times and keep the fastest run.
+    """
+    results = [json.loads(run_python(PROBE, directory)) for _ in range(runs)]
+    return min(results, key=lambda r: r['first_action'])
+
+def report(label, result):
+    print(f"{label}")
+    print(f"  import app        {result['import'] * 1000:8.1f} ms")
+    print(f"  first action      {result['first_action'] * 1000:8.1f} ms")
+    print(f"  warm              {result['warm'] * 1000:8.1f} ms")
+    for name, seconds in result['phases'].items():
+        print(f"    {name:20s} {seconds * 1000:8.1f} ms")
+    print(f"  restored genomes  {result['restored']}")
+    print(f"  matplotlib loaded {result['matplotlib']}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--generations', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report("Cold start (no checkpoints)", measure(directory, args.runs))
+        run_python(TRAIN.format(generations=args.generations), directory)
+        print(f"Trained {args.generations} generations: {sorted(os.listdir(os.path.join(directory, 'checkpoints')))}")
+        result = measure(directory, args.runs)
+        report("Warm restart", result)
+
+    sys.exit(0 if all(result['restored'].values()) else 1)
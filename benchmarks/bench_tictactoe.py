@@ -0,0 +1,110 @@
+"""
+Benchmark: /api/tictactoe/ai_move with the old full-tree minimax against the
+transposition-table solver.
+
+The old minimax is kept here as the baseline. It is served from an extra
+route on the same app, so both sides pay the same Flask overhead.
+
+Usage:
+    python benchmarks/bench_tictactoe.py [--seconds 2]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify, request
+
+import app as arcade
+from tictactoe_ai import TicTacToeSolver, check_winner
+
+def reference_minimax(board, player, ai_symbol, human_symbol):
+    """
+    The original solver: full game tree, no pruning, no memoization.
+    """
+    winner = check_winner(board)
+    if winner == ai_symbol:
+        return 1, None
+    if winner == human_symbol:
+        return -1, None
+    if winner == 'Draw':
+        return 0, None
+
+    moves = []
+    for idx, cell in enumerate(board):
+        if not cell:
+            new_board = board.copy()
+            new_board[idx] = player
+            next_p = human_symbol if player == ai_symbol else ai_symbol
+            score, _ = reference_minimax(new_board, next_p, ai_symbol, human_symbol)
+            moves.append((score, idx))
+
+    if player == ai_symbol:
+        max_score = max(moves, key=lambda x: x[0])[0]
+        return max_score, [idx for score, idx in moves if score == max_score][0]
+    min_score = min(moves, key=lambda x: x[0])[0]
+    return min_score, [idx for score, idx in moves if score == min_score][0]
+
+@arcade.app.route('/bench/tictactoe/minimax', methods=['POST'])
+def reference_ai_move():
+    data         = request.json
+    board        = data.get('board', [''] * 9)
+    ai_symbol    = data.get('ai', 'O')
+    human_symbol = 'X' if ai_symbol == 'O' else 'O'
+    _, move      = reference_minimax(board, ai_symbol, ai_symbol, human_symbol)
+    return jsonify({ 'move': move })
+
+def requests_per_second(client, url, body, seconds):
+    """
+    Post the same request repeatedly for a number of seconds.
+
+    Returns:
+        float: Requests per second
+    """
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        client.post(url, json=body)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def run(seconds):
+    """
+    Measure both endpoints on the opening move and a mid-game position.
+
+    Args:
+        seconds (float): Time spent on each measurement
+    """
+    # Check the solver against the baseline on every reachable position
+    solver = TicTacToeSolver()
+    start = time.perf_counter()
+    positions = solver.precompute()
+    print(f"Precomputed {positions} positions in {time.perf_counter() - start:.3f}s")
+    for (board, player), result in solver.moves.items():
+        opponent = 'O' if player == 'X' else 'X'
+        if check_winner(board) is None:
+            assert reference_minimax(list(board), player, player, opponent) == result, board
+
+    cold = TicTacToeSolver()
+    cold.best_move([''] * 9, 'X', 'O')
+    print(f"Opening move without the table: {cold.nodes} nodes searched")
+
+    client = arcade.app.test_client()
+    cases = {
+        'opening move (AI vs AI)': {'board': [''] * 9, 'ai': 'X'},
+        'reply to a corner':       {'board': ['X'] + [''] * 8, 'ai': 'O'},
+    }
+    for name, body in cases.items():
+        before = requests_per_second(client, '/bench/tictactoe/minimax', body, seconds)
+        after = requests_per_second(client, '/api/tictactoe/ai_move', body, seconds)
+        print(f"{name:24s} minimax {before:9.1f} req/s   solver {after:9.1f} req/s   "
+              f"({after / before:,.0f}x)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    run(args.seconds)
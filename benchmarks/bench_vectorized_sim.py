@@ -0,0 +1,97 @@
+"""
+Compare the serial and vectorized whole-population simulators.
+
+Evolves a seeded population for a few generations, then scores it with both
+the per-genome reference simulator and the population simulator, checking
+that the fitness values are identical. Both are timed with one course per
+genome and with --episodes courses shared by the population (the default
+training budget), where no course is generated during evaluation.
+
+Usage:
+    python benchmarks/bench_vectorized_sim.py [--game dino|flappy] [--generations 5] [--episodes 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_sets import CourseSet
+from evaluation_budget import EvaluationBudget
+from dino_ai import DinoCourse, DinoGameAI, simulate_dino_game, simulate_dino_population
+from flappy_ai import FlappyBirdAI, FlappyCourse, simulate_flappy_game, simulate_flappy_population
+
+GAMES = {
+    'dino': (DinoGameAI, simulate_dino_game, simulate_dino_population, DinoCourse),
+    'flappy': (FlappyBirdAI, simulate_flappy_game, simulate_flappy_population, FlappyCourse),
+}
+
+def time_evaluation(ai, genomes, simulate_function, population_function, params, seed, repeats):
+    """
+    Score genomes repeatedly with a fixed episode seed.
+
+    Returns:
+        tuple: (fitness list, seconds per evaluation pass)
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        np.random.seed(seed)
+        fitnesses = ai.neat_algorithm.evaluate_genomes(
+            genomes, simulate_function, params, population_function=population_function
+        )
+    return fitnesses, (time.perf_counter() - start) / repeats
+
+def run(game, generations, seed, repeats, episodes):
+    """
+    Evolve a population, then time both simulators on it.
+
+    Args:
+        game (str): 'dino' or 'flappy'
+        generations (int): Generations to evolve before measuring
+        seed (int): Seed for the population and the episodes
+        repeats (int): Evaluation passes per simulator
+        episodes (int): Courses in the shared set
+
+    Returns:
+        bool: Whether the fitness values were identical
+    """
+    ai_class, simulate_function, population_function, course_class = GAMES[game]
+    ai = ai_class(seed=seed, budget=EvaluationBudget(episodes=None))
+    if generations:
+        ai.train(generations)
+    genomes = list(ai.neat_algorithm.population.population.items())
+    print(f"population: {len(genomes)} genomes after {generations} generations")
+
+    params = ai.simulation_params()
+    course_kwargs = {'game_speed': ai.game_speed} if game == 'dino' else {}
+    shared = dict(params, courses=CourseSet.generate(course_class, range(episodes), 1000, **course_kwargs))
+    same = True
+    for name, kwargs in (('one course per genome', params), (f'{episodes} shared courses', shared)):
+        ai.neat_algorithm.vectorized = False
+        serial, serial_time = time_evaluation(
+            ai, genomes, simulate_function, population_function, kwargs, seed, repeats)
+        ai.neat_algorithm.vectorized = True
+        batched, batched_time = time_evaluation(
+            ai, genomes, simulate_function, population_function, kwargs, seed, repeats)
+        same = same and serial == batched
+
+        print(f"{name}:")
+        print(f"  serial:     {serial_time * 1000:8.1f} ms/generation")
+        print(f"  vectorized: {batched_time * 1000:8.1f} ms/generation "
+              f"({serial_time / batched_time:.2f}x)")
+        print(f"  fitness identical: {serial == batched}")
+    return same
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game', choices=sorted(GAMES), default='flappy')
+    parser.add_argument('--generations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--episodes', type=int, default=3)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.game, args.generations, args.seed, args.repeats, args.episodes) else 1)
@@ -0,0 +1,339 @@
+"""
+Benchmark suite for the training, inference and search hot paths.
+
+Measures:
+- simulate_game frames/sec for both games
+- eval_genomes seconds per generation at several population sizes
+- /api/<game>/action latency through the Flask test client
+- fitness and network chart rendering time
+- tic-tac-toe search nodes/sec
+
+Results are written as JSON and compared against a stored baseline. A
+result more than --tolerance worse than the baseline is reported as a
+regression and the suite exits with status 1. Baselines are machine
+specific, so record one locally with --save-baseline before making changes.
+
+Usage:
+    python benchmarks/suite.py [--quick] [--only simulate,charts] [--save-baseline]
+    python benchmarks/suite.py --baseline other.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_FILE = os.path.join(ROOT, 'benchmarks', 'results.json')
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+GAMES = {
+    'dino': ('dino_ai', 'DinoGameAI', 'simulate_dino_game', [80, 20, 10]),
+    'flappy': ('flappy_ai', 'FlappyBirdAI', 'simulate_flappy_game', [200, 30, 70]),
+}
+
+class CountingNetwork:
+    """
+    Wraps a network and counts activate() calls, one per simulated frame.
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self.frames = 0
+
+    def activate(self, inputs):
+        self.frames += 1
+        return self.network.activate(inputs)
+
+def best_time(function, repeats):
+    """
+    Time a function several times.
+
+    Returns:
+        float: Fastest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def result(value, unit, higher_is_better):
+    return { 'value': value, 'unit': unit, 'higher_is_better': higher_is_better }
+
+def trained_ai(game, generations, seed, **kwargs):
+    """
+    Create a seeded AI and train it quietly so its genomes are not trivial.
+    """
+    module, name, _, _ = GAMES[game]
+    ai_class = getattr(__import__(module), name)
+    ai = ai_class(seed=seed, checkpoint_dir=os.path.join('checkpoints', game), **kwargs)
+    if generations:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai.train(generations)
+    return ai
+
+def bench_simulate(options):
+    """
+    Frames per second of the per-genome simulators over a trained population.
+    """
+    results = {}
+    for game, (module, _, function_name, _) in GAMES.items():
+        simulate = getattr(__import__(module), function_name)
+        ai = trained_ai(game, options.generations, options.seed)
+        neat_algorithm = ai.neat_algorithm
+        networks = [neat_algorithm.get_inference_network(genome)
+                    for genome in neat_algorithm.population.population.values()]
+        params = ai.simulation_params()
+
+        def simulate_all(wrap=lambda network: network):
+            for i, network in enumerate(networks):
+                simulate(wrap(network), rng=np.random.RandomState(options.seed + i), **params)
+
+        counters = []
+        simulate_all(lambda network: counters.append(CountingNetwork(network)) or counters[-1])
+        frames = sum(counter.frames for counter in counters)
+        seconds = best_time(simulate_all, options.repeats)
+        results[f'simulate_game.{game}'] = result(frames / seconds, 'frames/s', True)
+        neat_algorithm.close()
+    return results
+
+def bench_eval_genomes(options):
+    """
+    Seconds per eval_genomes call at each population size, on the serial path.
+    """
+    with open(os.path.join(ROOT, 'neat_config.txt')) as f:
+        config_text = f.read()
+
+    results = {}
+    for pop_size in options.pop_sizes:
+        config_file = os.path.abspath(f'neat_config_{pop_size}.txt')
+        with open(config_file, 'w') as f:
+            f.write(re.sub(r'(?m)^pop_size\s*=.*$', f'pop_size = {pop_size}', config_text))
+
+        for game in GAMES:
+            ai = trained_ai(game, 0, options.seed, config_file=config_file)
+            neat_algorithm = ai.neat_algorithm
+            genomes = list(neat_algorithm.population.population.items())
+
+            def evaluate():
+                np.random.seed(options.seed)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ai.eval_genomes(genomes, neat_algorithm.config)
+
+            seconds = best_time(evaluate, options.repeats)
+            results[f'eval_genomes.{game}.pop{pop_size}'] = result(seconds * 1000, 'ms', False)
+            neat_algorithm.close()
+    return results
+
+def bench_action(options):
+    """
+    Latency of /api/<game>/action for the shared AIs after a little training.
+    """
+    import app as arcade
+
+    results = {}
+    client = arcade.app.test_client()
+    for game, (_, _, _, game_state) in GAMES.items():
+        ai = arcade.GAME_AIS[game]
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai.train(options.generations)
+
+        url = f'/api/{game}/action'
+        body = { 'game_state': game_state }
+        for _ in range(50):
+            client.post(url, json=body)
+
+        samples = []
+        for _ in range(options.requests):
+            start = time.perf_counter()
+            client.post(url, json=body)
+            samples.append(time.perf_counter() - start)
+        p50, p99 = np.percentile(np.array(samples) * 1e6, [50, 99])
+        results[f'action.{game}.p50'] = result(p50, 'us', False)
+        results[f'action.{game}.p99'] = result(p99, 'us', False)
+    return results
+
+def bench_charts(options):
+    """
+    Render time of the fitness and network charts, bypassing the chart cache.
+    """
+    ai = trained_ai('dino', options.generations, options.seed)
+    neat_algorithm = ai.neat_algorithm
+    cursor = neat_algorithm._metrics_cursor()
+
+    # The first render also pays for importing matplotlib
+    neat_algorithm._render_fitness_chart(cursor)
+
+    fitness = best_time(lambda: neat_algorithm._render_fitness_chart(cursor), options.repeats)
+    network = best_time(lambda: neat_algorithm._render_network_structure_chart(ai.best_genome),
+                        options.repeats)
+    neat_algorithm.close()
+    return {
+        'charts.fitness': result(fitness * 1000, 'ms', False),
+        'charts.network': result(network * 1000, 'ms', False),
+    }
+
+def bench_tictactoe(options):
+    """
+    Nodes per second of the tic-tac-toe search while solving every reachable
+    position, starting from an empty transposition table.
+    """
+    from tictactoe_ai import TicTacToeSolver
+
+    best = 0.0
+    for _ in range(options.repeats):
+        solver = TicTacToeSolver()
+        start = time.perf_counter()
+        solver.precompute()
+        best = max(best, solver.nodes / (time.perf_counter() - start))
+    return { 'tictactoe.nodes': result(best, 'nodes/s', True) }
+
+BENCHMARKS = {
+    'simulate': bench_simulate,
+    'eval_genomes': bench_eval_genomes,
+    'action': bench_action,
+    'charts': bench_charts,
+    'tictactoe': bench_tictactoe,
+}
+
+def metadata():
+    """
+    Describe the machine and code the results were measured on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def compare(results, baseline, tolerance):
+    """
+    Print each result next to its baseline.
+
+    Args:
+        results (dict): Benchmark name -> result
+        baseline (dict): Benchmark name -> result from an earlier run
+        tolerance (float): Relative change allowed before a result counts
+            as a regression
+
+    Returns:
+        list: Names of the regressed benchmarks
+    """
+    regressions = []
+    print(f"{'benchmark':32s} {'value':>14s} {'baseline':>14s} {'change':>8s}")
+    for name, current in results.items():
+        value = current['value']
+        line = f"{name:32s} {value:14.2f}"
+        previous = baseline.get(name)
+        if previous is None or not previous['value']:
+            print(f"{line} {'-':>14s} {'':>8s}  {current['unit']}")
+            continue
+
+        change = value / previous['value'] - 1
+        worse = -change if current['higher_is_better'] else change
+        status = ''
+        if worse > tolerance:
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif worse < -tolerance:
+            status = 'improved'
+        print(f"{line} {previous['value']:14.2f} {change:+8.1%}  {current['unit']:9s} {status}")
+    return regressions
+
+def run(options):
+    """
+    Run the selected benchmarks in a scratch directory.
+
+    Returns:
+        dict: Benchmark name -> result
+    """
+    results = {}
+    cwd = os.getcwd()
+    # Checkpoints written while training go to the scratch directory
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name in options.only:
+                start = time.perf_counter()
+                results.update(BENCHMARKS[name](options))
+                print(f"  {name} done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', default=','.join(BENCHMARKS),
+                        help=f"comma-separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--pop-sizes', default='50,150,300',
+                        help='population sizes for eval_genomes')
+    parser.add_argument('--generations', type=int, default=5,
+                        help='training before measuring simulators, actions and charts')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quick', action='store_true',
+                        help='fewer repeats, requests and population sizes')
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the baseline for later runs')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='relative slowdown reported as a regression')
+    options = parser.parse_args(argv)
+
+    options.only = [name.strip() for name in options.only.split(',') if name.strip()]
+    unknown = [name for name in options.only if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    options.pop_sizes = [int(size) for size in options.pop_sizes.split(',')]
+    if options.quick:
+        options.repeats = min(options.repeats, 2)
+        options.requests = min(options.requests, 200)
+        options.pop_sizes = options.pop_sizes[:1]
+
+    report = { 'meta': metadata(), 'results': run(options) }
+    with open(options.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {options.output}")
+
+    baseline = {}
+    if os.path.exists(options.baseline) and not options.save_baseline:
+        with open(options.baseline) as f:
+            stored = json.load(f)
+        baseline = stored['results']
+        print(f"Baseline: {options.baseline} (commit {stored['meta'].get('commit')}, "
+              f"{stored['meta'].get('time')})")
+    regressions = compare(report['results'], baseline, options.tolerance)
+
+    if options.save_baseline:
+        with open(options.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {options.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) beyond {options.tolerance:.0%}: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
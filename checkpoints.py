@@ -0,0 +1,570 @@
+import atexit
+import gc
+import json
+import os
+import random
+import re
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from itertools import count, repeat
+
+import neat
+import numpy as np
+from neat.reporting import BaseReporter, ReporterSet
+
+MAGIC = b'NEATCKPT'
+FORMAT_VERSION = 1
+CHECKPOINT_SUFFIX = '.ckpt'
+
+# magic, format version, compression level, payload size, payload CRC32
+HEADER = struct.Struct('<8sHHQI')
+
+class CheckpointError(Exception):
+    pass
+
+def _next_value(counter):
+    """
+    Read the next value of an itertools.count without consuming it.
+    """
+    return int(re.match(r'count\((-?\d+)', repr(counter)).group(1))
+
+def _gene_fields(gene_type):
+    """
+    Get (name, kind) for a gene type's attributes, kind being 'float', 'bool'
+    or 'string'.
+    """
+    fields = []
+    for attribute in gene_type._gene_attributes:
+        kind = type(attribute).__name__.replace('Attribute', '').lower()
+        if kind not in ('float', 'bool', 'string'):
+            raise CheckpointError(f"Unsupported gene attribute type: {type(attribute).__name__}")
+        fields.append((attribute.name, kind))
+    return fields
+
+_FIELD_DTYPES = {'float': '<f8', 'bool': '?', 'string': '<u2'}
+
+class Snapshot:
+    """
+    Copy of training state taken on the training thread, as a metadata dict
+    and numpy arrays. Serializing, compressing and writing it happen later on
+    the writer thread.
+    """
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.arrays = arrays
+
+    def to_bytes(self, compression=6):
+        """
+        Serialize to the versioned checkpoint format.
+
+        Args:
+            compression (int): zlib level, 0 stores the payload uncompressed
+
+        Returns:
+            bytes: Header followed by the (compressed) payload
+        """
+        meta = dict(self.meta, arrays=[
+            {'name': name, 'dtype': array.dtype.descr if array.dtype.names else array.dtype.str,
+             'shape': array.shape}
+            for name, array in self.arrays.items()
+        ])
+        meta_bytes = json.dumps(meta, separators=(',', ':')).encode()
+        parts = [struct.pack('<I', len(meta_bytes)), meta_bytes]
+        parts += [np.ascontiguousarray(array).tobytes() for array in self.arrays.values()]
+        payload = b''.join(parts)
+
+        body = zlib.compress(payload, compression) if compression else payload
+        return HEADER.pack(MAGIC, FORMAT_VERSION, compression, len(payload), zlib.crc32(body)) + body
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Parse the checkpoint format.
+
+        Raises:
+            CheckpointError: If the data is not a readable checkpoint
+        """
+        if len(data) < HEADER.size:
+            raise CheckpointError("Truncated checkpoint")
+        magic, version, compression, size, crc = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise CheckpointError("Not a checkpoint file")
+        if version != FORMAT_VERSION:
+            raise CheckpointError(f"Unsupported checkpoint version {version}")
+
+        body = memoryview(data)[HEADER.size:]
+        if zlib.crc32(body) != crc:
+            raise CheckpointError("Checkpoint is corrupted (CRC mismatch)")
+        payload = zlib.decompress(body) if compression else bytes(body)
+        if len(payload) != size:
+            raise CheckpointError("Checkpoint is corrupted (size mismatch)")
+
+        meta_size = struct.unpack_from('<I', payload)[0]
+        meta = json.loads(payload[4:4 + meta_size])
+        arrays, offset = {}, 4 + meta_size
+        for spec in meta.pop('arrays'):
+            dtype = spec['dtype']
+            dtype = np.dtype([tuple(field) for field in dtype] if isinstance(dtype, list) else dtype)
+            count_ = int(np.prod(spec['shape']))
+            arrays[spec['name']] = np.frombuffer(payload, dtype, count_, offset).reshape(spec['shape'])
+            offset += count_ * dtype.itemsize
+        return cls(meta, arrays)
+
+def _snapshot_genomes(genomes, genome_config, strings):
+    """
+    Flatten genomes into tables: one row per genome, holding its gene
+    counts, and one row per node gene and per connection gene, stored
+    genome by genome.
+    """
+    node_fields = _gene_fields(genome_config.node_gene_type)
+    connection_fields = _gene_fields(genome_config.connection_gene_type)
+
+    def row(gene, fields):
+        values = []
+        for name, kind in fields:
+            value = getattr(gene, name)
+            if kind == 'string':
+                if value not in strings:
+                    strings[value] = len(strings)
+                value = strings[value]
+            values.append(value)
+        return tuple(values)
+
+    genome_rows, node_rows, connection_rows = [], [], []
+    for genome in genomes:
+        genome_rows.append((genome.key, np.nan if genome.fitness is None else genome.fitness,
+                            len(genome.nodes), len(genome.connections)))
+        for key, gene in genome.nodes.items():
+            node_rows.append((key,) + row(gene, node_fields))
+        for (source, target), gene in genome.connections.items():
+            connection_rows.append((source, target) + row(gene, connection_fields))
+
+    return {
+        'genomes': np.array(genome_rows, dtype=[('key', '<i8'), ('fitness', '<f8'),
+                                                ('nodes', '<i8'), ('connections', '<i8')]),
+        'nodes': np.array(node_rows, dtype=[('key', '<i8')] +
+                          [(name, _FIELD_DTYPES[kind]) for name, kind in node_fields]),
+        'connections': np.array(connection_rows, dtype=[('source', '<i8'), ('target', '<i8')] +
+                                [(name, _FIELD_DTYPES[kind]) for name, kind in connection_fields]),
+    }
+
+def _build_genes(gene_type, keys, fields, table, strings):
+    """
+    Create one gene per table row.
+
+    Genes are created the way pickle does, as bare instances with their
+    attribute dict assigned. Each dict starts as a copy of a template that
+    already holds the attributes equal across all rows (activation and
+    aggregation usually are), then the varying columns are filled in with
+    map() rather than a Python loop over genes.
+    """
+    template = dict.fromkeys(['key'] + [name for name, _ in fields])
+    varying = [('key', keys)]
+    for name, kind in fields:
+        column = table[name]
+        if len(column) and (column == column[0]).all():
+            value = column[0].item()
+            template[name] = strings[value] if kind == 'string' else value
+            continue
+        column = column.tolist()
+        varying.append((name, [strings[i] for i in column] if kind == 'string' else column))
+
+    attributes = list(map(dict.copy, repeat(template, len(keys))))
+    for name, column in varying:
+        deque(map(dict.__setitem__, attributes, repeat(name), column), maxlen=0)
+
+    genes = list(map(object.__new__, repeat(gene_type, len(keys))))
+    deque(map(setattr, genes, repeat('__dict__'), attributes), maxlen=0)
+    return genes
+
+def _restore_genomes(snapshot, genome_config):
+    """
+    Rebuild genome objects from the tables written by _snapshot_genomes.
+
+    Returns:
+        dict: Genome key -> genome
+    """
+    genome_type = snapshot.meta['genome_type']
+    genome_class = {neat.DefaultGenome.__name__: neat.DefaultGenome}.get(genome_type)
+    if genome_class is None:
+        raise CheckpointError(f"Unsupported genome type: {genome_type}")
+    strings = snapshot.meta['strings']
+
+    # Only new objects are created here, none of them garbage, so the
+    # collector's passes over them would find nothing
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build_genomes(snapshot, genome_config, genome_class, strings)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def _build_genomes(snapshot, genome_config, genome_class, strings):
+    """
+    Create the genomes and genes for _restore_genomes.
+    """
+    nodes = snapshot.arrays['nodes']
+    node_keys = nodes['key'].tolist()
+    node_genes = _build_genes(genome_config.node_gene_type, node_keys,
+                              _gene_fields(genome_config.node_gene_type), nodes, strings)
+
+    connections = snapshot.arrays['connections']
+    connection_keys = list(zip(connections['source'].tolist(), connections['target'].tolist()))
+    connection_genes = _build_genes(genome_config.connection_gene_type, connection_keys,
+                                    _gene_fields(genome_config.connection_gene_type), connections, strings)
+
+    table = snapshot.arrays['genomes']
+    keys = table['key'].tolist()
+    fitnesses = np.where(np.isnan(table['fitness']), None, table['fitness']).tolist()
+
+    def per_genome(gene_keys, genes, counts):
+        # Slice the flat gene lists into one dict per genome
+        ends = np.cumsum(counts)
+        slices = list(map(slice, (ends - counts).tolist(), ends.tolist()))
+        return map(dict, map(zip, map(gene_keys.__getitem__, slices), map(genes.__getitem__, slices)))
+
+    genomes = list(map(genome_class, keys))
+    for name, values in (('fitness', fitnesses),
+                         ('nodes', per_genome(node_keys, node_genes, table['nodes'])),
+                         ('connections', per_genome(connection_keys, connection_genes, table['connections']))):
+        deque(map(setattr, genomes, repeat(name), values), maxlen=0)
+
+    return dict(zip(keys, genomes))
+
+def snapshot_population(population, extra=None):
+    """
+    Capture a population's full training state.
+
+    Args:
+        population (neat.Population): The population
+        extra (dict): JSON-serializable state to store alongside
+
+    Returns:
+        Snapshot: The captured state
+    """
+    config = population.config
+    species_set = population.species
+
+    # Species representatives may be from an earlier generation
+    genomes = dict(population.population)
+    for species in species_set.species.values():
+        if species.representative is not None:
+            genomes.setdefault(species.representative.key, species.representative)
+
+    strings = {}
+    arrays = _snapshot_genomes(genomes.values(), config.genome_config, strings)
+
+    version, python_state, gauss_next = random.getstate()
+    arrays['python_rng'] = np.array(python_state, dtype='<u4')
+    _, numpy_keys, numpy_pos, has_gauss, cached_gaussian = np.random.get_state()
+    arrays['numpy_rng'] = np.array(numpy_keys, dtype='<u4')
+
+    node_indexer = config.genome_config.node_indexer
+    meta = {
+        'kind': 'population',
+        'genome_type': config.genome_type.__name__,
+        'generation': population.generation,
+        'population': list(population.population),
+        'strings': list(strings),
+        'species': [
+            {
+                'key': s.key,
+                'created': s.created,
+                'last_improved': s.last_improved,
+                'representative': s.representative.key if s.representative is not None else None,
+                'members': list(s.members),
+                'fitness': s.fitness,
+                'adjusted_fitness': s.adjusted_fitness,
+                'fitness_history': list(s.fitness_history),
+            }
+            for s in species_set.species.values()
+        ],
+        'next_genome_key': _next_value(population.reproduction.genome_indexer),
+        'next_species_key': _next_value(species_set.indexer),
+        'next_node_key': _next_value(node_indexer) if node_indexer is not None else None,
+        'python_rng': [version, gauss_next],
+        'numpy_rng': [numpy_pos, has_gauss, cached_gaussian],
+        'extra': extra or {},
+    }
+    return Snapshot(meta, arrays)
+
+def restore_population(snapshot, config):
+    """
+    Rebuild a population, its species and the RNG states from a snapshot.
+
+    Args:
+        snapshot (Snapshot): State written by snapshot_population
+        config (neat.Config): The NEAT configuration
+
+    Returns:
+        tuple: (neat.Population without reporters, the snapshot's extra dict)
+    """
+    meta = snapshot.meta
+    if meta.get('kind') != 'population':
+        raise CheckpointError("Not a population checkpoint")
+    genomes = _restore_genomes(snapshot, config.genome_config)
+
+    species_set = config.species_set_type(config.species_set_config, ReporterSet())
+    for data in meta['species']:
+        species = neat.species.Species(data['key'], data['created'])
+        species.last_improved = data['last_improved']
+        species.representative = genomes.get(data['representative'])
+        species.members = {key: genomes[key] for key in data['members']}
+        species.fitness = data['fitness']
+        species.adjusted_fitness = data['adjusted_fitness']
+        species.fitness_history = data['fitness_history']
+        species_set.species[species.key] = species
+        for key in data['members']:
+            species_set.genome_to_species[key] = species.key
+    species_set.indexer = count(meta['next_species_key'])
+
+    population_genomes = {key: genomes[key] for key in meta['population']}
+    population = neat.Population(config, (population_genomes, species_set, meta['generation']))
+    species_set.reporters = population.reporters
+
+    # neat.Checkpointer restores leave these at 1, which reuses genome keys
+    population.reproduction.genome_indexer = count(meta['next_genome_key'])
+    if meta['next_node_key'] is not None:
+        config.genome_config.node_indexer = count(meta['next_node_key'])
+
+    version, gauss_next = meta['python_rng']
+    random.setstate((version, tuple(snapshot.arrays['python_rng'].tolist()), gauss_next))
+    numpy_pos, has_gauss, cached_gaussian = meta['numpy_rng']
+    np.random.set_state(('MT19937', snapshot.arrays['numpy_rng'].copy(), numpy_pos,
+                         has_gauss, cached_gaussian))
+
+    return population, meta['extra']
+
+def snapshot_genome(genome, config, extra=None):
+    """
+    Capture a single genome.
+
+    Args:
+        genome: The genome
+        config (neat.Config): The NEAT configuration
+        extra (dict): JSON-serializable state to store alongside
+
+    Returns:
+        Snapshot: The captured genome
+    """
+    strings = {}
+    arrays = _snapshot_genomes([genome], config.genome_config, strings)
+    meta = {
+        'kind': 'genome',
+        'genome_type': config.genome_type.__name__,
+        'strings': list(strings),
+        'extra': extra or {},
+    }
+    return Snapshot(meta, arrays)
+
+def restore_genome(snapshot, config):
+    """
+    Rebuild the genome written by snapshot_genome.
+
+    Returns:
+        tuple: (genome, the snapshot's extra dict)
+    """
+    if snapshot.meta.get('kind') != 'genome':
+        raise CheckpointError("Not a genome checkpoint")
+    genome, = _restore_genomes(snapshot, config.genome_config).values()
+    return genome, snapshot.meta['extra']
+
+def read_snapshot(path):
+    """
+    Read a checkpoint file.
+
+    Returns:
+        Snapshot: The file's contents
+
+    Raises:
+        CheckpointError: If the file is not in the checkpoint format
+    """
+    with open(path, 'rb') as f:
+        return Snapshot.from_bytes(f.read())
+
+def is_checkpoint_file(path):
+    """
+    Check whether a file starts with the checkpoint format's magic bytes.
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def write_atomic(path, data):
+    """
+    Write a file so readers only ever see the old or the complete new
+    contents: write a temporary file in the same directory, fsync it, then
+    rename it over the target.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class CheckpointWriter:
+    """
+    Writes snapshots to disk on a background thread.
+
+    Writes are coalesced per path: if a newer snapshot for a path is
+    submitted before the previous one was written, only the newest is
+    written. Pending writes are flushed at interpreter exit.
+    """
+
+    def __init__(self, compression=6):
+        """
+        Initialize the writer.
+
+        Args:
+            compression (int): zlib level for written files
+        """
+        self.compression = compression
+        self._pending = OrderedDict()
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+        # Counters for monitoring
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0
+        self.last_error = None
+
+    def submit(self, path, snapshot):
+        """
+        Queue a snapshot to be written.
+
+        Args:
+            path (str): Destination file
+            snapshot (Snapshot): State to write
+        """
+        with self._condition:
+            if path in self._pending:
+                self.coalesced += 1
+            self._pending[path] = snapshot
+            self.submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='checkpoint-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait for all queued snapshots to be written.
+
+        Args:
+            timeout (float): Seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if everything was written
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self):
+        """
+        Write queued snapshots, oldest path first.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                path, snapshot = self._pending.popitem(last=False)
+                self._writing = True
+            try:
+                write_atomic(path, snapshot.to_bytes(self.compression))
+                self.written += 1
+            except Exception as e:
+                self.last_error = f"{path}: {e}"
+                print(f"Error writing checkpoint {path}: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+class AsyncCheckpointer(BaseReporter):
+    """
+    Drop-in replacement for neat.Checkpointer. At the end of a generation it
+    only snapshots the population; serializing, compressing and writing
+    happen on a CheckpointWriter thread.
+    """
+
+    def __init__(self, writer, generation_interval=100, time_interval_seconds=300,
+                 filename_prefix='neat-checkpoint-', extra_function=None):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            writer (CheckpointWriter): Writer for the snapshots
+            generation_interval (int): Maximum generations between checkpoints
+            time_interval_seconds (float): Maximum seconds between checkpoints
+            filename_prefix (str): Checkpoint path prefix, followed by the
+                generation number and CHECKPOINT_SUFFIX
+            extra_function: Function returning extra JSON-serializable state
+        """
+        self.writer = writer
+        self.generation_interval = generation_interval
+        self.time_interval_seconds = time_interval_seconds
+        self.filename_prefix = filename_prefix
+        self.extra_function = extra_function
+        self.population = None
+        self.current_generation = None
+        self.last_generation_checkpoint = -1
+        self.last_time_checkpoint = None
+
+        # Time spent snapshotting on the training thread, for profiling
+        self.snapshot_seconds = 0.0
+
+    def start_generation(self, generation):
+        self.current_generation = generation
+        if self.last_time_checkpoint is None:
+            self.last_time_checkpoint = time.time()
+
+    def end_generation(self, config, population, species_set):
+        checkpoint_due = False
+        if self.time_interval_seconds is not None:
+            checkpoint_due = time.time() - self.last_time_checkpoint >= self.time_interval_seconds
+        if not checkpoint_due and self.generation_interval is not None:
+            checkpoint_due = (self.current_generation - self.last_generation_checkpoint >=
+                              self.generation_interval)
+
+        if checkpoint_due and self.population is not None:
+            self.save_checkpoint(self.population)
+            self.last_generation_checkpoint = self.current_generation
+            self.last_time_checkpoint = time.time()
+
+    def save_checkpoint(self, population, generation=None):
+        """
+        Snapshot a population and queue it for writing.
+
+        Args:
+            population (neat.Population): The population
+            generation (int): Generation the restored population starts at,
+                by default the one after population.generation
+
+        Returns:
+            str: Path the checkpoint will be written to
+        """
+        # The reporter runs before the population's generation counter is
+        # advanced, so by default this is the generation the next run starts from
+        if generation is None:
+            generation = population.generation + 1
+        start = time.perf_counter()
+        extra = self.extra_function() if self.extra_function is not None else None
+        snapshot = snapshot_population(population, extra)
+        snapshot.meta['generation'] = generation
+        path = f"{self.filename_prefix}{generation}{CHECKPOINT_SUFFIX}"
+        self.writer.submit(path, snapshot)
+        self.snapshot_seconds += time.perf_counter() - start
+        return path
@@ -0,0 +1,920 @@
+import random
+import time
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+EMPTY = -1
+
+# Squares are numbered a1 = 0, b1 = 1, ..., h8 = 63. Pieces are coded
+# color * 6 + piece type
+PIECE_SYMBOLS = 'PNBRQKpnbrqk'
+PROMOTION_SYMBOLS = {KNIGHT: 'n', BISHOP: 'b', ROOK: 'r', QUEEN: 'q'}
+
+# Moves are packed into ints: from | to << 6 | promotion << 12 | flag << 15
+NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLE = range(4)
+
+# Castling rights bits
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_3 = RANK_1 << 16
+RANK_6 = RANK_1 << 40
+RANK_8 = RANK_1 << 56
+FULL = (1 << 64) - 1
+
+MATE = 100000
+INFINITY = 10 ** 9
+
+def square_name(square):
+    return 'abcdefgh'[square & 7] + str((square >> 3) + 1)
+
+def parse_square(name):
+    return (int(name[1]) - 1) * 8 + 'abcdefgh'.index(name[0])
+
+def encode_move(from_square, to_square, promotion=0, flag=NORMAL):
+    return from_square | to_square << 6 | promotion << 12 | flag << 15
+
+def move_to_uci(move):
+    """
+    Format a packed move in UCI notation, e.g. 'e2e4' or 'e7e8q'.
+    """
+    promotion = (move >> 12) & 7
+    return (square_name(move & 63) + square_name((move >> 6) & 63) +
+            PROMOTION_SYMBOLS.get(promotion, ''))
+
+def _step_attacks(deltas):
+    """
+    Build the attack table of a non-sliding piece from (file, rank) deltas.
+    """
+    table = []
+    for square in range(64):
+        file, rank = square & 7, square >> 3
+        attacks = 0
+        for df, dr in deltas:
+            f, r = file + df, rank + dr
+            if 0 <= f < 8 and 0 <= r < 8:
+                attacks |= 1 << (r * 8 + f)
+        table.append(attacks)
+    return table
+
+KNIGHT_ATTACKS = _step_attacks([(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)])
+KING_ATTACKS = _step_attacks([(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)])
+PAWN_ATTACKS = (_step_attacks([(-1, 1), (1, 1)]), _step_attacks([(-1, -1), (1, -1)]))
+
+# Rays for the 8 sliding directions. On rays running towards higher square
+# numbers the nearest blocker is the lowest set bit, otherwise the highest
+ROOK_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+BISHOP_DIRECTIONS = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+def _rays(df, dr):
+    table = []
+    for square in range(64):
+        f, r = (square & 7) + df, (square >> 3) + dr
+        ray = 0
+        while 0 <= f < 8 and 0 <= r < 8:
+            ray |= 1 << (r * 8 + f)
+            f, r = f + df, r + dr
+        table.append(ray)
+    return table
+
+ROOK_RAYS = [(_rays(df, dr), dr * 8 + df > 0) for df, dr in ROOK_DIRECTIONS]
+BISHOP_RAYS = [(_rays(df, dr), dr * 8 + df > 0) for df, dr in BISHOP_DIRECTIONS]
+
+def _slider_attacks(rays, square, occupied):
+    attacks = 0
+    for table, positive in rays:
+        ray = table[square]
+        blockers = ray & occupied
+        if blockers:
+            if positive:
+                nearest = (blockers & -blockers).bit_length() - 1
+            else:
+                nearest = blockers.bit_length() - 1
+            ray ^= table[nearest]
+        attacks |= ray
+    return attacks
+
+def rook_attacks(square, occupied):
+    return _slider_attacks(ROOK_RAYS, square, occupied)
+
+def bishop_attacks(square, occupied):
+    return _slider_attacks(BISHOP_RAYS, square, occupied)
+
+# Castling rights kept after a move touches a square
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[0] &= ~WHITE_QUEENSIDE
+CASTLING_MASK[7] &= ~WHITE_KINGSIDE
+CASTLING_MASK[4] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[56] &= ~BLACK_QUEENSIDE
+CASTLING_MASK[63] &= ~BLACK_KINGSIDE
+CASTLING_MASK[60] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+
+# Zobrist keys, fixed so hashes are stable across processes
+_zobrist_random = random.Random(20240601)
+ZOBRIST_PIECES = [[_zobrist_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_CASTLING = [_zobrist_random.getrandbits(64) for _ in range(16)]
+ZOBRIST_EN_PASSANT = [_zobrist_random.getrandbits(64) for _ in range(8)]
+ZOBRIST_SIDE = _zobrist_random.getrandbits(64)
+
+# Material and piece-square values, the same tables the browser AI uses.
+# Rows run from rank 8 down to rank 1, as seen by white
+PIECE_VALUES = [100, 280, 320, 479, 929, 60000]
+PIECE_SQUARE_TABLES = [
+    [
+        [100, 100, 100, 100, 105, 100, 100, 100],
+        [78, 83, 86, 73, 102, 82, 85, 90],
+        [7, 29, 21, 44, 40, 31, 44, 7],
+        [-17, 16, -2, 15, 14, 0, 15, -13],
+        [-26, 3, 10, 9, 6, 1, 0, -23],
+        [-22, 9, 5, -11, -10, -2, 3, -19],
+        [-31, 8, -7, -37, -36, -14, 3, -31],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    [
+        [-66, -53, -75, -75, -10, -55, -58, -70],
+        [-3, -6, 100, -36, 4, 62, -4, -14],
+        [10, 67, 1, 74, 73, 27, 62, -2],
+        [24, 24, 45, 37, 33, 41, 25, 17],
+        [-1, 5, 31, 21, 22, 35, 2, 0],
+        [-18, 10, 13, 22, 18, 15, 11, -14],
+        [-23, -15, 2, 0, 2, 0, -23, -20],
+        [-74, -23, -26, -24, -19, -35, -22, -69],
+    ],
+    [
+        [-59, -78, -82, -76, -23, -107, -37, -50],
+        [-11, 20, 35, -42, -39, 31, 2, -22],
+        [-9, 39, -32, 41, 52, -10, 28, -14],
+        [25, 17, 20, 34, 26, 25, 15, 10],
+        [13, 10, 17, 23, 17, 16, 0, 7],
+        [14, 25, 24, 15, 8, 25, 20, 15],
+        [19, 20, 11, 6, 7, 6, 20, 16],
+        [-7, 2, -15, -12, -14, -15, -10, -10],
+    ],
+    [
+        [35, 29, 33, 4, 37, 33, 56, 50],
+        [55, 29, 56, 67, 55, 62, 34, 60],
+        [19, 35, 28, 33, 45, 27, 25, 15],
+        [0, 5, 16, 13, 18, -4, -9, -6],
+        [-28, -35, -16, -21, -13, -29, -46, -30],
+        [-42, -28, -42, -25, -25, -35, -26, -46],
+        [-53, -38, -31, -26, -29, -43, -44, -53],
+        [-30, -24, -18, 5, -2, -18, -31, -32],
+    ],
+    [
+        [6, 1, -8, -104, 69, 24, 88, 26],
+        [14, 32, 60, -10, 20, 76, 57, 24],
+        [-2, 43, 32, 60, 72, 63, 43, 2],
+        [1, -16, 22, 17, 25, 20, -13, -6],
+        [-14, -15, -2, -5, -1, -10, -20, -22],
+        [-30, -6, -13, -11, -16, -11, -16, -27],
+        [-36, -18, 0, -19, -15, -15, -21, -38],
+        [-39, -30, -31, -13, -31, -36, -34, -42],
+    ],
+    [
+        [4, 54, 47, -99, -99, 60, 83, -62],
+        [-32, 10, 55, 56, 56, 55, 10, 3],
+        [-62, 12, -57, 44, -67, 28, 37, -31],
+        [-55, 50, 11, -4, -19, 13, 0, -49],
+        [-55, -43, -52, -28, -51, -47, -8, -50],
+        [-47, -42, -43, -79, -64, -32, -29, -32],
+        [-4, 3, -14, -50, -57, -18, 13, 4],
+        [17, 30, -3, -14, 6, -1, 40, 18],
+    ],
+]
+KING_ENDGAME_TABLE = [
+    [-50, -40, -30, -20, -20, -30, -40, -50],
+    [-30, -20, -10, 0, 0, -10, -20, -30],
+    [-30, -10, 20, 30, 30, 20, -10, -30],
+    [-30, -10, 30, 40, 40, 30, -10, -30],
+    [-30, -10, 30, 40, 40, 30, -10, -30],
+    [-30, -10, 20, 30, 30, 20, -10, -30],
+    [-30, -30, 0, 0, 0, 0, -30, -30],
+    [-50, -30, -30, -30, -30, -30, -30, -50],
+]
+
+def _square_values(table, value=0):
+    """
+    Per-square scores from white's point of view for each piece code.
+    """
+    white = [value + table[7 - (sq >> 3)][sq & 7] for sq in range(64)]
+    black = [-(value + table[sq >> 3][sq & 7]) for sq in range(64)]
+    return white, black
+
+# Kings are scored separately at evaluation time, by game phase
+SQUARE_VALUES = [None] * 12
+for _piece in range(5):
+    SQUARE_VALUES[_piece], SQUARE_VALUES[_piece + 6] = _square_values(
+        PIECE_SQUARE_TABLES[_piece], PIECE_VALUES[_piece]
+    )
+SQUARE_VALUES[KING], SQUARE_VALUES[KING + 6] = [0] * 64, [0] * 64
+KING_MIDDLEGAME = _square_values(PIECE_SQUARE_TABLES[KING])
+KING_ENDGAME = _square_values(KING_ENDGAME_TABLE)
+
+# Non-pawn material below which kings use the endgame table
+ENDGAME_MATERIAL = 1300
+
+class Board:
+    """
+    Chess position on bitboards, with incremental Zobrist hashing and
+    incremental material/piece-square scoring.
+    """
+
+    def __init__(self, fen=START_FEN):
+        """
+        Set up a position.
+
+        Args:
+            fen (str): Position in Forsyth-Edwards Notation
+
+        Raises:
+            ValueError: If the FEN cannot be parsed
+        """
+        self.pieces = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        self.mailbox = [EMPTY] * 64
+        self.hash = 0
+        self.score = 0
+        self.undo_stack = []
+        self.history = []
+        self._parse_fen(fen)
+
+    def _parse_fen(self, fen):
+        if not isinstance(fen, str):
+            raise ValueError("FEN must be a string")
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"Invalid FEN: {fen}")
+
+        rows = fields[0].split('/')
+        if len(rows) != 8:
+            raise ValueError(f"Invalid FEN: {fen}")
+        for i, row in enumerate(rows):
+            file = 0
+            for char in row:
+                if char.isdigit():
+                    file += int(char)
+                elif char in PIECE_SYMBOLS and file < 8:
+                    self._put(PIECE_SYMBOLS.index(char), (7 - i) * 8 + file)
+                    file += 1
+                else:
+                    raise ValueError(f"Invalid FEN: {fen}")
+            if file != 8:
+                raise ValueError(f"Invalid FEN: {fen}")
+        if any(bin(self.pieces[color][KING]).count('1') != 1 for color in (WHITE, BLACK)):
+            raise ValueError(f"Invalid FEN, each side needs one king: {fen}")
+
+        if fields[1] not in ('w', 'b'):
+            raise ValueError(f"Invalid FEN: {fen}")
+        self.side = WHITE if fields[1] == 'w' else BLACK
+        if self.side == BLACK:
+            self.hash ^= ZOBRIST_SIDE
+
+        self.castling = 0
+        for char in fields[2]:
+            if char in 'KQkq':
+                self.castling |= {'K': 1, 'Q': 2, 'k': 4, 'q': 8}[char]
+            elif char != '-':
+                raise ValueError(f"Invalid FEN: {fen}")
+        self.hash ^= ZOBRIST_CASTLING[self.castling]
+
+        try:
+            self.en_passant = EMPTY if fields[3] == '-' else parse_square(fields[3])
+            self.halfmove = int(fields[4]) if len(fields) > 4 else 0
+            self.fullmove = int(fields[5]) if len(fields) > 5 else 1
+        except (ValueError, IndexError):
+            raise ValueError(f"Invalid FEN: {fen}")
+        if self.en_passant != EMPTY and self._en_passant_capturable(self.side):
+            self.hash ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+
+        self.history.append(self.hash)
+
+    def fen(self):
+        """
+        Get the position in Forsyth-Edwards Notation.
+
+        Returns:
+            str: The FEN string
+        """
+        rows = []
+        for rank in range(7, -1, -1):
+            row, empty = '', 0
+            for file in range(8):
+                piece = self.mailbox[rank * 8 + file]
+                if piece == EMPTY:
+                    empty += 1
+                else:
+                    row += (str(empty) if empty else '') + PIECE_SYMBOLS[piece]
+                    empty = 0
+            rows.append(row + (str(empty) if empty else ''))
+
+        castling = ''.join(c for bit, c in zip((1, 2, 4, 8), 'KQkq') if self.castling & bit)
+        en_passant = square_name(self.en_passant) if self.en_passant != EMPTY else '-'
+        return (f"{'/'.join(rows)} {'wb'[self.side]} {castling or '-'} {en_passant} "
+                f"{self.halfmove} {self.fullmove}")
+
+    def _put(self, piece, square):
+        bit = 1 << square
+        self.pieces[piece // 6][piece % 6] |= bit
+        self.occupancy[piece // 6] |= bit
+        self.mailbox[square] = piece
+        self.hash ^= ZOBRIST_PIECES[piece][square]
+        self.score += SQUARE_VALUES[piece][square]
+
+    def _remove(self, piece, square):
+        bit = 1 << square
+        self.pieces[piece // 6][piece % 6] ^= bit
+        self.occupancy[piece // 6] ^= bit
+        self.mailbox[square] = EMPTY
+        self.hash ^= ZOBRIST_PIECES[piece][square]
+        self.score -= SQUARE_VALUES[piece][square]
+
+    def _en_passant_capturable(self, color):
+        """
+        Check whether a side has a pawn that can capture en passant. Only then
+        is the en passant square part of the hash, so the same position hashes
+        the same whether or not its FEN lists an uncapturable square.
+        """
+        return bool(PAWN_ATTACKS[color ^ 1][self.en_passant] & self.pieces[color][PAWN])
+
+    def is_attacked(self, square, by):
+        """
+        Check whether a side attacks a square.
+
+        Args:
+            square (int): The square
+            by (int): WHITE or BLACK
+
+        Returns:
+            bool: True if any piece of that side attacks the square
+        """
+        pieces = self.pieces[by]
+        if PAWN_ATTACKS[by ^ 1][square] & pieces[PAWN]:
+            return True
+        if KNIGHT_ATTACKS[square] & pieces[KNIGHT] or KING_ATTACKS[square] & pieces[KING]:
+            return True
+        occupied = self.occupancy[0] | self.occupancy[1]
+        diagonal = pieces[BISHOP] | pieces[QUEEN]
+        if diagonal and bishop_attacks(square, occupied) & diagonal:
+            return True
+        straight = pieces[ROOK] | pieces[QUEEN]
+        return bool(straight and rook_attacks(square, occupied) & straight)
+
+    def king_square(self, color):
+        return self.pieces[color][KING].bit_length() - 1
+
+    def in_check(self):
+        return self.is_attacked(self.king_square(self.side), self.side ^ 1)
+
+    def generate_moves(self, captures_only=False):
+        """
+        Generate pseudo-legal moves. Moves leaving the king in check are
+        rejected by make_move.
+
+        Args:
+            captures_only (bool): Only captures and promotions, for quiescence
+
+        Returns:
+            list: Packed moves
+        """
+        moves = []
+        us, them = self.side, self.side ^ 1
+        pieces = self.pieces[us]
+        own, enemy = self.occupancy[us], self.occupancy[them]
+        occupied = own | enemy
+        empty = ~occupied & FULL
+        targets = enemy if captures_only else ~own & FULL
+
+        # Pawns, all at once per direction
+        pawns = pieces[PAWN]
+        if us == WHITE:
+            forward, promotion_rank, double_rank = 8, RANK_8, RANK_3
+            single = (pawns << 8) & empty
+            left = (pawns << 7) & enemy & ~FILE_H
+            right = (pawns << 9) & enemy & ~FILE_A
+        else:
+            forward, promotion_rank, double_rank = -8, RANK_1, RANK_6
+            single = (pawns >> 8) & empty
+            left = (pawns >> 9) & enemy & ~FILE_H
+            right = (pawns >> 7) & enemy & ~FILE_A
+
+        pushes = single if not captures_only else single & promotion_rank
+        for bits, offset, flag in ((pushes, forward, NORMAL), (left, forward - 1, NORMAL),
+                                   (right, forward + 1, NORMAL)):
+            while bits:
+                bit = bits & -bits
+                to = bit.bit_length() - 1
+                bits ^= bit
+                if bit & promotion_rank:
+                    for promotion in (QUEEN, KNIGHT, ROOK, BISHOP):
+                        moves.append(encode_move(to - offset, to, promotion))
+                else:
+                    moves.append(encode_move(to - offset, to))
+
+        if not captures_only:
+            doubles = ((single & double_rank) << 8 if us == WHITE else (single & double_rank) >> 8) & empty
+            while doubles:
+                bit = doubles & -doubles
+                to = bit.bit_length() - 1
+                doubles ^= bit
+                moves.append(encode_move(to - 2 * forward, to, 0, DOUBLE_PUSH))
+
+        if self.en_passant != EMPTY:
+            attackers = PAWN_ATTACKS[them][self.en_passant] & pawns
+            while attackers:
+                bit = attackers & -attackers
+                attackers ^= bit
+                moves.append(encode_move(bit.bit_length() - 1, self.en_passant, 0, EN_PASSANT))
+
+        # Pieces
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            bits = pieces[piece_type]
+            while bits:
+                bit = bits & -bits
+                square = bit.bit_length() - 1
+                bits ^= bit
+                if piece_type == KNIGHT:
+                    attacks = KNIGHT_ATTACKS[square]
+                elif piece_type == BISHOP:
+                    attacks = bishop_attacks(square, occupied)
+                elif piece_type == ROOK:
+                    attacks = rook_attacks(square, occupied)
+                elif piece_type == QUEEN:
+                    attacks = bishop_attacks(square, occupied) | rook_attacks(square, occupied)
+                else:
+                    attacks = KING_ATTACKS[square]
+                attacks &= targets
+                while attacks:
+                    target = attacks & -attacks
+                    attacks ^= target
+                    moves.append(square | (target.bit_length() - 1) << 6)
+
+        if not captures_only and self.castling:
+            self._generate_castling(moves, occupied)
+
+        return moves
+
+    def _generate_castling(self, moves, occupied):
+        them = self.side ^ 1
+        if self.side == WHITE:
+            king, kingside, queenside = 4, WHITE_KINGSIDE, WHITE_QUEENSIDE
+        else:
+            king, kingside, queenside = 60, BLACK_KINGSIDE, BLACK_QUEENSIDE
+
+        if self.castling & (kingside | queenside) and not self.is_attacked(king, them):
+            if (self.castling & kingside and not occupied & (0b11 << (king + 1)) and
+                    not self.is_attacked(king + 1, them)):
+                moves.append(encode_move(king, king + 2, 0, CASTLE))
+            if (self.castling & queenside and not occupied & (0b111 << (king - 3)) and
+                    not self.is_attacked(king - 1, them)):
+                moves.append(encode_move(king, king - 2, 0, CASTLE))
+
+    def make_move(self, move):
+        """
+        Play a pseudo-legal move.
+
+        Args:
+            move (int): Packed move
+
+        Returns:
+            bool: False (with the move already taken back) if it would leave
+                the mover's king in check
+        """
+        from_square, to_square = move & 63, (move >> 6) & 63
+        promotion, flag = (move >> 12) & 7, move >> 15
+        us = self.side
+        piece = self.mailbox[from_square]
+        captured = self.mailbox[to_square]
+
+        self.undo_stack.append((move, captured, self.castling, self.en_passant,
+                                self.halfmove, self.hash, self.score))
+
+        if self.en_passant != EMPTY:
+            if self._en_passant_capturable(us):
+                self.hash ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+            self.en_passant = EMPTY
+
+        if captured != EMPTY:
+            self._remove(captured, to_square)
+        elif flag == EN_PASSANT:
+            self._remove((us ^ 1) * 6 + PAWN, to_square - 8 if us == WHITE else to_square + 8)
+
+        self._remove(piece, from_square)
+        self._put(us * 6 + promotion if promotion else piece, to_square)
+
+        if flag == CASTLE:
+            rook = us * 6 + ROOK
+            if to_square > from_square:
+                self._remove(rook, from_square + 3)
+                self._put(rook, from_square + 1)
+            else:
+                self._remove(rook, from_square - 4)
+                self._put(rook, from_square - 1)
+        elif flag == DOUBLE_PUSH:
+            self.en_passant = (from_square + to_square) >> 1
+            if self._en_passant_capturable(us ^ 1):
+                self.hash ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+
+        castling = self.castling & CASTLING_MASK[from_square] & CASTLING_MASK[to_square]
+        if castling != self.castling:
+            self.hash ^= ZOBRIST_CASTLING[self.castling] ^ ZOBRIST_CASTLING[castling]
+            self.castling = castling
+
+        if piece % 6 == PAWN or captured != EMPTY:
+            self.halfmove = 0
+        else:
+            self.halfmove += 1
+        if us == BLACK:
+            self.fullmove += 1
+
+        self.side ^= 1
+        self.hash ^= ZOBRIST_SIDE
+        self.history.append(self.hash)
+
+        if self.is_attacked(self.king_square(us), us ^ 1):
+            self.unmake_move()
+            return False
+        return True
+
+    def unmake_move(self):
+        """
+        Take back the last move.
+        """
+        move, captured, castling, en_passant, halfmove, zobrist, score = self.undo_stack.pop()
+        self.history.pop()
+        from_square, to_square = move & 63, (move >> 6) & 63
+        promotion, flag = (move >> 12) & 7, move >> 15
+
+        self.side ^= 1
+        us = self.side
+        if us == BLACK:
+            self.fullmove -= 1
+
+        moved = self.mailbox[to_square]
+        self._remove(moved, to_square)
+        self._put(us * 6 + PAWN if promotion else moved, from_square)
+
+        if captured != EMPTY:
+            self._put(captured, to_square)
+        elif flag == EN_PASSANT:
+            self._put((us ^ 1) * 6 + PAWN, to_square - 8 if us == WHITE else to_square + 8)
+        elif flag == CASTLE:
+            rook = us * 6 + ROOK
+            if to_square > from_square:
+                self._remove(rook, from_square + 1)
+                self._put(rook, from_square + 3)
+            else:
+                self._remove(rook, from_square - 1)
+                self._put(rook, from_square - 4)
+
+        self.castling, self.en_passant, self.halfmove = castling, en_passant, halfmove
+        self.hash, self.score = zobrist, score
+
+    def legal_moves(self):
+        """
+        Get the legal moves.
+
+        Returns:
+            list: Packed moves
+        """
+        legal = []
+        for move in self.generate_moves():
+            if self.make_move(move):
+                self.unmake_move()
+                legal.append(move)
+        return legal
+
+    def parse_uci(self, uci):
+        """
+        Find the legal move written in UCI notation.
+
+        Raises:
+            ValueError: If the move is not legal here
+        """
+        for move in self.legal_moves():
+            if move_to_uci(move) == uci:
+                return move
+        raise ValueError(f"Illegal move: {uci}")
+
+    def is_repetition(self):
+        """
+        Check whether the position occurred before since the last capture or
+        pawn move.
+        """
+        history = self.history
+        last = len(history) - 1
+        for i in range(last - 4, max(-1, last - self.halfmove - 1), -2):
+            if history[i] == self.hash:
+                return True
+        return False
+
+    def evaluate(self):
+        """
+        Score the position for the side to move, in centipawns.
+        """
+        white, black = self.pieces
+        material = sum(
+            (bin(white[p]).count('1') + bin(black[p]).count('1')) * PIECE_VALUES[p]
+            for p in (KNIGHT, BISHOP, ROOK, QUEEN)
+        )
+        tables = KING_ENDGAME if material < ENDGAME_MATERIAL else KING_MIDDLEGAME
+        score = (self.score + tables[0][self.king_square(WHITE)] +
+                 tables[1][self.king_square(BLACK)])
+        return score if self.side == WHITE else -score
+
+def perft(board, depth):
+    """
+    Count the leaf nodes of the legal move tree, for move generator testing.
+
+    Args:
+        board (Board): The position
+        depth (int): Plies to expand
+
+    Returns:
+        int: Number of positions at that depth
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.generate_moves():
+        if board.make_move(move):
+            nodes += perft(board, depth - 1) if depth > 1 else 1
+            board.unmake_move()
+    return nodes
+
+class SearchTimeout(Exception):
+    pass
+
+class ChessEngine:
+    """
+    Alpha-beta search with iterative deepening under a time budget.
+
+    The transposition table is kept between searches, so positions met again
+    in later moves of a game (or by other players) start from earlier work.
+    best_move also answers from an opening book and a persistent position
+    cache before searching.
+    """
+
+    def __init__(self, max_table_size=1_000_000, opening_book=None, position_cache=None):
+        """
+        Initialize the engine.
+
+        Args:
+            max_table_size (int): Transposition table entries kept before the
+                table is cleared
+            opening_book (OpeningBook): Book consulted before searching
+            position_cache (PositionCache): Persistent cache of earlier search
+                results
+        """
+        self.max_table_size = max_table_size
+        # hash -> (depth, value, flag, move)
+        self.transpositions = {}
+        self.opening_book = opening_book
+        self.position_cache = position_cache
+
+    def best_move(self, board, time_limit):
+        """
+        Get a move from the opening book, the position cache, or a search.
+
+        A cached result is only used if it came from a search with at least
+        this time budget. New search results are added to the cache.
+
+        Args:
+            board (Board): The position
+            time_limit (float): Seconds to search on a miss
+
+        Returns:
+            dict: As for search(), plus 'source': 'book', 'cache' or 'search'
+        """
+        start = time.perf_counter()
+        if self.opening_book is not None:
+            move = self.opening_book.choose(board)
+            if move is not None:
+                return {'move': move, 'score': 0, 'depth': 0, 'nodes': 0,
+                        'time': time.perf_counter() - start, 'nps': 0, 'source': 'book'}
+
+        budget_ms = int(time_limit * 1000)
+        if self.position_cache is not None:
+            cached = self.position_cache.get(board.hash, budget_ms)
+            # Guard against hash collisions by checking the move is legal
+            if cached is not None and cached[0] in board.legal_moves():
+                move, score, depth, _ = cached
+                return {'move': move_to_uci(move), 'score': score, 'depth': depth, 'nodes': 0,
+                        'time': time.perf_counter() - start, 'nps': 0, 'source': 'cache'}
+
+        result = self.search(board, time_limit)
+        result['source'] = 'search'
+        if self.position_cache is not None and result['move'] is not None:
+            self.position_cache.put(board.hash, board.parse_uci(result['move']),
+                                    result['score'], result['depth'], budget_ms)
+        return result
+
+    def search(self, board, time_limit, max_depth=64):
+        """
+        Find the best move within a time budget.
+
+        Each iteration searches one ply deeper, with the previous iteration's
+        moves tried first. The result of the last completed iteration is used.
+
+        Args:
+            board (Board): The position, restored before returning
+            time_limit (float): Seconds to search
+            max_depth (int): Deepest iteration
+
+        Returns:
+            dict: 'move' (UCI, or None if the game is over), 'score' in
+                centipawns for the side to move, 'depth', 'nodes', 'time'
+                and 'nps'
+        """
+        if len(self.transpositions) > self.max_table_size:
+            self.transpositions.clear()
+
+        search = _Search(board, self.transpositions, time.perf_counter() + time_limit)
+        start = time.perf_counter()
+        best_move, best_score, completed = None, 0, 0
+
+        for depth in range(1, max_depth + 1):
+            try:
+                score = search.negamax(depth, -INFINITY, INFINITY, 0)
+            except SearchTimeout:
+                while len(board.undo_stack) > search.root_moves:
+                    board.unmake_move()
+                break
+
+            best_move, best_score, completed = search.root_best, score, depth
+            # Forced mates and positions with one reply or none don't get deeper
+            if abs(score) >= MATE - max_depth or search.root_legal <= 1:
+                break
+            # The next iteration takes several times longer than this one
+            if time.perf_counter() - start > time_limit / 2:
+                break
+            # Always finish depth 1 so there is a move to play
+            search.deadline_active = True
+
+        elapsed = time.perf_counter() - start
+        return {
+            'move': move_to_uci(best_move) if best_move else None,
+            'score': best_score,
+            'depth': completed,
+            'nodes': search.nodes,
+            'time': elapsed,
+            'nps': int(search.nodes / elapsed) if elapsed > 0 else 0,
+        }
+
+# Transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Move ordering scores
+TT_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 20
+KILLER_SCORE = 1 << 19
+
+class _Search:
+    """
+    State of one search: node counts, killer moves and the deadline.
+    """
+
+    def __init__(self, board, transpositions, deadline):
+        self.board = board
+        self.transpositions = transpositions
+        self.deadline = deadline
+        self.deadline_active = False
+        self.nodes = 0
+        self.killers = [[0, 0] for _ in range(128)]
+        self.root_moves = len(board.undo_stack)
+        self.root_best = None
+        self.root_legal = 0
+
+    def _check_time(self):
+        if self.deadline_active and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def _order(self, moves, tt_move, ply):
+        """
+        Sort moves: transposition table move, captures by MVV-LVA
+        (most valuable victim, least valuable attacker), promotions,
+        killer moves, then the rest.
+        """
+        mailbox = self.board.mailbox
+        killers = self.killers[ply] if ply < 128 else (0, 0)
+        scored = []
+        for move in moves:
+            if move == tt_move:
+                score = TT_MOVE_SCORE
+            else:
+                victim = mailbox[(move >> 6) & 63]
+                if victim != EMPTY:
+                    score = (CAPTURE_SCORE + PIECE_VALUES[victim % 6] * 8 -
+                             PIECE_VALUES[mailbox[move & 63] % 6] // 100)
+                elif move >> 15 == EN_PASSANT:
+                    score = CAPTURE_SCORE + PIECE_VALUES[PAWN] * 8
+                elif (move >> 12) & 7:
+                    score = CAPTURE_SCORE + ((move >> 12) & 7)
+                elif move == killers[0] or move == killers[1]:
+                    score = KILLER_SCORE
+                else:
+                    score = 0
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def negamax(self, depth, alpha, beta, ply):
+        board = self.board
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            self._check_time()
+
+        if ply > 0 and (board.halfmove >= 100 or board.is_repetition()):
+            return 0
+
+        in_check = board.in_check()
+        if in_check:
+            depth += 1
+        if depth <= 0:
+            return self.quiesce(alpha, beta, ply)
+
+        # Probe the transposition table, mate scores are stored relative
+        # to the node
+        tt_move = 0
+        entry = self.transpositions.get(board.hash)
+        if entry is not None:
+            entry_depth, value, flag, tt_move = entry
+            if ply > 0 and entry_depth >= depth:
+                if value > MATE - 1000:
+                    value -= ply
+                elif value < -MATE + 1000:
+                    value += ply
+                if (flag == EXACT or (flag == LOWER and value >= beta) or
+                        (flag == UPPER and value <= alpha)):
+                    return value
+
+        original_alpha = alpha
+        best, best_move, legal = -INFINITY, 0, 0
+        for move in self._order(board.generate_moves(), tt_move, ply):
+            if not board.make_move(move):
+                continue
+            legal += 1
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+
+            if score > best:
+                best, best_move = score, move
+                if ply == 0:
+                    self.root_best = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        quiet = (board.mailbox[(move >> 6) & 63] == EMPTY and
+                                 not (move >> 12) & 7 and move >> 15 != EN_PASSANT)
+                        if quiet and ply < 128 and self.killers[ply][0] != move:
+                            self.killers[ply] = [move, self.killers[ply][0]]
+                        break
+
+        if ply == 0:
+            self.root_legal = legal
+        if legal == 0:
+            return -MATE + ply if in_check else 0
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        stored = best
+        if stored > MATE - 1000:
+            stored += ply
+        elif stored < -MATE + 1000:
+            stored -= ply
+        self.transpositions[board.hash] = (depth, stored, flag, best_move)
+        return best
+
+    def quiesce(self, alpha, beta, ply):
+        """
+        Search captures only until the position is quiet, so the static
+        evaluation is never taken in the middle of an exchange.
+        """
+        board = self.board
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            self._check_time()
+
+        stand_pat = board.evaluate()
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        for move in self._order(board.generate_moves(captures_only=True), 0, 128):
+            if not board.make_move(move):
+                continue
+            score = -self.quiesce(-beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
@@ -0,0 +1,643 @@
+import numpy as np
+from neat.graphs import feed_forward_layers
+
+def _clip(z, low=-60.0, high=60.0):
+    return np.minimum(high, np.maximum(low, z))
+
+def _inv(z):
+    with np.errstate(divide='ignore', over='ignore'):
+        result = 1.0 / z
+    return np.where(np.isfinite(result), result, 0.0)
+
+# Numpy versions of neat-python's built-in activation functions
+ACTIVATIONS = {
+    'sigmoid': lambda z: 1.0 / (1.0 + np.exp(-_clip(5.0 * z))),
+    'tanh': lambda z: np.tanh(_clip(2.5 * z)),
+    'sin': lambda z: np.sin(_clip(5.0 * z)),
+    'gauss': lambda z: np.exp(-5.0 * _clip(z, -3.4, 3.4) ** 2),
+    'relu': lambda z: np.where(z > 0.0, z, 0.0),
+    'softplus': lambda z: 0.2 * np.log(1 + np.exp(_clip(5.0 * z))),
+    'identity': lambda z: z,
+    'clamped': lambda z: _clip(z, -1.0, 1.0),
+    'inv': _inv,
+    'log': lambda z: np.log(np.maximum(1e-7, z)),
+    'exp': lambda z: np.exp(_clip(z)),
+    'abs': np.abs,
+    'hat': lambda z: np.maximum(0.0, 1 - np.abs(z)),
+    'square': lambda z: z ** 2,
+    'cube': lambda z: z ** 3,
+}
+
+def _maxabs(x, axis):
+    picks = np.argmax(np.abs(x), axis=axis)
+    return np.take_along_axis(x, np.expand_dims(picks, axis), axis).squeeze(axis)
+
+# Numpy reductions for neat-python's aggregation functions (sum is a matrix product)
+AGGREGATIONS = {
+    'product': np.prod,
+    'max': np.max,
+    'min': np.min,
+    'maxabs': _maxabs,
+    'median': np.median,
+    'mean': np.mean,
+}
+
+def _activation(name, config):
+    """
+    Get a numpy activation function, wrapping custom ones with np.vectorize.
+    """
+    if name in ACTIVATIONS:
+        return ACTIVATIONS[name]
+    return np.vectorize(config.genome_config.activation_defs.get(name), otypes=[float])
+
+def _aggregation(name, config):
+    """
+    Get a numpy reduction over axis 1, or None for sum.
+    """
+    if name == 'sum':
+        return None
+    if name in AGGREGATIONS:
+        return AGGREGATIONS[name]
+    function = config.genome_config.aggregation_function_defs.get(name)
+    return lambda x, axis: np.apply_along_axis(lambda row: function(list(row)), axis, x)
+
+def compile_genome(genome, config, simplify=True):
+    """
+    Compile a genome into a topologically ordered evaluation plan.
+
+    Uses the same layering as neat.nn.FeedForwardNetwork.create, so disabled
+    connections and nodes that cannot reach an output are dropped and
+    unreachable outputs stay at 0.0.
+
+    Args:
+        genome: The genome to compile
+        config: The NEAT configuration
+        simplify (bool): Fold constants and inline linear nodes (see
+            simplify_plan)
+
+    Returns:
+        list: One list per layer of (node, activation, aggregation, bias,
+            response, [(input_node, weight), ...]) tuples
+    """
+    plan = _layer_plan(genome, config)
+    return simplify_plan(plan, config)[0] if simplify else plan
+
+def _layer_plan(genome, config):
+    input_keys = config.genome_config.input_keys
+    output_keys = config.genome_config.output_keys
+    connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+
+    plan = []
+    for layer in feed_forward_layers(input_keys, output_keys, connections):
+        layer_plan = []
+        for node in sorted(layer):
+            links = [
+                (i, genome.connections[(i, o)].weight)
+                for i, o in connections if o == node
+            ]
+            ng = genome.nodes[node]
+            layer_plan.append((node, ng.activation, ng.aggregation, ng.bias, ng.response, links))
+        plan.append(layer_plan)
+    return plan
+
+def plan_size(plan):
+    """
+    Count the nodes and connections an evaluation plan computes.
+
+    Returns:
+        dict: 'nodes' and 'connections'
+    """
+    return {
+        'nodes': sum(len(layer) for layer in plan),
+        'connections': sum(len(node_eval[5]) for layer in plan for node_eval in layer),
+    }
+
+def simplify_plan(plan, config):
+    """
+    Rewrite an evaluation plan into a smaller one with the same outputs.
+
+    - Sum-aggregated nodes drop zero-weight connections and merge repeated
+      ones, and inputs known to be constant are folded into their bias.
+    - Nodes whose value no longer depends on the inputs become constants.
+      They are evaluated here and only kept, as a bias-only identity node,
+      where an output or a non-sum node still reads them.
+    - Identity/sum hidden nodes read by a single sum-aggregated node are
+      linear, and are inlined into that node.
+    - Nodes left without a path to an output are dropped.
+
+    Folding reorders floating point sums, so outputs match the original
+    plan to rounding error rather than bit for bit.
+
+    Args:
+        plan (list): Plan from compile_genome(simplify=False)
+        config: The NEAT configuration
+
+    Returns:
+        tuple: (simplified plan, dict with the number of 'folded' and
+            'inlined' nodes)
+    """
+    input_keys = set(config.genome_config.input_keys)
+    output_keys = config.genome_config.output_keys
+    activation_defs = config.genome_config.activation_defs
+    aggregation_defs = config.genome_config.aggregation_function_defs
+
+    node_evals = [node_eval for layer in plan for node_eval in layer]
+    readers = {}
+    for node, _, aggregation, _, _, links in node_evals:
+        for i, _ in links:
+            readers.setdefault(i, []).append(aggregation)
+
+    constants = {}  # node -> value
+    linear = {}     # inlined node -> (bias, [(input_node, weight), ...])
+    rewritten = {}  # node -> simplified node_eval
+    folded = 0
+    for node, activation, aggregation, bias, response, links in node_evals:
+        act_func = activation_defs.get(activation)
+        if aggregation == 'sum':
+            offset = 0.0
+            weights = {}
+            for i, w in links:
+                if i in constants:
+                    offset += constants[i] * w
+                elif i in linear:
+                    linear_bias, linear_links = linear[i]
+                    offset += linear_bias * w
+                    for j, v in linear_links:
+                        weights[j] = weights.get(j, 0.0) + v * w
+                else:
+                    weights[i] = weights.get(i, 0.0) + w
+            bias = bias + response * offset
+            links = [(i, w) for i, w in weights.items() if w != 0.0]
+
+            if not links or response == 0.0:
+                constants[node] = act_func(bias)
+                folded += 1
+            elif activation == 'identity' and node not in output_keys and readers.get(node) == ['sum']:
+                linear[node] = (bias, [(i, response * w) for i, w in links])
+            else:
+                rewritten[node] = (node, activation, aggregation, bias, response, links)
+        elif all(i in constants for i, _ in links):
+            agg_func = aggregation_defs.get(aggregation)
+            constants[node] = act_func(bias + response * agg_func([constants[i] * w for i, w in links]))
+            folded += 1
+        else:
+            rewritten[node] = (node, activation, aggregation, bias, response, links)
+
+    # Constants still read by an output or a non-sum node become bias-only nodes
+    for node, node_eval in list(rewritten.items()):
+        for i, _ in node_eval[5]:
+            if i in constants and i not in rewritten:
+                rewritten[i] = (i, 'identity', 'sum', constants[i], 1.0, [])
+    for node in output_keys:
+        if node in constants:
+            rewritten[node] = (node, 'identity', 'sum', constants[node], 1.0, [])
+
+    # Keep the nodes outputs still depend on, layered by depth
+    required = set()
+    pending = [node for node in output_keys if node in rewritten]
+    while pending:
+        node = pending.pop()
+        if node not in required:
+            required.add(node)
+            pending.extend(i for i, _ in rewritten[node][5] if i not in input_keys)
+
+    depth = {}
+    layers = []
+    for node_eval in node_evals:
+        node = node_eval[0]
+        if node not in required:
+            continue
+        depth[node] = 1 + max((depth[i] for i, _ in rewritten[node][5] if i in depth), default=0)
+        while len(layers) < depth[node]:
+            layers.append([])
+        layers[depth[node] - 1].append(rewritten[node])
+
+    simplified = [sorted(layer, key=lambda node_eval: node_eval[0]) for layer in layers]
+    return simplified, {'folded': folded, 'inlined': len(linear)}
+
+def simplify_genome(genome, config):
+    """
+    Compile a genome into a simplified plan and report the savings.
+
+    Args:
+        genome: The genome to compile
+        config: The NEAT configuration
+
+    Returns:
+        tuple: (plan, report) where report gives the node and connection
+            counts of the 'genome', of the layered plan after 'pruning'
+            disabled and unreachable genes, and of the 'simplified' plan,
+            with the number of 'folded' and 'inlined' nodes
+    """
+    plan = _layer_plan(genome, config)
+    simplified, counts = simplify_plan(plan, config)
+    report = {
+        'genome': { 'nodes': len(genome.nodes), 'connections': len(genome.connections) },
+        'pruned': plan_size(plan),
+        'simplified': plan_size(simplified),
+        **counts,
+    }
+    return simplified, report
+
+# Version of the model format read by static/js/neat_model.js
+MODEL_FORMAT = 1
+
+def export_genome(genome, config):
+    """
+    Serialize a genome's simplified plan for the browser evaluator.
+
+    Value columns are numbered as in CompiledNetwork: the inputs first, then
+    one per node in evaluation order. Each node is [activation, aggregation,
+    bias, response, input columns, weights], and unreachable outputs read
+    column -1, which is always 0.0.
+
+    Args:
+        genome: The genome to export
+        config: The NEAT configuration
+
+    Returns:
+        dict: 'format', 'inputs' (count), 'nodes' and 'outputs' (columns)
+
+    Raises:
+        ValueError: If the network uses a custom activation or aggregation,
+            which the browser cannot evaluate
+    """
+    input_keys = config.genome_config.input_keys
+    columns = {key: i for i, key in enumerate(input_keys)}
+    nodes = []
+    for layer in compile_genome(genome, config):
+        for node, activation, aggregation, bias, response, links in layer:
+            if activation not in ACTIVATIONS or aggregation not in AGGREGATIONS and aggregation != 'sum':
+                raise ValueError(f"Node {node} uses {activation}/{aggregation}, which can't be exported")
+            columns[node] = len(columns)
+            nodes.append([
+                activation, aggregation, bias, response,
+                [columns[i] for i, _ in links], [w for _, w in links]
+            ])
+    return {
+        'format': MODEL_FORMAT,
+        'inputs': len(input_keys),
+        'nodes': nodes,
+        'outputs': [columns.get(key, -1) for key in config.genome_config.output_keys],
+    }
+
+class CompiledNetwork:
+    """
+    An array-backed feed-forward network that evaluates many input rows in one
+    numpy pass. Outputs match neat.nn.FeedForwardNetwork to float tolerance.
+
+    Node values are columns of a (rows, nodes) array: inputs first, then each
+    layer in order, then a constant zero column for unreachable outputs. Each
+    layer gathers only the columns it reads and multiplies them by a dense
+    weight block.
+
+    Single vectors go through a plain Python walk of the same plan instead,
+    which avoids numpy call overhead and keeps no state between calls, so one
+    instance can be shared by concurrent requests.
+    """
+
+    def __init__(self, n_inputs, layers, output_columns, n_columns, node_evals, report=None):
+        """
+        Initialize the network from a compiled plan.
+
+        Args:
+            n_inputs (int): Number of network inputs
+            layers (list): Per layer, a list of groups of nodes sharing an
+                activation and aggregation, each a dict of numpy arrays
+            output_columns (np.ndarray): Value column of each output
+            n_columns (int): Total number of value columns
+            node_evals (list): (column, activation, aggregation, bias, response,
+                [(input_column, weight), ...]) in evaluation order, using
+                neat-python's scalar functions
+            report (dict): Size of the genome and of the compiled plan (see
+                simplify_genome)
+        """
+        self.n_inputs = n_inputs
+        self.layers = layers
+        self.output_columns = output_columns
+        self.n_columns = n_columns
+        self.node_evals = node_evals
+        self._output_list = output_columns.tolist()
+        self.report = report
+
+    @staticmethod
+    def create(genome, config):
+        """
+        Compile a genome into a CompiledNetwork, simplified by simplify_genome.
+
+        Args:
+            genome: The genome to compile
+            config: The NEAT configuration
+
+        Returns:
+            CompiledNetwork: The compiled network
+        """
+        input_keys = config.genome_config.input_keys
+        output_keys = config.genome_config.output_keys
+        columns = {key: i for i, key in enumerate(input_keys)}
+        plan, report = simplify_genome(genome, config)
+
+        layers = []
+        node_evals = []
+        for layer_plan in plan:
+            # Nodes sharing activation and aggregation are evaluated together
+            groups = {}
+            for node_eval in layer_plan:
+                groups.setdefault((node_eval[1], node_eval[2]), []).append(node_eval)
+
+            layer = []
+            for (activation, aggregation), group_evals in sorted(groups.items()):
+                sources = sorted({columns[i] for node_eval in group_evals for i, _ in node_eval[5]})
+                source_index = {column: j for j, column in enumerate(sources)}
+                weights = np.zeros((len(sources), len(group_evals)))
+                for n, node_eval in enumerate(group_evals):
+                    for i, w in node_eval[5]:
+                        weights[source_index[columns[i]], n] += w
+
+                start = len(columns)
+                for node, _, _, bias, response, links in group_evals:
+                    columns[node] = len(columns)
+                    node_evals.append((
+                        columns[node],
+                        config.genome_config.activation_defs.get(activation),
+                        config.genome_config.aggregation_function_defs.get(aggregation),
+                        bias,
+                        response,
+                        [(columns[i], w) for i, w in links]
+                    ))
+
+                layer.append({
+                    'start': start,
+                    'stop': len(columns),
+                    'sources': np.array(sources, dtype=int),
+                    'weights': weights,
+                    'links': [
+                        (np.array([columns[i] for i, _ in node_eval[5]], dtype=int),
+                         np.array([w for _, w in node_eval[5]]))
+                        for node_eval in group_evals
+                    ],
+                    'bias': np.array([node_eval[3] for node_eval in group_evals]),
+                    'response': np.array([node_eval[4] for node_eval in group_evals]),
+                    'activation': _activation(activation, config),
+                    'aggregation': _aggregation(aggregation, config),
+                })
+            layers.append(layer)
+
+        # Outputs never reached by the network read the trailing zero column
+        zero_column = len(columns)
+        output_columns = np.array([columns.get(k, zero_column) for k in output_keys], dtype=int)
+        return CompiledNetwork(len(input_keys), layers, output_columns, zero_column + 1, node_evals,
+                               report)
+
+    def activate_batch(self, inputs):
+        """
+        Evaluate the network on many input rows at once.
+
+        Args:
+            inputs: Array-like of shape (rows, n_inputs)
+
+        Returns:
+            np.ndarray: Outputs of shape (rows, n_outputs)
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        if inputs.ndim != 2 or inputs.shape[1] != self.n_inputs:
+            raise RuntimeError(f"Expected inputs of shape (rows, {self.n_inputs}), got {inputs.shape}")
+
+        values = np.zeros((inputs.shape[0], self.n_columns))
+        values[:, :self.n_inputs] = inputs
+
+        for layer in self.layers:
+            for group in layer:
+                if group['aggregation'] is None:
+                    s = values[:, group['sources']] @ group['weights']
+                else:
+                    s = np.column_stack([
+                        group['aggregation'](values[:, cols] * w, axis=1)
+                        for cols, w in group['links']
+                    ])
+                values[:, group['start']:group['stop']] = group['activation'](
+                    group['bias'] + group['response'] * s
+                )
+
+        return values[:, self.output_columns]
+
+    def activate(self, inputs):
+        """
+        Evaluate the network on a single input vector.
+
+        Drop-in replacement for neat.nn.FeedForwardNetwork.activate.
+
+        Args:
+            inputs: List of input values
+
+        Returns:
+            list: Output values
+        """
+        if len(inputs) != self.n_inputs:
+            raise RuntimeError(f"Expected {self.n_inputs} inputs, got {len(inputs)}")
+
+        values = [0.0] * self.n_columns
+        values[:self.n_inputs] = inputs
+        for column, act_func, agg_func, bias, response, links in self.node_evals:
+            values[column] = act_func(bias + response * agg_func([values[i] * w for i, w in links]))
+        return [values[i] for i in self._output_list]
+
+class CompiledPopulation:
+    """
+    A whole population compiled into one block-diagonal network, so every
+    agent's network is evaluated in a single numpy pass per frame.
+
+    Each agent owns its own input columns and node columns. Layers of equal
+    depth from all agents are merged, and sum-aggregated nodes are computed
+    with one gather/scatter (np.bincount) over all of the layer's edges.
+    """
+
+    def __init__(self, n_agents, n_inputs, layers, output_columns, n_columns, genomes=None,
+                 config=None):
+        """
+        Initialize the population from merged layers.
+
+        Args:
+            n_agents (int): Number of agents
+            n_inputs (int): Number of inputs per agent
+            layers (list): Per depth, a list of node groups as numpy arrays
+            output_columns (np.ndarray): Value column of each output, per agent
+            n_columns (int): Total number of value columns
+            genomes (list): The agents' genomes, for network()
+            config: The NEAT configuration, for network()
+        """
+        self.n_agents = n_agents
+        self.n_inputs = n_inputs
+        self.layers = layers
+        self.output_columns = output_columns
+        self.n_columns = n_columns
+        self.genomes = genomes
+        self.config = config
+        self._networks = {}
+
+    @staticmethod
+    def create(genomes, config):
+        """
+        Compile a list of genomes into one population network.
+
+        Args:
+            genomes: List of genomes, one per agent
+            config: The NEAT configuration
+
+        Returns:
+            CompiledPopulation: The compiled population
+        """
+        input_keys = config.genome_config.input_keys
+        output_keys = config.genome_config.output_keys
+        n_inputs = len(input_keys)
+
+        plans = [compile_genome(genome, config) for genome in genomes]
+        columns = [
+            {key: agent * n_inputs + i for i, key in enumerate(input_keys)}
+            for agent in range(len(genomes))
+        ]
+        n_columns = len(genomes) * n_inputs
+
+        layers = []
+        for depth in range(max((len(plan) for plan in plans), default=0)):
+            groups = {}
+            for agent, plan in enumerate(plans):
+                if depth < len(plan):
+                    for node_eval in plan[depth]:
+                        groups.setdefault((node_eval[1], node_eval[2]), []).append((agent, node_eval))
+
+            layer = []
+            for (activation, aggregation), members in sorted(groups.items()):
+                start = n_columns
+                sources, targets, weights, links = [], [], [], []
+                for n, (agent, node_eval) in enumerate(members):
+                    link_columns = [columns[agent][i] for i, _ in node_eval[5]]
+                    link_weights = [w for _, w in node_eval[5]]
+                    sources.extend(link_columns)
+                    targets.extend([n] * len(link_columns))
+                    weights.extend(link_weights)
+                    links.append((np.array(link_columns, dtype=int), np.array(link_weights)))
+                for agent, node_eval in members:
+                    columns[agent][node_eval[0]] = n_columns
+                    n_columns += 1
+
+                layer.append({
+                    'start': start,
+                    'stop': n_columns,
+                    'sources': np.array(sources, dtype=int),
+                    'targets': np.array(targets, dtype=int),
+                    'weights': np.array(weights),
+                    'links': links,
+                    'bias': np.array([node_eval[3] for _, node_eval in members]),
+                    'response': np.array([node_eval[4] for _, node_eval in members]),
+                    'activation': _activation(activation, config),
+                    'aggregation': _aggregation(aggregation, config),
+                })
+            layers.append(layer)
+
+        # Outputs never reached by an agent's network read the trailing zero column
+        zero_column = n_columns
+        output_columns = np.array([
+            [agent_columns.get(k, zero_column) for k in output_keys]
+            for agent_columns in columns
+        ], dtype=int).reshape(len(genomes), len(output_keys))
+        return CompiledPopulation(len(genomes), n_inputs, layers, output_columns, zero_column + 1,
+                                  list(genomes), config)
+
+    def __len__(self):
+        return self.n_agents
+
+    def network(self, agent):
+        """
+        Get one agent's network on its own, compiled on first use. Cheaper
+        than a pass over the whole population once few agents are left.
+
+        Args:
+            agent (int): Index of the agent
+
+        Returns:
+            CompiledNetwork: The agent's network
+        """
+        network = self._networks.get(agent)
+        if network is None:
+            network = self._networks[agent] = CompiledNetwork.create(self.genomes[agent], self.config)
+        return network
+
+    def activate(self, inputs, agents):
+        """
+        Activate a subset of the agents' networks in one pass.
+
+        Args:
+            inputs (np.ndarray): One row of inputs per selected agent
+            agents (np.ndarray): Indices of the agents to activate
+
+        Returns:
+            np.ndarray: One row of outputs per selected agent
+        """
+        values = np.zeros(self.n_columns)
+        values[:self.n_agents * self.n_inputs].reshape(self.n_agents, self.n_inputs)[agents] = inputs
+
+        for layer in self.layers:
+            for group in layer:
+                if group['aggregation'] is None:
+                    s = np.bincount(
+                        group['targets'],
+                        weights=values[group['sources']] * group['weights'],
+                        minlength=group['stop'] - group['start']
+                    )
+                else:
+                    s = np.array([
+                        group['aggregation'](values[cols] * w, axis=0)
+                        for cols, w in group['links']
+                    ])
+                values[group['start']:group['stop']] = group['activation'](
+                    group['bias'] + group['response'] * s
+                )
+
+        return values[self.output_columns[agents]]
+
+    def activate_batch(self, inputs, agents):
+        """
+        Activate a subset of the agents' networks on many rows of inputs in
+        one pass, e.g. one row per frame of a chunk.
+
+        Args:
+            inputs (np.ndarray): Inputs of shape (rows, selected agents, n_inputs)
+            agents (np.ndarray): Indices of the agents to activate
+
+        Returns:
+            np.ndarray: Outputs of shape (rows, selected agents, n_outputs)
+        """
+        rows = inputs.shape[0]
+        values = np.zeros((rows, self.n_columns))
+        values[:, :self.n_agents * self.n_inputs].reshape(rows, self.n_agents, self.n_inputs)[:, agents] = inputs
+
+        for layer in self.layers:
+            for group in layer:
+                if group['aggregation'] is None:
+                    columns, matrix = self._dense_weights(group)
+                    s = values[:, columns] @ matrix
+                else:
+                    s = np.column_stack([
+                        group['aggregation'](values[:, cols] * w, axis=1)
+                        for cols, w in group['links']
+                    ])
+                values[:, group['start']:group['stop']] = group['activation'](
+                    group['bias'] + group['response'] * s
+                )
+
+        return values[:, self.output_columns[agents]]
+
+    @staticmethod
+    def _dense_weights(group):
+        """
+        Get a sum-aggregated group's edges as the columns it reads and a
+        dense (columns, nodes) weight block, built on first use.
+        """
+        dense = group.get('dense')
+        if dense is None:
+            columns, rows = np.unique(group['sources'], return_inverse=True)
+            matrix = np.zeros((len(columns), group['stop'] - group['start']))
+            np.add.at(matrix, (rows, group['targets']), group['weights'])
+            dense = group['dense'] = (columns, matrix)
+        return dense
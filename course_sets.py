@@ -0,0 +1,241 @@
+import hashlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Shared course sets attached in this process, by key, so the jobs of a
+# generation reuse one attachment and one set of unpacked courses
+_attached = {}
+
+def uniform_draws(rng, block=1024):
+    """
+    Get a function returning an rng's next uniform draw (np.random if None).
+
+    Draws are taken from the rng in blocks, which gives the same stream much
+    faster than one call per draw, but leaves the rng further along.
+
+    Args:
+        rng: numpy RandomState, or None for the global one
+        block (int): Draws taken at a time
+
+    Returns:
+        function: Returns the next draw in [0, 1)
+    """
+    rng = rng if rng is not None else np.random
+    buffer = []
+
+    def uniform():
+        if not buffer:
+            buffer.extend(reversed(rng.random_sample(block).tolist()))
+        return buffer.pop()
+
+    return uniform
+
+class CourseSet:
+    """
+    Seeded courses shared by every evaluation of a generation.
+
+    Scoring every genome on the same few courses (common random numbers)
+    takes the luck of the draw out of fitness comparisons, so a few
+    episodes rank genomes about as well as many independent ones. The
+    courses are generated once, then kept as arrays with one row per
+    course, one per name in the course class's FIELDS.
+
+    A shared set keeps its arrays in shared memory, read-only. Pickling it,
+    as the worker pool does for every job, only sends the segment names;
+    each process attaches once and unpacks the courses once.
+    """
+
+    def __init__(self, course_class, arrays, key):
+        """
+        Wrap generated courses.
+
+        Args:
+            course_class: DinoCourse, FlappyCourse or another class with
+                generate, from_arrays and FIELDS
+            arrays (dict): Array of shape (courses, frames, ...) per field
+            key (str): Digest of the class, seeds, length and settings
+        """
+        self.course_class = course_class
+        self.arrays = arrays
+        self.key = key
+        self._segments = None
+        self._owner = False
+        self._courses = None
+
+    @staticmethod
+    def generate(course_class, seeds, frames, **course_kwargs):
+        """
+        Generate one course per seed.
+
+        Args:
+            course_class: Course class (see __init__)
+            seeds: Seed of each course's RandomState
+            frames (int): Frames per course
+            **course_kwargs: Passed to course_class.generate
+
+        Returns:
+            CourseSet: The courses
+        """
+        seeds = [int(seed) for seed in seeds]
+        courses = [
+            course_class.generate(uniform_draws(np.random.RandomState(seed)), frames, **course_kwargs)
+            for seed in seeds
+        ]
+        arrays = {
+            name: np.array([getattr(course, name) for course in courses], dtype=dtype)
+            for name, dtype in course_class.FIELDS
+        }
+        key = hashlib.blake2b(
+            repr((course_class.__qualname__, seeds, frames, sorted(course_kwargs.items()))).encode(),
+            digest_size=8
+        ).hexdigest()
+        return CourseSet(course_class, arrays, key)
+
+    def __len__(self):
+        return len(next(iter(self.arrays.values())))
+
+    def __repr__(self):
+        # Identifies the courses in fitness cache keys
+        return f"CourseSet({self.course_class.__qualname__}, {self.key})"
+
+    @property
+    def frames(self):
+        """
+        Frames per course.
+        """
+        return next(iter(self.arrays.values())).shape[1]
+
+    @property
+    def nbytes(self):
+        """
+        Size of the arrays in bytes.
+        """
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def courses(self):
+        """
+        Get the courses as course_class objects, unpacked on first use.
+
+        Returns:
+            list: One course per seed
+        """
+        if self._courses is None:
+            self._courses = [
+                self.course_class.from_arrays({name: array[i] for name, array in self.arrays.items()})
+                for i in range(len(self))
+            ]
+        return self._courses
+
+    def chunks(self, index, names, n_agents):
+        """
+        Get a function giving every agent of a population simulator the
+        same course.
+
+        Args:
+            index (int): Course number
+            names: Fields to return
+            n_agents (int): Number of agents
+
+        Returns:
+            function: Takes (start, end, agents) and returns, per field, the
+                course's frames start to end as a read-only array with a
+                row per agent
+        """
+        rows = [self.arrays[name][index] for name in names]
+
+        def chunk(start, end, agents):
+            return tuple(np.broadcast_to(row[start:end], (n_agents,) + row[start:end].shape) for row in rows)
+
+        return chunk
+
+    def share(self):
+        """
+        Move the arrays to shared memory, so worker processes attach to them
+        instead of receiving a copy with every job.
+
+        Returns:
+            CourseSet: self
+        """
+        if self._segments is not None:
+            return self
+        segments, arrays = {}, {}
+        for name, array in self.arrays.items():
+            segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            view = np.ndarray(array.shape, array.dtype, buffer=segment.buf)
+            view[...] = array
+            view.flags.writeable = False
+            segments[name] = segment
+            arrays[name] = view
+        self._segments = segments
+        self._owner = True
+        self.arrays = arrays
+        return self
+
+    def release(self):
+        """
+        Detach from the shared memory, freeing it if this process shared it.
+        The set can't be used afterwards.
+        """
+        if self._segments is None:
+            return
+        self.arrays = {}
+        self._courses = None
+        for segment in self._segments.values():
+            segment.close()
+            if self._owner:
+                segment.unlink()
+        self._segments = None
+
+    def __reduce__(self):
+        if self._segments is None:
+            return (CourseSet, (self.course_class, self.arrays, self.key))
+        spec = [
+            (name, segment.name, self.arrays[name].shape, self.arrays[name].dtype.str)
+            for name, segment in self._segments.items()
+        ]
+        return (_attach, (self.course_class, self.key, spec))
+
+def _open_segment(name):
+    """
+    Open an existing shared memory segment without taking ownership of it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13; with fork the parent's resource tracker is
+        # shared, and it forgets the segment when the parent unlinks it
+        return shared_memory.SharedMemory(name=name)
+
+def _attach(course_class, key, spec):
+    """
+    Get a shared course set in this process, attaching to it the first time.
+
+    Args:
+        course_class: Course class
+        key (str): The set's key
+        spec (list): (field, segment name, shape, dtype) per array
+
+    Returns:
+        CourseSet: The set, backed by the shared memory
+    """
+    course_set = _attached.get(key)
+    if course_set is not None:
+        return course_set
+
+    # Sets are replaced every generation, so only the latest stays attached
+    for old in _attached.values():
+        old.release()
+    _attached.clear()
+
+    segments, arrays = {}, {}
+    for name, segment_name, shape, dtype in spec:
+        segment = _open_segment(segment_name)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        segments[name] = segment
+        arrays[name] = array
+    course_set = CourseSet(course_class, arrays, key)
+    course_set._segments = segments
+    _attached[key] = course_set
+    return course_set
@@ -1,28 +1,504 @@
 import os
+import time
 import neat
 import numpy as np
 from neat_algorithm import NEATAlgorithm
+from evaluation_budget import EvaluationBudget
+from course_sets import uniform_draws
+
+# Rules of the browser game, from static/js/dino.js on the 800x400 canvas of templates/dino.html
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 400
+GROUND_HEIGHT = 50
+DINO_X = 100
+DINO_WIDTH = 50
+DINO_HEIGHT = 70
+DINO_GROUND_Y = CANVAS_HEIGHT - GROUND_HEIGHT - DINO_HEIGHT
+OBSTACLE_WIDTH = 40
+OBSTACLE_MIN_HEIGHT = 40
+OBSTACLE_MAX_HEIGHT = 80
+OBSTACLE_MIN_SPACING = 450
+OBSTACLE_MAX_SPACING = 800
+
+# Frames of course generated at a time; most episodes end long before max_frames
+COURSE_CHUNK = 100
+
+class DinoCourse:
+    """
+    An obstacle course of the browser game, generated frame by frame.
+
+    In dino.js the obstacles, the scrolling speed and the score move on
+    whatever the dino does, so a course is played out from a stream of
+    uniform draws (standing in for Math.random) and each agent only runs its
+    own jump physics against the lists below. For frame f:
+    - ahead[f]: whether an obstacle is ahead of the dino when the AI decides,
+      before the frame (there is no decision otherwise)
+    - inputs[f]: the network inputs for that obstacle, computed like
+      ai_connector.js and neat_model.js do
+    - top[f]: the top of the obstacle overlapping the dino after the
+      frame's move (inf if none); the dino crashes when its feet are below it
+    - distance[f]: distance scrolled by the end of the frame, the fitness
+    - score[f]: obstacles passed by the end of the frame
+
+    Courses are extended as far as an episode gets, see extend, or
+    generated whole for a CourseSet, which stores them as arrays.
+    """
+
+    # Array type of each list, for CourseSet
+    FIELDS = (('ahead', bool), ('inputs', np.float64), ('top', np.float64),
+              ('distance', np.float64), ('score', np.int32))
+
+    def __init__(self, uniform, game_speed=10):
+        """
+        Start a course.
+
+        Args:
+            uniform: Function returning the next uniform draw in [0, 1)
+            game_speed (float): Initial scrolling speed
+        """
+        self.ahead = []
+        self.inputs = []
+        self.top = []
+        self.distance = []
+        self.score = []
+        self._uniform = uniform
+        self._obstacles = []  # [x, height, counted], oldest first
+        self._speed = game_speed
+        self._scrolled = 0.0
+        self._passed = 0
+
+    def __len__(self):
+        return len(self.ahead)
+
+    @staticmethod
+    def generate(uniform, frames, game_speed=10):
+        """
+        Play out a whole course.
+
+        Args:
+            uniform: Function returning the next uniform draw in [0, 1)
+            frames (int): Number of frames
+            game_speed (float): Initial scrolling speed
+
+        Returns:
+            DinoCourse: The course
+        """
+        course = DinoCourse(uniform, game_speed)
+        course.extend(frames)
+        return course
+
+    @staticmethod
+    def from_arrays(arrays):
+        """
+        Rebuild a generated course from its rows of a CourseSet.
+
+        Args:
+            arrays (dict): Array per name in FIELDS
+
+        Returns:
+            DinoCourse: The course, which can't be extended
+        """
+        course = DinoCourse(None)
+        for name, _ in DinoCourse.FIELDS:
+            setattr(course, name, arrays[name].tolist())
+        return course
+
+    def extend(self, frames):
+        """
+        Play out the next frames like dino.js does.
+
+        Args:
+            frames (int): Number of frames to add
+        """
+        ahead, inputs, top, distance, score = self.ahead, self.inputs, self.top, self.distance, self.score
+        uniform, obstacles = self._uniform, self._obstacles
+        speed, scrolled, passed = self._speed, self._scrolled, self._passed
+        spacing_draws = OBSTACLE_MAX_SPACING - OBSTACLE_MIN_SPACING + 1
+        height_draws = OBSTACLE_MAX_HEIGHT - OBSTACLE_MIN_HEIGHT + 1
+        ground = CANVAS_HEIGHT - GROUND_HEIGHT
+        no_inputs = (0.0, 0.0, 0.0)
+        inf = float('inf')
+
+        for _ in range(frames):
+            # The AI reads the first obstacle ahead, as a game state scaled
+            # like getDinoGameState, then normalized by INPUT_SCALE
+            for obstacle in obstacles:
+                if obstacle[0] + OBSTACLE_WIDTH > DINO_X:
+                    ahead.append(True)
+                    inputs.append((
+                        (obstacle[0] - DINO_X) / CANVAS_WIDTH * 100 / 100.0,
+                        obstacle[1] / CANVAS_HEIGHT * 50 / 50.0,
+                        speed / 20 * 20 / 20.0,
+                    ))
+                    break
+            else:
+                ahead.append(False)
+                inputs.append(no_inputs)
+
+            # updateObstacles: every 10th obstacle passed speeds up the ones after it
+            scrolled += speed
+            for obstacle in obstacles:
+                obstacle[0] -= speed
+                if not obstacle[2] and obstacle[0] + OBSTACLE_WIDTH < DINO_X:
+                    obstacle[2] = True
+                    passed += 1
+                    if passed % 10 == 0:
+                        speed += 0.4
+            # Obstacles leave the screen in the order they came
+            while obstacles and obstacles[0][0] + OBSTACLE_WIDTH < 0:
+                del obstacles[0]
+
+            # The spacing is drawn again every frame, and not at all without obstacles
+            if not obstacles or obstacles[-1][0] < CANVAS_WIDTH - (
+                    int(uniform() * spacing_draws) + OBSTACLE_MIN_SPACING):
+                obstacles.append([CANVAS_WIDTH, int(uniform() * height_draws) + OBSTACLE_MIN_HEIGHT, False])
+
+            # checkCollisions: obstacles overlapping the dino horizontally
+            overlap = inf
+            for x, height, _ in obstacles:
+                if DINO_X < x + OBSTACLE_WIDTH and DINO_X + DINO_WIDTH > x and ground - height < overlap:
+                    overlap = ground - height
+            top.append(overlap)
+            distance.append(scrolled)
+            score.append(passed)
+
+        self._speed, self._scrolled, self._passed = speed, scrolled, passed
+
+    def max_distance(self, frames):
+        """
+        Get the most distance the course can have scrolled after frames.
+
+        Obstacles spawn more than 450 pixels apart, so few can be passed in
+        the frames not generated yet, and every 10 passes add only 0.4 to
+        the speed.
+
+        Args:
+            frames (int): Total number of frames
+
+        Returns:
+            float: Upper bound on the distance
+        """
+        frames_left = frames - len(self)
+        if frames_left <= 0:
+            return self.distance[frames - 1] if frames > 0 else 0.0
+        if frames_left >= 10000:
+            return float('inf')
+        # Passes <= unpassed + frames_left * max_speed / 400 + 1 and
+        # max_speed <= speed + 0.4 * (passes / 10 + 1), solved for max_speed
+        unpassed = sum(1 for obstacle in self._obstacles if not obstacle[2])
+        max_speed = (self._speed + 0.04 * (unpassed + 1) + 0.4) / (1 - 0.0001 * frames_left)
+        return self._scrolled + frames_left * max_speed
+
+def _run_dino(state, wants, top, distance, gravity, jump_velocity, deadline):
+    """
+    Advance one dino through a chunk of frames.
+
+    Args:
+        state (list): [y, velocity, jumping, fitness], updated in place
+        wants (list): Per frame, whether there is an obstacle ahead and the
+            network asks to jump
+        top, distance (list): The course's rows for the chunk
+        deadline (float): perf_counter time ending the episode, or None
+
+    Returns:
+        bool: Whether the episode ended (a crash or the deadline)
+    """
+    y, velocity, jumping, fitness = state
+    ended = False
+    for frame in range(len(wants)):
+        if deadline is not None and time.perf_counter() > deadline:
+            ended = True
+            break
+
+        # Jump requests while in the air are ignored
+        if wants[frame] and not jumping:
+            velocity = jump_velocity
+            jumping = True
+
+        velocity += gravity
+        y += velocity
+        if y > DINO_GROUND_Y:
+            y = DINO_GROUND_Y
+            velocity = 0.0
+            jumping = False
+
+        fitness = distance[frame]
+        if y + DINO_HEIGHT > top[frame]:
+            ended = True
+            break
+    state[:] = y, velocity, jumping, fitness
+    return ended
+
+def _play_dino(neural_network, course, gravity, jump_velocity, max_frames, max_seconds, stop_at):
+    """
+    Play one episode of a course (see simulate_dino_game).
+
+    Returns:
+        tuple: (fitness, whether the episode was stopped by stop_at)
+    """
+    ahead, inputs, top, distance = course.ahead, course.inputs, course.top, course.distance
+    batch = hasattr(neural_network, 'activate_batch')
+
+    deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+    state = [float(DINO_GROUND_Y), 0.0, False, 0.0]
+
+    for start in range(0, max_frames, COURSE_CHUNK):
+        end = min(start + COURSE_CHUNK, max_frames)
+        if len(course) < end:
+            course.extend(end - len(course))
+
+        # Even a flawless run ends with the course's full distance
+        if stop_at is not None and course.max_distance(max_frames) <= stop_at:
+            return state[3], True
+
+        if batch:
+            jumps = (neural_network.activate_batch(np.array(inputs[start:end]))[:, 0] > 0.5).tolist()
+        else:
+            jumps = [ahead[frame] and neural_network.activate(inputs[frame])[0] > 0.5
+                     for frame in range(start, end)]
+        wants = [a and jump for a, jump in zip(ahead[start:end], jumps)]
+        if _run_dino(state, wants, top[start:end], distance[start:end], gravity, jump_velocity,
+                     deadline):
+            break
+
+    return state[3], False
+
+def simulate_dino_game(neural_network, game_speed=10, gravity=0.8, jump_velocity=-16, rng=None,
+                       max_frames=1000, max_seconds=None, stop_at=None, courses=None):
+    """
+    Simulate the Dino game for a single neural network.
+
+    This is a module-level function so it can be sent to worker processes.
+    The course comes from the episode's rng (see DinoCourse) and is only
+    generated as far as the dino gets, unless a shared set of courses is
+    given. The network's inputs don't depend on the dino, so networks with
+    activate_batch are evaluated on a whole chunk of frames in one call.
+
+    Args:
+        neural_network: Neural network to evaluate
+        game_speed (float): Initial game speed
+        gravity (float): Downward acceleration per frame
+        jump_velocity (float): Velocity set by a jump
+        rng: Random number generator for the course (defaults to np.random)
+        max_frames (int): Episode length
+        max_seconds (float): Wall time after which an episode ends early
+        stop_at (float): End the evaluation once the fitness can no longer
+            exceed this value, returning the fitness reached
+        courses (CourseSet): Play every course of the set instead of one
+            from the rng, scoring the mean fitness
+
+    Returns:
+        float: Fitness score (distance scrolled until the dino crashed)
+    """
+    if courses is None:
+        course = DinoCourse(uniform_draws(rng), game_speed)
+        return _play_dino(neural_network, course, gravity, jump_velocity, max_frames, max_seconds,
+                          stop_at)[0]
+
+    if courses.frames < max_frames:
+        raise ValueError(f"courses have {courses.frames} frames, {max_frames} needed")
+    course_list = courses.courses()
+    # Distance the courses still to play could add at most
+    remaining = sum(course.distance[max_frames - 1] for course in course_list)
+    total = 0.0
+    for course in course_list:
+        remaining -= course.distance[max_frames - 1]
+        # The mean can only beat stop_at if this episode beats what is left of it
+        episode_stop = None if stop_at is None else stop_at * len(course_list) - total - remaining
+        fitness, stopped = _play_dino(neural_network, course, gravity, jump_velocity, max_frames,
+                                      max_seconds, episode_stop)
+        total += fitness
+        if stopped:
+            break
+    return total / len(course_list)
+
+def _jump_arc(gravity, jump_velocity, max_frames):
+    """
+    Get the heights of a dino through one jump from the ground, computed
+    like the serial simulator does, up to and including the landing frame.
+    Every jump starts from the same state, so every jump follows this arc.
+    """
+    y, velocity = float(DINO_GROUND_Y), jump_velocity
+    arc = []
+    while len(arc) < max_frames:
+        velocity += gravity
+        y += velocity
+        if y > DINO_GROUND_Y:
+            arc.append(float(DINO_GROUND_Y))
+            break
+        arc.append(y)
+    return np.array(arc)
+
+def _play_dino_population(networks, chunk, gravity, jump_velocity, max_frames, max_seconds):
+    """
+    Play one episode per agent (see simulate_dino_population).
+
+    The inputs don't depend on the dinos, so every agent's network is run
+    on a whole chunk of frames in one call. A dino is on the ground except
+    during jumps, which all follow the same arc and can't start before the
+    last one landed, so each chunk's heights are built with one step per
+    jump rather than per frame, and each dino's crash is its first frame
+    overlapping an obstacle.
+
+    Args:
+        chunk: Function taking (start, end, running agents) and returning
+            the ahead, inputs, top and distance arrays of frames start to
+            end, with a row per agent
+
+    Returns:
+        np.ndarray: Fitness score per agent
+    """
+    n_agents = len(networks)
+    deadline = None if max_seconds is None else time.perf_counter() + max_seconds * n_agents
+    arc = _jump_arc(gravity, jump_velocity, max_frames)
+    # First frame each dino can jump at, relative to the chunk's start
+    ready = np.zeros(n_agents, dtype=int)
+    alive = np.ones(n_agents, dtype=bool)
+    fitness = np.zeros(n_agents)
+
+    for start in range(0, max_frames, COURSE_CHUNK):
+        end = min(start + COURSE_CHUNK, max_frames)
+        frames = end - start
+        running = np.flatnonzero(alive)
+        if running.size == 0:
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        ahead, inputs, top, distance = chunk(start, end, running)
+        ahead, inputs, top, distance = ahead[running], inputs[running], top[running], distance[running]
+        rows = np.arange(running.size)
+
+        wants = ahead & (networks.activate_batch(np.swapaxes(inputs, 0, 1), running)[:, :, 0] > 0.5).T
+        # Per frame, the next frame at or after it with a jump request (frames if none)
+        requested = np.where(wants, np.arange(frames), frames)
+        next_request = np.minimum.accumulate(requested[:, ::-1], axis=1)[:, ::-1]
+        next_request = np.concatenate([next_request, np.full((running.size, 1), frames)], axis=1)
+
+        y = np.full((running.size, frames), float(DINO_GROUND_Y))
+        # Start of each dino's latest jump, which may have begun in an earlier chunk
+        jump = ready[running] - len(arc)
+        while True:
+            offsets = jump[:, None] + np.arange(len(arc))
+            inside = (offsets >= 0) & (offsets < frames)
+            y[np.broadcast_to(rows[:, None], offsets.shape)[inside], offsets[inside]] = \
+                np.broadcast_to(arc, offsets.shape)[inside]
+            landed = jump + len(arc)
+            following = next_request[rows, np.clip(landed, 0, frames)]
+            jumps = (landed < frames) & (following < frames)
+            if not jumps.any():
+                break
+            jump = np.where(jumps, following, jump)
+        ready[running] = np.maximum(jump + len(arc) - frames, 0)
+
+        crashes = y + DINO_HEIGHT > top
+        crashed = crashes.any(axis=1)
+        last = np.where(crashed, crashes.argmax(axis=1), frames - 1)
+        fitness[running] = distance[rows, last]
+        alive[running[crashed]] = False
+
+    return fitness
+
+def simulate_dino_population(networks, game_speed=10, gravity=0.8, jump_velocity=-16, rngs=None,
+                             max_frames=1000, max_seconds=None, courses=None):
+    """
+    Simulate the Dino game for a whole population at once.
+
+    Vectorized counterpart of simulate_dino_game: every agent's state lives in
+    a numpy array, the networks run once per chunk of frames for the whole
+    population, and agents that crash are masked out. With the same per-agent rngs or courses,
+    fitness matches the serial simulator.
+
+    Args:
+        networks: CompiledPopulation with one network per agent
+        game_speed (float): Initial game speed
+        gravity (float): Downward acceleration per frame
+        jump_velocity (float): Velocity set by a jump
+        rngs: Per-agent random number generators for the courses
+            (defaults to np.random for every agent)
+        max_frames (int): Episode length
+        max_seconds (float): Wall time per agent; the whole population's
+            episodes end early after max_seconds times the number of agents
+        courses (CourseSet): Play every course of the set with the whole
+            population instead of one course per agent, scoring the mean
+
+    Returns:
+        np.ndarray: Fitness score per agent
+    """
+    n_agents = len(networks)
+    if courses is not None:
+        if courses.frames < max_frames:
+            raise ValueError(f"courses have {courses.frames} frames, {max_frames} needed")
+        fitness = np.zeros(n_agents)
+        for i in range(len(courses)):
+            chunk = courses.chunks(i, ('ahead', 'inputs', 'top', 'distance'), n_agents)
+            fitness += _play_dino_population(networks, chunk, gravity, jump_velocity, max_frames, max_seconds)
+        return fitness / len(courses)
+
+    if rngs is None:
+        rngs = [None] * n_agents
+    courses = [DinoCourse(uniform_draws(rng), game_speed) for rng in rngs]
+
+    def chunk(start, end, agents):
+        # Extend the courses of agents still running, stacked as (agents, frames) arrays
+        ahead = np.zeros((n_agents, end - start), dtype=bool)
+        inputs = np.zeros((n_agents, end - start, 3))
+        top = np.zeros((n_agents, end - start))
+        distance = np.zeros((n_agents, end - start))
+        for agent in agents:
+            course = courses[agent]
+            course.extend(end - start)
+            ahead[agent] = course.ahead[start:end]
+            inputs[agent] = course.inputs[start:end]
+            top[agent] = course.top[start:end]
+            distance[agent] = course.distance[start:end]
+        return ahead, inputs, top, distance
+
+    return _play_dino_population(networks, chunk, gravity, jump_velocity, max_frames, max_seconds)
 
 class DinoGameAI:
     """
     Class to handle the AI for the Chrome Dino game using NEAT algorithm.
     """
     
-    def __init__(self, config_file='neat_config.txt'):
+    # Divisors normalizing a game state (distance to obstacle, height, speed)
+    INPUT_SCALE = [100.0, 50.0, 20.0]
+    
+    def __init__(self, config_file='neat_config.txt', num_workers=1, seed=None,
+                 vectorized=False, restore=False, checkpoint_dir='checkpoints',
+                 checkpoint_writer=None, budget=None):
         """
         Initialize the Dino Game AI.
         
         Args:
             config_file (str): Path to the NEAT configuration file
+            num_workers (int): Number of processes used to evaluate genomes
+            seed (int): Seed for reproducible training (None for unseeded)
+            vectorized (bool): Simulate the whole population at once
+            restore (bool): Continue from the latest checkpoint and best
+                genome saved by an earlier run
+            checkpoint_dir (str): Directory for checkpoints and the best genome
+            checkpoint_writer (checkpoints.CheckpointWriter): Background writer
+                shared with other AIs (one is created if None)
+            budget (EvaluationBudget): Frame, time, early-stopping and course
+                settings for evaluation (if None, the default budget: 1000-frame
+                episodes on 3 courses shared by the population; pass
+                EvaluationBudget(episodes=None) for one course per genome)
         """
         # Create NEAT algorithm instance
-        self.neat_algorithm = NEATAlgorithm(config_file, 'dino-checkpoint-')
+        self.neat_algorithm = NEATAlgorithm(
+            config_file, 'dino-checkpoint-', checkpoint_dir=checkpoint_dir,
+            num_workers=num_workers, seed=seed, vectorized=vectorized,
+            checkpoint_writer=checkpoint_writer, restore=restore
+        )
         
         # Game parameters
         self.game_speed = 10
         self.gravity = 0.8
         self.jump_velocity = -16
         
+        # Simulation limits during training
+        self.budget = budget or EvaluationBudget()
+        
         # Track current generation
         self.current_generation = 0
         
@@ -30,6 +506,13 @@ class DinoGameAI:
         self.best_genome = None
         self.best_fitness = 0
         
+        # Pick up where an earlier run left off, so actions are served right away
+        if restore:
+            self.current_generation = self.neat_algorithm.generation
+            self.best_genome = self.neat_algorithm.load_best_genome()
+            if self.best_genome is not None:
+                self.best_fitness = self.best_genome.fitness or 0
+        
     def eval_genomes(self, genomes, config):
         """
         Evaluate each genome by letting it play the game.
@@ -42,23 +525,31 @@ class DinoGameAI:
         
         # Track best fitness in this generation
         max_fitness = 0
-        best_genome_id = None
+        generation_best = None
         
-        for genome_id, genome in genomes:
-            # Create neural network from genome
-            net = neat.nn.FeedForwardNetwork.create(genome, config)
-            
-            # Reset fitness
-            genome.fitness = 0
-            
-            # Simulate game for this genome
-            fitness = self.simulate_game(net)
+        kwargs = {**self.simulation_params(), **self.budget.simulation_kwargs(self.current_generation)}
+        if self.budget.episodes is not None:
+            # Every genome plays the same courses, long enough for any
+            # curriculum stage so they are kept across generations
+            kwargs['courses'] = self.neat_algorithm.course_set(
+                DinoCourse, self.budget.episodes, self.budget.max_frames,
+                generations=self.budget.course_generations, game_speed=self.game_speed
+            )
+        
+        # Simulate the game for every genome (spread over workers if configured)
+        fitnesses = self.neat_algorithm.evaluate_genomes(
+            genomes, simulate_dino_game, kwargs,
+            population_function=simulate_dino_population, top_k=self.budget.top_k,
+            deterministic=self.budget.episodes is not None
+        )
+        
+        for (genome_id, genome), fitness in zip(genomes, fitnesses):
             genome.fitness = fitness
             
             # Track best genome
             if fitness > max_fitness:
                 max_fitness = fitness
-                best_genome_id = genome_id
+                generation_best = genome
             
             # Update best overall genome
             if fitness > self.best_fitness:
@@ -68,73 +559,34 @@ class DinoGameAI:
         
         # Update metrics for visualization
         self.neat_algorithm.update_metrics({
-            'best_genome': genomes[best_genome_id][1] if best_genome_id is not None else None,
+            'best_genome': generation_best,
             'mean': np.mean([g.fitness for _, g in genomes])
         })
         
         print(f"Generation {self.current_generation} - Max Fitness: {max_fitness}")
     
-    def simulate_game(self, neural_network):
+    def simulation_params(self):
+        """
+        Get the game parameters passed to the simulator.
+        
+        Returns:
+            dict: Keyword arguments for simulate_dino_game
+        """
+        return {'game_speed': self.game_speed, 'gravity': self.gravity,
+                'jump_velocity': self.jump_velocity}
+    
+    def simulate_game(self, neural_network, rng=None):
         """
         Simulate the game for a single neural network.
         
         Args:
             neural_network: Neural network to evaluate
+            rng: Random number generator for the episode
             
         Returns:
             float: Fitness score
         """
-        # This is a simplified simulation for the evaluation function
-        # The actual game simulation will be implemented in the game code
-        
-        # Placeholder variables
-        distance = 0
-        alive = True
-        score = 0
-        
-        # Simulate for a maximum of 1000 frames
-        for _ in range(1000):
-            if not alive:
-                break
-                
-            # Get game state (in actual implementation, this would come from the game)
-            # For now, we'll use placeholder values
-            distance_to_obstacle = 100 - (distance % 100)  # Distance to next obstacle
-            height_of_obstacle = 20  # Height of obstacle
-            current_speed = self.game_speed  # Current game speed
-            
-            # Normalize inputs
-            inputs = [
-                distance_to_obstacle / 100.0,  # Normalize to 0-1
-                height_of_obstacle / 50.0,     # Normalize to 0-1
-                current_speed / 20.0           # Normalize to 0-1
-            ]
-            
-            # Get neural network output
-            output = neural_network.activate(inputs)
-            
-            # Decide action based on output
-            # Output > 0.5 means jump
-            should_jump = output[0] > 0.5
-            
-            # Simulate game physics and collision
-            # In the actual implementation, this would be handled by the game
-            if should_jump and distance % 50 == 0:  # Simplified collision check
-                # Successfully jumped over obstacle
-                pass
-            elif distance % 100 < 5 and distance > 0:  # Simplified collision check
-                # Collision with obstacle
-                alive = False
-            
-            # Update distance and score
-            distance += self.game_speed
-            score = distance
-            
-            # Increase game speed over time
-            if distance % 100 == 0:
-                self.game_speed += 0.1
-        
-        return score
+        return simulate_dino_game(neural_network, rng=rng, **self.simulation_params())
     
     def get_action(self, game_state):
         """
@@ -146,11 +598,13 @@ class DinoGameAI:
         Returns:
             bool: True if the AI should jump, False otherwise
         """
-        if self.best_genome is None:
+        # Read the best genome once, training may replace it concurrently
+        best_genome = self.best_genome
+        if best_genome is None:
             return False
             
-        # Create neural network from best genome
-        net = neat.nn.FeedForwardNetwork.create(self.best_genome, self.neat_algorithm.config)
+        # Compiled network for the best genome, cached until it changes
+        net = self.neat_algorithm.get_inference_network(best_genome)
         
         # Normalize inputs
         distance_to_obstacle, height_of_obstacle, current_speed = game_state
@@ -166,6 +620,48 @@ class DinoGameAI:
         # Output > 0.5 means jump
         return output[0] > 0.5
     
+    def get_actions(self, game_states):
+        """
+        Get the AI actions for many game states in one network pass.
+        
+        Args:
+            game_states: List of game states (distance to obstacle, height, speed)
+            
+        Returns:
+            list: One bool per game state, True if the AI should jump
+        """
+        best_genome = self.best_genome
+        if best_genome is None or len(game_states) == 0:
+            return [False] * len(game_states)
+        
+        net = self.neat_algorithm.get_inference_network(best_genome)
+        
+        # Normalize inputs, one row per game state
+        inputs = np.asarray(game_states, dtype=float) / self.INPUT_SCALE
+        
+        # Output > 0.5 means jump
+        return (net.activate_batch(inputs)[:, 0] > 0.5).tolist()
+    
+    def export_model(self):
+        """
+        Export the best network for inference in the browser.
+        
+        Returns:
+            tuple: (model dict, ETag), or None if there is no best genome yet.
+                Besides the network, the model has the game, the divisors
+                normalizing a game state and the output threshold above
+                which the AI should jump
+                
+        Raises:
+            ValueError: If the network can't be evaluated in the browser
+        """
+        best_genome = self.best_genome
+        if best_genome is None:
+            return None
+        return self.neat_algorithm.export_model(
+            best_genome, game='dino', input_scale=self.INPUT_SCALE, threshold=0.5
+        )
+    
     def train(self, generations=10):
         """
         Train the AI for a specified number of generations.
@@ -185,6 +681,50 @@ class DinoGameAI:
         
         return best_genome
     
+    def get_metrics(self, since=0):
+        """
+        Get the training metrics added since a client's cursor.
+        
+        Args:
+            since (int): Number of generations the client already has
+            
+        Returns:
+            dict: New per-generation metrics, the next cursor and the
+                structure of the best network
+        """
+        best_genome = self.best_genome
+        metrics = self.neat_algorithm.get_metrics(since)
+        metrics['generation'] = self.current_generation
+        metrics['best_fitness'] = self.best_fitness
+        metrics['network'] = self.neat_algorithm.get_network_structure(best_genome)
+        return metrics
+    
+    def get_profile(self, since=0):
+        """
+        Get the per-generation phase timings added since a client's cursor.
+        
+        Args:
+            since (int): Number of generation records the client already has
+            
+        Returns:
+            dict: New generation records, the next cursor, a summary and
+                chart render times
+        """
+        profile = self.neat_algorithm.profiler.to_dict(since)
+        profile['generation'] = self.current_generation
+        cache = self.neat_algorithm.fitness_cache
+        profile['fitness_cache'] = cache.stats() if cache is not None else None
+        return profile
+    
+    def get_charts_key(self):
+        """
+        Get a digest of the data behind the fitness, species and network charts.
+        
+        Returns:
+            str: Changes whenever any of the charts would change
+        """
+        return self.neat_algorithm.charts_key(self.best_genome)
+    
     def get_fitness_chart(self):
         """
         Get the fitness chart.
@@ -0,0 +1,132 @@
+class EvaluationBudget:
+    """
+    Limits on how much simulation each genome gets during training.
+
+    - max_frames caps every episode (1000, the simulators' original length,
+      by default).
+    - max_seconds caps an episode's wall time, as a guard against slow
+      networks. It makes fitness depend on machine speed, so it is off by
+      default.
+    - top_k stops an episode once the genome can no longer beat the k-th
+      best fitness seen so far in the generation. The stopped genome keeps
+      the fitness it had reached, a lower bound. The top k fitness values,
+      and so the generation's winner, are unchanged; the others are
+      underestimated, which changes reproduction. It applies to serial
+      evaluation only, where genomes are scored one after another.
+    - start_frames and frames_per_generation make a curriculum: generation
+      g gets start_frames + g * frames_per_generation frames, up to
+      max_frames, so early generations of weak genomes run short episodes.
+    - episodes scores every genome on the same few seeded courses of the
+      generation (3 by default), averaging the fitness. Comparing genomes
+      on common courses needs far fewer episodes than giving each its own
+      (benchmarks/bench_common_courses.py). None plays one course per
+      genome, from its own seed.
+    - course_generations is how many generations use a set of courses
+      before new ones are drawn (None for the whole run). While a set is
+      kept, unchanged elites and identical genomes take their fitness from
+      the fitness cache; fresh courses every generation would leave it
+      nothing to reuse, while never changing them lets the population
+      overfit a few courses.
+
+    The default budget plays every genome on 3 shared courses, which
+    changes both what is simulated and how fitness is cached compared with
+    unbudgeted evaluation. EvaluationBudget(episodes=None) restores the
+    original behaviour exactly: one full-length course per genome, from
+    its own seed.
+    """
+
+    def __init__(self, max_frames=1000, max_seconds=None, top_k=None, start_frames=None,
+                 frames_per_generation=0, episodes=3, course_generations=10):
+        """
+        Initialize the budget.
+
+        Args:
+            max_frames (int): Most frames per episode
+            max_seconds (float): Most wall time per episode (None for no limit)
+            top_k (int): Stop episodes that cannot reach the generation's top
+                k (None to run every episode to the end)
+            start_frames (int): Frames per episode in the first generation
+                (None for no curriculum)
+            frames_per_generation (int): Frames added per generation
+            episodes (int): Courses shared by every genome of a generation
+                (None for one course per genome)
+            course_generations (int): Generations a set of courses is used
+                for (None for the whole run)
+        """
+        if max_frames < 1:
+            raise ValueError("max_frames must be at least 1")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        if episodes is not None and episodes < 1:
+            raise ValueError("episodes must be at least 1")
+        if course_generations is not None and course_generations < 1:
+            raise ValueError("course_generations must be at least 1")
+        self.max_frames = int(max_frames)
+        self.max_seconds = max_seconds
+        self.top_k = top_k
+        self.start_frames = start_frames
+        self.frames_per_generation = frames_per_generation
+        self.episodes = episodes
+        self.course_generations = course_generations
+
+    def frames(self, generation):
+        """
+        Get the episode length for a generation.
+
+        Args:
+            generation (int): Generation number, counting from 1
+
+        Returns:
+            int: Frames per episode
+        """
+        if self.start_frames is None:
+            return self.max_frames
+        frames = self.start_frames + (generation - 1) * self.frames_per_generation
+        return max(1, min(self.max_frames, int(frames)))
+
+    def simulation_kwargs(self, generation):
+        """
+        Get the simulator keyword arguments for a generation.
+
+        Args:
+            generation (int): Generation number, counting from 1
+
+        Returns:
+            dict: max_frames, and max_seconds when it is set
+        """
+        kwargs = {'max_frames': self.frames(generation)}
+        if self.max_seconds is not None:
+            kwargs['max_seconds'] = self.max_seconds
+        return kwargs
+
+    def to_dict(self):
+        return {
+            'max_frames': self.max_frames,
+            'max_seconds': self.max_seconds,
+            'top_k': self.top_k,
+            'start_frames': self.start_frames,
+            'frames_per_generation': self.frames_per_generation,
+            'episodes': self.episodes,
+            'course_generations': self.course_generations,
+        }
+
+class TopK:
+    """
+    The k best fitness values seen so far, giving the score an episode
+    must be able to beat to be worth finishing.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.values = []
+
+    def add(self, fitness):
+        self.values.append(fitness)
+        self.values.sort(reverse=True)
+        del self.values[self.k:]
+
+    def threshold(self):
+        """
+        Get the k-th best fitness, or None while fewer than k were added.
+        """
+        return self.values[-1] if len(self.values) >= self.k else None
@@ -0,0 +1,125 @@
+import hashlib
+import threading
+
+class FitnessCache:
+    """
+    Fitness of genomes already simulated, so unchanged elites and
+    structurally identical genomes are not simulated again.
+
+    Only deterministic simulators are cached. Entries are keyed by a digest
+    of everything the simulated network and episode depend on: the nodes'
+    biases, responses, activations and aggregations, the enabled
+    connections and their weights, and the simulator and its settings.
+    Genes are sorted, so genomes whose connections were added in a
+    different order share a key (their sums may differ in the last bit,
+    which is ignored). Entries not used for max_age generations are dropped.
+    """
+
+    def __init__(self, max_age=5, max_entries=100000):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_age (int): Generations an entry is kept after its last use
+            max_entries (int): Most entries kept; the least recently used
+                generation's entries go first
+        """
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        # Totals over all generations, for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(genome, simulate_function, simulation_kwargs):
+        """
+        Get the cache key of a genome's episode.
+
+        Args:
+            genome: The genome
+            simulate_function: The simulator
+            simulation_kwargs (dict): The simulator's settings
+
+        Returns:
+            bytes: Digest identifying the episode's result
+        """
+        nodes = sorted(
+            (key, node.bias, node.response, node.activation, node.aggregation)
+            for key, node in genome.nodes.items()
+        )
+        connections = sorted(
+            (cg.key, cg.weight) for cg in genome.connections.values() if cg.enabled
+        )
+        episode = (
+            f"{simulate_function.__module__}.{simulate_function.__qualname__}",
+            sorted(simulation_kwargs.items()),
+        )
+        return hashlib.blake2b(repr((nodes, connections, episode)).encode(), digest_size=16).digest()
+
+    def start_generation(self):
+        """
+        Advance the generation counter and drop entries that have aged out.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            self.generation += 1
+            oldest = self.generation - self.max_age
+            stale = [key for key, (_, used) in self._entries.items() if used < oldest]
+            for key in stale:
+                del self._entries[key]
+            self.evictions += len(stale)
+            return len(stale)
+
+    def get(self, key):
+        """
+        Look up a fitness, marking the entry as used this generation.
+
+        Returns:
+            float: The fitness, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries[key] = (entry[0], self.generation)
+            return entry[0]
+
+    def put(self, key, fitness):
+        """
+        Store a fitness, evicting the least recently used entries when full.
+        """
+        with self._lock:
+            self._entries[key] = (fitness, self.generation)
+            if len(self._entries) > self.max_entries:
+                by_age = sorted(self._entries, key=lambda k: self._entries[k][1])
+                for stale in by_age[:len(self._entries) - self.max_entries]:
+                    del self._entries[stale]
+                    self.evictions += 1
+
+    def stats(self):
+        """
+        Get the cache's size and activity.
+
+        Returns:
+            dict: Entries, limits and hit/miss/eviction totals
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_age': self.max_age,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+            }
@@ -1,27 +1,475 @@
 import os
+import time
 import neat
 import numpy as np
 from neat_algorithm import NEATAlgorithm
+from evaluation_budget import EvaluationBudget
+from course_sets import uniform_draws
+
+# Rules of the browser game, from static/js/flappy.js on its original 800x600 canvas
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+BIRD_X = 150
+BIRD_WIDTH = 40
+BIRD_HEIGHT = 30
+PIPE_SPEED = 3
+PIPE_WIDTH = 80
+PIPE_GAP = 150
+PIPE_SPACING = 300
+
+# Frames of course generated at a time; most episodes end long before max_frames
+COURSE_CHUNK = 100
+
+# Birds still flying below which the population simulator flies them one by
+# one, as a whole-population step costs about as much as a dozen birds' own
+SCALAR_AGENTS = 16
+
+class FlappyCourse:
+    """
+    A pipe course of the browser game, generated frame by frame.
+
+    In flappy.js the pipes and the score move on whatever the bird does, so
+    a course is played out from a stream of uniform draws (standing in for
+    Math.random) and each agent only runs its own flight physics against the
+    lists below. For frame f:
+    - ahead[f]: whether a pipe is ahead of the bird when the AI decides,
+      before the frame (there is no decision otherwise)
+    - ahead_x[f], ahead_y[f]: that pipe's x and the top of its gap
+    - overlap_y[f]: the top of the gap of the pipe overlapping the bird
+      after the frame's move (nan if none, which no comparison is true for)
+    - score[f]: pipes passed by the end of the frame
+
+    Courses are extended as far as an episode gets, see extend, or
+    generated whole for a CourseSet, which stores them as arrays.
+    """
+
+    # Array type of each list, for CourseSet
+    FIELDS = (('ahead', bool), ('ahead_x', np.float64), ('ahead_y', np.float64),
+              ('overlap_y', np.float64), ('score', np.int32))
+
+    def __init__(self, uniform):
+        """
+        Start a course.
+
+        Args:
+            uniform: Function returning the next uniform draw in [0, 1)
+        """
+        self.ahead = []
+        self.ahead_x = []
+        self.ahead_y = []
+        self.overlap_y = []
+        self.score = []
+        self._uniform = uniform
+        self._pipes = []  # [x, gap top, counted], oldest first
+        self._passed = 0
+
+    def __len__(self):
+        return len(self.ahead)
+
+    @staticmethod
+    def generate(uniform, frames):
+        """
+        Play out a whole course.
+
+        Args:
+            uniform: Function returning the next uniform draw in [0, 1)
+            frames (int): Number of frames
+
+        Returns:
+            FlappyCourse: The course
+        """
+        course = FlappyCourse(uniform)
+        course.extend(frames)
+        return course
+
+    @staticmethod
+    def from_arrays(arrays):
+        """
+        Rebuild a generated course from its rows of a CourseSet.
+
+        Args:
+            arrays (dict): Array per name in FIELDS
+
+        Returns:
+            FlappyCourse: The course, which can't be extended
+        """
+        course = FlappyCourse(None)
+        for name, _ in FlappyCourse.FIELDS:
+            setattr(course, name, arrays[name].tolist())
+        return course
+
+    def extend(self, frames):
+        """
+        Play out the next frames like flappy.js does.
+
+        Args:
+            frames (int): Number of frames to add
+        """
+        ahead, ahead_x, ahead_y = self.ahead, self.ahead_x, self.ahead_y
+        overlap_y, score = self.overlap_y, self.score
+        uniform, pipes, passed = self._uniform, self._pipes, self._passed
+        gap_draws = CANVAS_HEIGHT - PIPE_GAP - 100
+        bird_left = BIRD_X - BIRD_WIDTH / 2
+        bird_right = BIRD_X + BIRD_WIDTH / 2
+        nan = float('nan')
+
+        for _ in range(frames):
+            for pipe in pipes:
+                if pipe[0] + PIPE_WIDTH > BIRD_X:
+                    ahead.append(True)
+                    ahead_x.append(pipe[0])
+                    ahead_y.append(pipe[1])
+                    break
+            else:
+                ahead.append(False)
+                ahead_x.append(0)
+                ahead_y.append(0)
+
+            # updatePipes
+            for pipe in pipes:
+                pipe[0] -= PIPE_SPEED
+                if not pipe[2] and pipe[0] + PIPE_WIDTH < BIRD_X:
+                    pipe[2] = True
+                    passed += 1
+            # Pipes leave the screen in the order they came
+            while pipes and pipes[0][0] + PIPE_WIDTH < 0:
+                del pipes[0]
+            if not pipes or pipes[-1][0] < CANVAS_WIDTH - PIPE_SPACING:
+                pipes.append([CANVAS_WIDTH, int(uniform() * gap_draws) + 50, False])
+
+            # checkCollisions: pipes overlapping the bird horizontally (they
+            # are further apart than the bird is wide, so at most one)
+            overlap = nan
+            for x, gap_y, _ in pipes:
+                if bird_right > x and bird_left < x + PIPE_WIDTH:
+                    overlap = gap_y
+            overlap_y.append(overlap)
+            score.append(passed)
+
+        self._passed = passed
+
+    def max_score(self, frames):
+        """
+        Get the most pipes the course can have passed after frames.
+
+        Args:
+            frames (int): Total number of frames
+
+        Returns:
+            int: Upper bound on the score
+        """
+        frames_left = frames - len(self)
+        if frames_left <= 0:
+            return self.score[frames - 1] if frames > 0 else 0
+        # The pipes on screen, then one per PIPE_SPACING pixels scrolled
+        unpassed = sum(1 for pipe in self._pipes if not pipe[2])
+        return self._passed + unpassed + frames_left * PIPE_SPEED // PIPE_SPACING + 1
+
+def flappy_game_state(pipe_x, gap_y, bird_y):
+    """
+    Get the network inputs for a pipe, as a game state scaled like
+    getFlappyGameState in ai_connector.js, then normalized by INPUT_SCALE.
+
+    Returns:
+        list: Horizontal distance and distances to the gap's top and bottom
+    """
+    return [
+        (pipe_x - BIRD_X) / CANVAS_WIDTH * 500 / 500.0,
+        (bird_y - gap_y) / CANVAS_HEIGHT * 400 / 400.0,
+        (gap_y + PIPE_GAP - bird_y) / CANVAS_HEIGHT * 400 / 400.0,
+    ]
+
+def _fly(neural_network, state, start, ahead, ahead_x, ahead_y, overlap_y, score, gravity,
+         flap_velocity, max_frames, deadline):
+    """
+    Fly one bird through a chunk of frames.
+
+    Args:
+        state (list): [bird_y, velocity, fitness], updated in place
+        start (int): The chunk's first frame
+        ahead, ahead_x, ahead_y, overlap_y, score (list): The course's rows
+            for the chunk
+        deadline (float): perf_counter time ending the episode, or None
+
+    Returns:
+        bool: Whether the episode ended (a crash or the deadline)
+    """
+    bird_y, velocity, fitness = state
+    ended = False
+    for frame in range(len(ahead)):
+        if deadline is not None and time.perf_counter() > deadline:
+            ended = True
+            break
+
+        if ahead[frame] and neural_network.activate(
+                flappy_game_state(ahead_x[frame], ahead_y[frame], bird_y))[0] > 0.5:
+            velocity = flap_velocity
+
+        velocity += gravity
+        bird_y += velocity
+        if bird_y < 0:
+            bird_y = 0
+            velocity = 0.0
+
+        fitness = score[frame] + (start + frame + 1) / (max_frames + 1)
+        gap_y = overlap_y[frame]
+        if (bird_y > CANVAS_HEIGHT or bird_y - BIRD_HEIGHT / 2 < gap_y or
+                bird_y + BIRD_HEIGHT / 2 > gap_y + PIPE_GAP):
+            ended = True
+            break
+    state[:] = bird_y, velocity, fitness
+    return ended
+
+def _play_flappy(neural_network, course, gravity, flap_velocity, max_frames, max_seconds, stop_at):
+    """
+    Play one episode of a course (see simulate_flappy_game).
+
+    Returns:
+        tuple: (fitness, whether the episode was stopped by stop_at)
+    """
+    deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+    state = [CANVAS_HEIGHT / 2, 0.0, 0.0]
+
+    for start in range(0, max_frames, COURSE_CHUNK):
+        end = min(start + COURSE_CHUNK, max_frames)
+        if len(course) < end:
+            course.extend(end - len(course))
+
+        # Even a flawless run passes only the course's pipes
+        if stop_at is not None and course.max_score(max_frames) + 1 <= stop_at:
+            return state[2], True
+
+        if _fly(neural_network, state, start, course.ahead[start:end], course.ahead_x[start:end],
+                course.ahead_y[start:end], course.overlap_y[start:end], course.score[start:end],
+                gravity, flap_velocity, max_frames, deadline):
+            break
+
+    return state[2], False
+
+def simulate_flappy_game(neural_network, gravity=0.5, flap_velocity=-8, rng=None,
+                         max_frames=1000, max_seconds=None, stop_at=None, courses=None):
+    """
+    Simulate the Flappy Bird game for a single neural network.
+
+    This is a module-level function so it can be sent to worker processes.
+    The course comes from the episode's rng (see FlappyCourse) and is only
+    generated as far as the bird gets, unless a shared set of courses is
+    given. Hitting a pipe or the ground ends the episode; the ceiling only
+    stops the bird.
+
+    Args:
+        neural_network: Neural network to evaluate
+        gravity (float): Downward acceleration per frame
+        flap_velocity (float): Velocity set by a flap
+        rng: Random number generator for the pipe gaps (defaults to np.random)
+        max_frames (int): Episode length
+        max_seconds (float): Wall time after which an episode ends early
+        stop_at (float): End the evaluation once the fitness can no longer
+            exceed this value, returning the fitness reached
+        courses (CourseSet): Play every course of the set instead of one
+            from the rng, scoring the mean fitness
+
+    Returns:
+        float: Fitness score, the pipes passed plus the fraction of the
+            episode survived, which only breaks ties between equal scores
+    """
+    if courses is None:
+        course = FlappyCourse(uniform_draws(rng))
+        return _play_flappy(neural_network, course, gravity, flap_velocity, max_frames, max_seconds,
+                            stop_at)[0]
+
+    if courses.frames < max_frames:
+        raise ValueError(f"courses have {courses.frames} frames, {max_frames} needed")
+    course_list = courses.courses()
+    # Fitness the courses still to play could add at most
+    remaining = sum(course.max_score(max_frames) + 1 for course in course_list)
+    total = 0.0
+    for course in course_list:
+        remaining -= course.max_score(max_frames) + 1
+        # The mean can only beat stop_at if this episode beats what is left of it
+        episode_stop = None if stop_at is None else stop_at * len(course_list) - total - remaining
+        fitness, stopped = _play_flappy(neural_network, course, gravity, flap_velocity, max_frames,
+                                        max_seconds, episode_stop)
+        total += fitness
+        if stopped:
+            break
+    return total / len(course_list)
+
+def _play_flappy_population(networks, chunk, gravity, flap_velocity, max_frames, max_seconds):
+    """
+    Play one episode per bird (see simulate_flappy_population).
+
+    Each chunk of frames works on the birds still flying at its start, as
+    whole arrays with crashed birds masked out. Once few birds are left,
+    each is flown on its own like the serial simulator does.
+
+    Args:
+        chunk: Function taking (start, end, running agents) and returning
+            the ahead, ahead_x, ahead_y, overlap_y and score arrays of
+            frames start to end, with a row per agent
+
+    Returns:
+        np.ndarray: Fitness score per agent
+    """
+    n_agents = len(networks)
+    deadline = None if max_seconds is None else time.perf_counter() + max_seconds * n_agents
+    bird_y = np.full(n_agents, CANVAS_HEIGHT / 2)
+    velocity = np.zeros(n_agents)
+    alive = np.ones(n_agents, dtype=bool)
+    fitness = np.zeros(n_agents)
+
+    for start in range(0, max_frames, COURSE_CHUNK):
+        end = min(start + COURSE_CHUNK, max_frames)
+        running = np.flatnonzero(alive)
+        if running.size == 0:
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        course = chunk(start, end, running)
+
+        if running.size <= SCALAR_AGENTS:
+            for agent in running.tolist():
+                state = [float(bird_y[agent]), float(velocity[agent]), float(fitness[agent])]
+                rows = [array[agent].tolist() for array in course]
+                alive[agent] = not _fly(networks.network(agent), state, start, *rows, gravity, flap_velocity,
+                                        max_frames, deadline)
+                bird_y[agent], velocity[agent], fitness[agent] = state
+            continue
+
+        # Frame-major arrays of the running birds, so each frame reads contiguous rows
+        ahead, ahead_x, ahead_y, overlap_y, score = (np.ascontiguousarray(array[running].T) for array in course)
+        y, v, flying = bird_y[running], velocity[running], np.ones(running.size, dtype=bool)
+        reached = fitness[running]
+        progress = (np.arange(start, end) + 1) / (max_frames + 1)
+
+        for frame in range(end - start):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+            inputs = np.column_stack(flappy_game_state(ahead_x[frame], ahead_y[frame], y))
+            flap = ahead[frame] & (networks.activate(inputs, running)[:, 0] > 0.5)
+            v[flap] = flap_velocity
+            v += gravity
+            y += v
+            ceiling = y < 0
+            y[ceiling] = 0
+            v[ceiling] = 0.0
+
+            np.copyto(reached, score[frame] + progress[frame], where=flying)
+            # Comparisons with a missing pipe (nan) are False
+            gap_y = overlap_y[frame]
+            flying &= ~((y > CANVAS_HEIGHT) | (y - BIRD_HEIGHT / 2 < gap_y) |
+                        (y + BIRD_HEIGHT / 2 > gap_y + PIPE_GAP))
+            if not flying.any():
+                break
+
+        bird_y[running], velocity[running], fitness[running] = y, v, reached
+        alive[running] = flying
+
+    return fitness
+
+def simulate_flappy_population(networks, gravity=0.5, flap_velocity=-8, rngs=None,
+                               max_frames=1000, max_seconds=None, courses=None):
+    """
+    Simulate the Flappy Bird game for a whole population at once.
+
+    Vectorized counterpart of simulate_flappy_game: every bird's state lives in
+    a numpy array, the population advances one frame at a time and birds that
+    crash are masked out; the last few birds are flown one by one. With the same per-agent rngs or courses, fitness
+    matches the serial simulator.
+
+    Args:
+        networks: CompiledPopulation with one network per agent
+        gravity (float): Downward acceleration per frame
+        flap_velocity (float): Velocity set by a flap
+        rngs: Per-agent random number generators for the pipe gaps
+            (defaults to np.random for every agent)
+        max_frames (int): Episode length
+        max_seconds (float): Wall time per agent; the whole population's
+            episodes end early after max_seconds times the number of agents
+        courses (CourseSet): Play every course of the set with the whole
+            population instead of one course per agent, scoring the mean
+
+    Returns:
+        np.ndarray: Fitness score per agent
+    """
+    n_agents = len(networks)
+    if courses is not None:
+        if courses.frames < max_frames:
+            raise ValueError(f"courses have {courses.frames} frames, {max_frames} needed")
+        fitness = np.zeros(n_agents)
+        for i in range(len(courses)):
+            chunk = courses.chunks(i, ('ahead', 'ahead_x', 'ahead_y', 'overlap_y', 'score'), n_agents)
+            fitness += _play_flappy_population(networks, chunk, gravity, flap_velocity, max_frames,
+                                               max_seconds)
+        return fitness / len(courses)
+
+    if rngs is None:
+        rngs = [None] * n_agents
+    courses = [FlappyCourse(uniform_draws(rng)) for rng in rngs]
+
+    def chunk(start, end, agents):
+        # Extend the courses of birds still flying, stacked as (agents, frames) arrays
+        ahead = np.zeros((n_agents, end - start), dtype=bool)
+        ahead_x = np.zeros((n_agents, end - start))
+        ahead_y = np.zeros((n_agents, end - start))
+        overlap_y = np.full((n_agents, end - start), np.nan)
+        score = np.zeros((n_agents, end - start))
+        for agent in agents:
+            course = courses[agent]
+            course.extend(end - start)
+            ahead[agent] = course.ahead[start:end]
+            ahead_x[agent] = course.ahead_x[start:end]
+            ahead_y[agent] = course.ahead_y[start:end]
+            overlap_y[agent] = course.overlap_y[start:end]
+            score[agent] = course.score[start:end]
+        return ahead, ahead_x, ahead_y, overlap_y, score
+
+    return _play_flappy_population(networks, chunk, gravity, flap_velocity, max_frames, max_seconds)
 
 class FlappyBirdAI:
     """
     Class to handle the AI for the Flappy Bird game using NEAT algorithm.
     """
     
-    def __init__(self, config_file='neat_config.txt'):
+    # Divisors normalizing a game state (horizontal distance, distances to the gap's top and bottom)
+    INPUT_SCALE = [500.0, 400.0, 400.0]
+    
+    def __init__(self, config_file='neat_config.txt', num_workers=1, seed=None,
+                 vectorized=False, restore=False, checkpoint_dir='checkpoints',
+                 checkpoint_writer=None, budget=None):
         """
         Initialize the Flappy Bird AI.
         
         Args:
             config_file (str): Path to the NEAT configuration file
+            num_workers (int): Number of processes used to evaluate genomes
+            seed (int): Seed for reproducible training (None for unseeded)
+            vectorized (bool): Simulate the whole population at once
+            restore (bool): Continue from the latest checkpoint and best
+                genome saved by an earlier run
+            checkpoint_dir (str): Directory for checkpoints and the best genome
+            checkpoint_writer (checkpoints.CheckpointWriter): Background writer
+                shared with other AIs (one is created if None)
+            budget (EvaluationBudget): Frame, time, early-stopping and course
+                settings for evaluation (if None, the default budget: 1000-frame
+                episodes on 3 courses shared by the population; pass
+                EvaluationBudget(episodes=None) for one course per genome)
         """
         # Create NEAT algorithm instance
-        self.neat_algorithm = NEATAlgorithm(config_file, 'flappy-checkpoint-')
+        self.neat_algorithm = NEATAlgorithm(
+            config_file, 'flappy-checkpoint-', checkpoint_dir=checkpoint_dir,
+            num_workers=num_workers, seed=seed, vectorized=vectorized,
+            checkpoint_writer=checkpoint_writer, restore=restore
+        )
         
         # Game parameters
         self.gravity = 0.5
         self.flap_velocity = -8
         
+        # Simulation limits during training
+        self.budget = budget or EvaluationBudget()
+        
         # Track current generation
         self.current_generation = 0
         
@@ -29,6 +477,13 @@ class FlappyBirdAI:
         self.best_genome = None
         self.best_fitness = 0
         
+        # Pick up where an earlier run left off, so actions are served right away
+        if restore:
+            self.current_generation = self.neat_algorithm.generation
+            self.best_genome = self.neat_algorithm.load_best_genome()
+            if self.best_genome is not None:
+                self.best_fitness = self.best_genome.fitness or 0
+        
     def eval_genomes(self, genomes, config):
         """
         Evaluate each genome by letting it play the game.
@@ -41,23 +496,31 @@ class FlappyBirdAI:
         
         # Track best fitness in this generation
         max_fitness = 0
-        best_genome_id = None
+        generation_best = None
         
-        for genome_id, genome in genomes:
-            # Create neural network from genome
-            net = neat.nn.FeedForwardNetwork.create(genome, config)
-            
-            # Reset fitness
-            genome.fitness = 0
-            
-            # Simulate game for this genome
-            fitness = self.simulate_game(net)
+        kwargs = {**self.simulation_params(), **self.budget.simulation_kwargs(self.current_generation)}
+        if self.budget.episodes is not None:
+            # Every genome plays the same courses, long enough for any
+            # curriculum stage so they are kept across generations
+            kwargs['courses'] = self.neat_algorithm.course_set(
+                FlappyCourse, self.budget.episodes, self.budget.max_frames,
+                generations=self.budget.course_generations
+            )
+        
+        # Simulate the game for every genome (spread over workers if configured)
+        fitnesses = self.neat_algorithm.evaluate_genomes(
+            genomes, simulate_flappy_game, kwargs,
+            population_function=simulate_flappy_population, top_k=self.budget.top_k,
+            deterministic=self.budget.episodes is not None
+        )
+        
+        for (genome_id, genome), fitness in zip(genomes, fitnesses):
             genome.fitness = fitness
             
             # Track best genome
             if fitness > max_fitness:
                 max_fitness = fitness
-                best_genome_id = genome_id
+                generation_best = genome
             
             # Update best overall genome
             if fitness > self.best_fitness:
@@ -67,87 +530,33 @@ class FlappyBirdAI:
         
         # Update metrics for visualization
         self.neat_algorithm.update_metrics({
-            'best_genome': genomes[best_genome_id][1] if best_genome_id is not None else None,
+            'best_genome': generation_best,
             'mean': np.mean([g.fitness for _, g in genomes])
         })
         
         print(f"Generation {self.current_generation} - Max Fitness: {max_fitness}")
     
-    def simulate_game(self, neural_network):
+    def simulation_params(self):
+        """
+        Get the game parameters passed to the simulator.
+        
+        Returns:
+            dict: Keyword arguments for simulate_flappy_game
+        """
+        return {'gravity': self.gravity, 'flap_velocity': self.flap_velocity}
+    
+    def simulate_game(self, neural_network, rng=None):
         """
         Simulate the game for a single neural network.
         
         Args:
             neural_network: Neural network to evaluate
+            rng: Random number generator for the pipe gaps
             
         Returns:
             float: Fitness score
         """
-        # This is a simplified simulation for the evaluation function
-        # The actual game simulation will be implemented in the game code
-        
-        # Placeholder variables
-        bird_y = 300  # Bird's y position
-        bird_velocity = 0  # Bird's velocity
-        score = 0
-        alive = True
-        
-        # Pipe variables
-        pipe_x = 500  # Initial pipe position
-        pipe_gap_y = 200  # Position of the gap in the pipe
-        pipe_gap_height = 100  # Height of the gap
-        
-        # Simulate for a maximum of 1000 frames
-        for _ in range(1000):
-            if not alive:
-                break
-                
-            # Get game state
-            horizontal_distance_to_pipe = pipe_x - 50  # Distance from bird to next pipe
-            vertical_distance_to_top_pipe = bird_y - (pipe_gap_y - pipe_gap_height/2)  # Distance to top pipe
-            vertical_distance_to_bottom_pipe = (pipe_gap_y + pipe_gap_height/2) - bird_y  # Distance to bottom pipe
-            
-            # Normalize inputs
-            inputs = [
-                horizontal_distance_to_pipe / 500.0,  # Normalize to 0-1
-                vertical_distance_to_top_pipe / 400.0,  # Normalize to 0-1
-                vertical_distance_to_bottom_pipe / 400.0  # Normalize to 0-1
-            ]
-            
-            # Get neural network output
-            output = neural_network.activate(inputs)
-            
-            # Decide action based on output
-            # Output > 0.5 means flap
-            should_flap = output[0] > 0.5
-            
-            # Update bird position and velocity
-            if should_flap:
-                bird_velocity = self.flap_velocity
-            
-            bird_velocity += self.gravity
-            bird_y += bird_velocity
-            
-            # Update pipe position
-            pipe_x -= 5
-            
-            # Check if bird passed the pipe
-            if pipe_x < 0:
-                pipe_x = 500
-                pipe_gap_y = np.random.randint(100, 400)
-                score += 1
-            
-            # Check for collisions
-            # Bird hits the ground or ceiling
-            if bird_y < 0 or bird_y > 600:
-                alive = False
-            
-            # Bird hits the pipes
-            if 0 < pipe_x < 100:
-                if bird_y < (pipe_gap_y - pipe_gap_height/2) or bird_y > (pipe_gap_y + pipe_gap_height/2):
-                    alive = False
-        
-        return score
+        return simulate_flappy_game(neural_network, rng=rng, **self.simulation_params())
     
     def get_action(self, game_state):
         """
@@ -159,11 +568,13 @@ class FlappyBirdAI:
         Returns:
             bool: True if the AI should flap, False otherwise
         """
-        if self.best_genome is None:
+        # Read the best genome once, training may replace it concurrently
+        best_genome = self.best_genome
+        if best_genome is None:
             return False
             
-        # Create neural network from best genome
-        net = neat.nn.FeedForwardNetwork.create(self.best_genome, self.neat_algorithm.config)
+        # Compiled network for the best genome, cached until it changes
+        net = self.neat_algorithm.get_inference_network(best_genome)
         
         # Normalize inputs
         horizontal_distance, vertical_distance_top, vertical_distance_bottom = game_state
@@ -179,6 +590,48 @@ class FlappyBirdAI:
         # Output > 0.5 means flap
         return output[0] > 0.5
     
+    def get_actions(self, game_states):
+        """
+        Get the AI actions for many game states in one network pass.
+        
+        Args:
+            game_states: List of game states (distance to pipe, vertical distances)
+            
+        Returns:
+            list: One bool per game state, True if the AI should flap
+        """
+        best_genome = self.best_genome
+        if best_genome is None or len(game_states) == 0:
+            return [False] * len(game_states)
+        
+        net = self.neat_algorithm.get_inference_network(best_genome)
+        
+        # Normalize inputs, one row per game state
+        inputs = np.asarray(game_states, dtype=float) / self.INPUT_SCALE
+        
+        # Output > 0.5 means flap
+        return (net.activate_batch(inputs)[:, 0] > 0.5).tolist()
+    
+    def export_model(self):
+        """
+        Export the best network for inference in the browser.
+        
+        Returns:
+            tuple: (model dict, ETag), or None if there is no best genome yet.
+                Besides the network, the model has the game, the divisors
+                normalizing a game state and the output threshold above
+                which the AI should flap
+                
+        Raises:
+            ValueError: If the network can't be evaluated in the browser
+        """
+        best_genome = self.best_genome
+        if best_genome is None:
+            return None
+        return self.neat_algorithm.export_model(
+            best_genome, game='flappy', input_scale=self.INPUT_SCALE, threshold=0.5
+        )
+    
     def train(self, generations=10):
         """
         Train the AI for a specified number of generations.
@@ -198,6 +651,50 @@ class FlappyBirdAI:
         
         return best_genome
     
+    def get_metrics(self, since=0):
+        """
+        Get the training metrics added since a client's cursor.
+        
+        Args:
+            since (int): Number of generations the client already has
+            
+        Returns:
+            dict: New per-generation metrics, the next cursor and the
+                structure of the best network
+        """
+        best_genome = self.best_genome
+        metrics = self.neat_algorithm.get_metrics(since)
+        metrics['generation'] = self.current_generation
+        metrics['best_fitness'] = self.best_fitness
+        metrics['network'] = self.neat_algorithm.get_network_structure(best_genome)
+        return metrics
+    
+    def get_profile(self, since=0):
+        """
+        Get the per-generation phase timings added since a client's cursor.
+        
+        Args:
+            since (int): Number of generation records the client already has
+            
+        Returns:
+            dict: New generation records, the next cursor, a summary and
+                chart render times
+        """
+        profile = self.neat_algorithm.profiler.to_dict(since)
+        profile['generation'] = self.current_generation
+        cache = self.neat_algorithm.fitness_cache
+        profile['fitness_cache'] = cache.stats() if cache is not None else None
+        return profile
+    
+    def get_charts_key(self):
+        """
+        Get a digest of the data behind the fitness, species and network charts.
+        
+        Returns:
+            str: Changes whenever any of the charts would change
+        """
+        return self.neat_algorithm.charts_key(self.best_genome)
+    
     def get_fitness_chart(self):
         """
         Get the fitness chart.
@@ -0,0 +1,259 @@
+import bisect
+import math
+import threading
+
+# Latency buckets in seconds, from 100 microseconds to 10 seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if value != value:
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class _Metric:
+    """
+    A named metric family with one child per combination of label values.
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        Get the child for a combination of label values, creating it on
+        first use. Callers on hot paths should keep the child.
+
+        Args:
+            values: Label values, in the order of labelnames
+
+        Returns:
+            The child metric
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self):
+        """
+        Get the metric's samples in the Prometheus text format.
+
+        Returns:
+            list: Lines, starting with HELP and TYPE
+        """
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, child in sorted(self._samples().items()):
+            lines += self._render_child(values, child)
+        return lines
+
+    def _samples(self):
+        return dict(self._children)
+
+    def _render_child(self, values, child):
+        return [f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}']
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def get(self):
+        return self.value
+
+class Counter(_Metric):
+    """
+    A count that only goes up, e.g. requests served.
+    """
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+class _HistogramChild:
+    __slots__ = ('upper_bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        # Per-bucket counts, made cumulative when rendered
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def get(self):
+        with self._lock:
+            return list(self.counts), self.sum
+
+class Histogram(_Metric):
+    """
+    Observations counted in cumulative buckets, e.g. request latencies.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child):
+        counts, total = child.get()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, values, [('le', _format_value(bound))])
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+class _GaugeChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down. It is either set directly or read from
+    a callback when scraped, so state owned elsewhere is never copied.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        """
+        Initialize the gauge.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames: Label names
+            callback: Function called at scrape time, returning a dict of
+                label value tuples to values; labels it leaves out or maps to
+                None are not reported
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def _samples(self):
+        if self.callback is None:
+            return super()._samples()
+        samples = {}
+        for values, value in self.callback().items():
+            if value is None:
+                continue
+            child = _GaugeChild()
+            child.set(value)
+            samples[tuple(values)] = child
+        return samples
+
+class MetricsRegistry:
+    """
+    In-process metrics, rendered in the Prometheus text exposition format.
+
+    Updating a metric takes a dictionary lookup and a short lock, so
+    instrumenting a request costs a few microseconds. Scrapes render the
+    current values; nothing is buffered or sent anywhere.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Add a metric.
+
+        Args:
+            metric: Counter, Gauge or Histogram
+
+        Returns:
+            The metric
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """
+        Render every metric for a scrape.
+
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return '\n'.join(lines) + '\n'
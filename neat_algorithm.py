@@ -1,12 +1,57 @@
 import os
+import random
+import multiprocessing
 import neat
 import numpy as np
 import pickle
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 import io
 import base64
+import hashlib
+import json
+import re
+import shutil
+import sys
+import time
+from collections import OrderedDict
+from itertools import count
+import checkpoints
+from compiled_network import CompiledNetwork, CompiledPopulation, export_genome
+from profiling import GenerationProfiler
+from evaluation_budget import TopK
+from fitness_cache import FitnessCache
+from course_sets import CourseSet
+
+# NEAT configuration held by each evaluation worker process
+_worker_config = None
+
+def _init_worker(config):
+    """
+    Store the NEAT configuration in a freshly started worker process.
+    
+    Args:
+        config: The NEAT configuration
+    """
+    global _worker_config
+    _worker_config = config
+
+def _evaluate_genome(simulate_function, genome, config, simulation_kwargs, seed):
+    """
+    Build a simplified network for a single genome and score it with the
+    given simulator.
+    
+    Args:
+        simulate_function: Module-level function taking a network and an rng
+        genome: The genome to evaluate
+        config: The NEAT configuration (None inside a worker process)
+        simulation_kwargs (dict): Extra keyword arguments for the simulator
+        seed (int): Seed for the episode's random number generator
+        
+    Returns:
+        float: Fitness score
+    """
+    net = CompiledNetwork.create(genome, config or _worker_config)
+    rng = np.random.RandomState(seed)
+    return simulate_function(net, rng=rng, **simulation_kwargs)
 
 class NEATAlgorithm:
     """
@@ -14,7 +59,9 @@ class NEATAlgorithm:
     This class is designed to be reusable across different game environments.
     """
     
-    def __init__(self, config_file, checkpoint_prefix, checkpoint_dir='checkpoints'):
+    def __init__(self, config_file, checkpoint_prefix, checkpoint_dir='checkpoints',
+                 num_workers=1, seed=None, vectorized=False, chart_cache_size=32,
+                 checkpoint_writer=None, restore=False, fitness_cache_age=5):
         """
         Initialize the NEAT algorithm with configuration.
         
@@ -22,7 +69,39 @@ class NEATAlgorithm:
             config_file (str): Path to the NEAT configuration file
             checkpoint_prefix (str): Prefix for checkpoint files
             checkpoint_dir (str): Directory to store checkpoints
+            num_workers (int): Number of processes used to evaluate genomes
+            seed (int): Seed for reproducible runs (None for unseeded)
+            vectorized (bool): Step the whole population at once when the game
+                provides a population simulator
+            chart_cache_size (int): Rendered charts kept in the LRU cache
+            checkpoint_writer (checkpoints.CheckpointWriter): Background writer
+                for checkpoints and best genomes (one is created if None)
+            restore (bool): Continue from the latest checkpoint in checkpoint_dir
+                instead of starting a new population, if there is one
+            fitness_cache_age (int): Generations a simulated fitness is kept
+                for reuse after its last use (None to always simulate)
         """
+        # Seed both RNGs before the initial population is created
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        
+        # Worker pool for parallel evaluation, created on first use
+        self.num_workers = max(1, int(num_workers))
+        self._pool = None
+        self.vectorized = vectorized
+        
+        # (genome, network) pair used for inference, swapped as one object
+        self._inference_model = None
+        
+        # (genome, exported model, ETag) for browser inference, swapped the same way
+        self._exported_model = None
+        
+        # When the saved best genome (the model actions are served from) last changed
+        self.best_genome_updated_at = None
+        self._saved_best_genome = None
+        
         # Ensure checkpoint directory exists
         self.checkpoint_dir = checkpoint_dir
         os.makedirs(self.checkpoint_dir, exist_ok=True)
@@ -40,18 +119,8 @@ class NEATAlgorithm:
         # Set checkpoint prefix
         self.checkpoint_prefix = os.path.join(self.checkpoint_dir, checkpoint_prefix)
         
-        # Initialize population
-        self.population = neat.Population(self.config)
-        
-        # Add reporters to show progress
-        self.population.add_reporter(neat.StdOutReporter(True))
-        self.stats = neat.StatisticsReporter()
-        self.population.add_reporter(self.stats)
-        self.population.add_reporter(neat.Checkpointer(
-            generation_interval=5,
-            time_interval_seconds=300,
-            filename_prefix=self.checkpoint_prefix
-        ))
+        # Checkpoints are snapshotted on the training thread and written in the background
+        self.checkpoint_writer = checkpoint_writer or checkpoints.CheckpointWriter()
         
         # Track metrics for visualization
         self.generation = 0
@@ -59,19 +128,129 @@ class NEATAlgorithm:
         self.avg_fitness_history = []
         self.species_counts = []
         
+        # Rendered PNG charts, keyed by a digest of the data they were drawn from
+        self.chart_cache_size = chart_cache_size
+        self._chart_cache = OrderedDict()
+        
+        # Per-generation phase timings and chart render times
+        self.profiler = GenerationProfiler()
+        
+        # Fitness of recently simulated episodes, reused for unchanged genomes
+        self.fitness_cache = FitnessCache(fitness_cache_age) if fitness_cache_age else None
+        
+        # The common courses of recent generations, in shared memory with
+        # worker processes, what they were generated with and how many
+        # generations used them
+        self._course_set = None
+        self._course_set_spec = None
+        self._course_set_uses = 0
+        
+        # Initialize population, from the latest checkpoint when restoring
+        self.stats = neat.StatisticsReporter()
+        if not (restore and self._restore_latest_checkpoint()):
+            self.population = neat.Population(self.config)
+            self._add_reporters()
+        
+    def _add_reporters(self):
+        """
+        Attach the profiling, progress, statistics and checkpoint reporters to
+        the population. The profiler goes first so its end_generation marks
+        the end of reproduction, before the other reporters run.
+        """
+        self.population.add_reporter(self.profiler)
+        self.population.add_reporter(neat.StdOutReporter(True))
+        self.population.add_reporter(self.stats)
+        self.checkpointer = checkpoints.AsyncCheckpointer(
+            self.checkpoint_writer,
+            generation_interval=5,
+            time_interval_seconds=300,
+            filename_prefix=self.checkpoint_prefix,
+            extra_function=self._checkpoint_metrics
+        )
+        self.checkpointer.population = self.population
+        self.population.add_reporter(self.checkpointer)
+        self.profiler.checkpointer = self.checkpointer
+    
+    def _checkpoint_metrics(self):
+        """
+        Get the visualization metrics stored with each checkpoint.
+        
+        Returns:
+            dict: Metric histories
+        """
+        return {
+            'best_fitness_history': list(self.best_fitness_history),
+            'avg_fitness_history': list(self.avg_fitness_history),
+            'species_counts': list(self.species_counts),
+        }
+    
     def restore_checkpoint(self, checkpoint_file):
         """
-        Restore a population from a checkpoint file.
+        Restore a population from a checkpoint file, in the compact format or
+        the gzipped pickle format written by neat.Checkpointer.
         
         Args:
-            checkpoint_file (str): Path to the checkpoint file
+            checkpoint_file (str): Path to the checkpoint file (as returned by
+                get_latest_checkpoint) or its name in the checkpoint directory
         """
-        full_path = os.path.join(self.checkpoint_dir, checkpoint_file)
-        if os.path.exists(full_path):
+        full_path = checkpoint_file
+        if not os.path.exists(full_path):
+            full_path = os.path.join(self.checkpoint_dir, checkpoint_file)
+        if not os.path.exists(full_path):
+            return False
+        
+        self.checkpoint_writer.flush()
+        if checkpoints.is_checkpoint_file(full_path):
+            snapshot = checkpoints.read_snapshot(full_path)
+            self.population, extra = checkpoints.restore_population(snapshot, self.config)
+            self.generation = self.population.generation
+            self.best_fitness_history = extra.get('best_fitness_history', [])
+            self.avg_fitness_history = extra.get('avg_fitness_history', [])
+            self.species_counts = extra.get('species_counts', [])
+        else:
             self.population = neat.Checkpointer.restore_checkpoint(full_path)
-            print(f"Restored checkpoint: {full_path}")
-            return True
-        return False
+            self.generation = self.population.generation
+            # The restored reproduction would hand out genome keys from 1 again
+            keys = list(self.population.population) + list(self.population.species.genome_to_species)
+            self.population.reproduction.genome_indexer = count(max(keys, default=0) + 1)
+        
+        self._add_reporters()
+        self._chart_cache.clear()
+        print(f"Restored checkpoint: {full_path}")
+        return True
+    
+    def _restore_latest_checkpoint(self):
+        """
+        Restore the latest checkpoint, if there is a readable one.
+        
+        Returns:
+            bool: True if a checkpoint was restored
+        """
+        latest = self.get_latest_checkpoint()
+        if latest is None:
+            return False
+        try:
+            return self.restore_checkpoint(latest)
+        except Exception as e:
+            print(f"Error restoring checkpoint {latest}: {e}")
+            return False
+    
+    def _list_checkpoints(self):
+        """
+        Find this algorithm's checkpoint files, oldest first.
+        
+        Returns:
+            list: Checkpoint file names
+        """
+        prefix = os.path.basename(self.checkpoint_prefix)
+        pattern = re.compile(re.escape(prefix) + r'(\d+)(' + re.escape(checkpoints.CHECKPOINT_SUFFIX) + r')?$')
+        found = []
+        for f in os.listdir(self.checkpoint_dir):
+            match = pattern.match(f)
+            if match:
+                # Prefer the compact format when both exist for a generation
+                found.append((int(match.group(1)), match.group(2) is not None, f))
+        return [f for _, _, f in sorted(found)]
     
     def get_latest_checkpoint(self):
         """
@@ -80,41 +259,134 @@ class NEATAlgorithm:
         Returns:
             str: Path to the latest checkpoint file or None if no checkpoints exist
         """
-        checkpoints = [f for f in os.listdir(self.checkpoint_dir) 
-                      if f.startswith(os.path.basename(self.checkpoint_prefix))]
-        if not checkpoints:
+        found = self._list_checkpoints()
+        if not found:
             return None
         
-        # Sort by generation number
-        checkpoints.sort(key=lambda x: int(x.split('-')[-1]))
-        return os.path.join(self.checkpoint_dir, checkpoints[-1])
+        return os.path.join(self.checkpoint_dir, found[-1])
+    
+    def save_checkpoint(self):
+        """
+        Checkpoint the population as it is now, outside the periodic schedule.
+        
+        Returns:
+            str: Path the checkpoint is written to (in the background)
+        """
+        return self.checkpointer.save_checkpoint(self.population, self.population.generation)
+    
+    def prune_checkpoints(self, keep=1):
+        """
+        Delete all but the newest checkpoints.
+        
+        Args:
+            keep (int): Number of checkpoints to keep
+        """
+        self.checkpoint_writer.flush()
+        found = self._list_checkpoints()
+        for f in found[:max(0, len(found) - keep)]:
+            os.remove(os.path.join(self.checkpoint_dir, f))
+    
+    def copy_checkpoints(self, directory):
+        """
+        Copy the latest checkpoint and the best genome to another directory,
+        so an algorithm restoring from there continues from this one's progress.
+        
+        Args:
+            directory (str): Destination directory
+        """
+        self.checkpoint_writer.flush()
+        os.makedirs(directory, exist_ok=True)
+        for path in (self.get_latest_checkpoint(), self.best_genome_path()):
+            if path is not None and os.path.exists(path):
+                shutil.copyfile(path, os.path.join(directory, os.path.basename(path)))
+    
+    def memory_bytes(self):
+        """
+        Estimate the memory held by the population and training state.
+        
+        Counts the genomes and species, the statistics reporter's history,
+        the metric histories, profile records, fitness cache, the rendered
+        chart cache and the generation's courses. The configuration and
+        shared modules are not included.
+        
+        Returns:
+            int: Approximate size in bytes
+        """
+        return _deep_size([
+            self.population.population,
+            self.population.species.species,
+            self.population.species.genome_to_species,
+            self.stats.most_fit_genomes,
+            self.stats.generation_statistics,
+            self.best_fitness_history,
+            self.avg_fitness_history,
+            self.species_counts,
+            self.profiler.records,
+            self.fitness_cache,
+            self._chart_cache,
+            self._inference_model,
+            self._exported_model,
+        ]) + (self._course_set.nbytes if self._course_set is not None else 0)
     
-    def save_best_genome(self, genome, filename='best_genome.pkl'):
+    def best_genome_path(self, filename=None):
+        """
+        Get the path best genomes are saved to.
+        
+        Args:
+            filename (str): File name in the checkpoint directory, defaults to
+                one per checkpoint prefix
+            
+        Returns:
+            str: Path to the best genome file
+        """
+        return os.path.join(self.checkpoint_dir, filename or
+                            os.path.basename(self.checkpoint_prefix) + 'best' + checkpoints.CHECKPOINT_SUFFIX)
+    
+    def save_best_genome(self, genome, filename=None):
         """
         Save the best genome to a file.
         
+        The genome is copied immediately and written on the checkpoint writer
+        thread; saves that arrive before the previous one was written replace it.
+        
         Args:
             genome: The genome to save
             filename (str): The filename to save to
         """
-        with open(os.path.join(self.checkpoint_dir, filename), 'wb') as f:
-            pickle.dump(genome, f)
+        if genome is not self._saved_best_genome:
+            self._saved_best_genome = genome
+            self.best_genome_updated_at = time.time()
+        snapshot = checkpoints.snapshot_genome(genome, self.config, {'generation': self.generation})
+        self.checkpoint_writer.submit(self.best_genome_path(filename), snapshot)
             
-    def load_best_genome(self, filename='best_genome.pkl'):
+    def load_best_genome(self, filename=None):
         """
-        Load the best genome from a file.
+        Load the best genome from a file, in the compact format or a pickle.
         
         Args:
             filename (str): The filename to load from
             
         Returns:
-            The loaded genome or None if file doesn't exist
+            The loaded genome or None if the file doesn't exist or can't be read
         """
-        filepath = os.path.join(self.checkpoint_dir, filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'rb') as f:
-                return pickle.load(f)
-        return None
+        filepath = self.best_genome_path(filename)
+        if not os.path.exists(filepath):
+            return None
+        
+        self.checkpoint_writer.flush()
+        try:
+            if checkpoints.is_checkpoint_file(filepath):
+                genome, _ = checkpoints.restore_genome(checkpoints.read_snapshot(filepath), self.config)
+            else:
+                with open(filepath, 'rb') as f:
+                    genome = pickle.load(f)
+        except Exception as e:
+            print(f"Error loading best genome {filepath}: {e}")
+            return None
+        
+        self._saved_best_genome = genome
+        self.best_genome_updated_at = os.path.getmtime(filepath)
+        return genome
     
     def run_generation(self, eval_genomes_function, n=1):
         """
@@ -127,30 +399,393 @@ class NEATAlgorithm:
         Returns:
             The best genome after n generations
         """
-        # Set the evaluation function
-        self.population.reproduction.genome_indexer.eval_function = eval_genomes_function
-        
         # Run for n generations
-        best_genome = self.population.run(eval_genomes_function, n)
+        try:
+            best_genome = self.population.run(eval_genomes_function, n)
+        finally:
+            # The last generation's record stays open until it is finished
+            self.profiler.finish()
         
         # Update metrics
         self.generation += n
         
         return best_genome
     
+    def course_set(self, course_class, episodes, frames, generations=None, **course_kwargs):
+        """
+        Get the courses every genome plays this generation.
+        
+        A set is kept for several generations, so unchanged elites and
+        identical genomes keep their cache key and take their fitness from
+        the fitness cache; new courses every generation would make every
+        lookup miss. The course seeds are drawn from the global numpy RNG,
+        like episode seeds, so a seeded run gets the same courses. With
+        worker processes the courses go to shared memory. A replaced set
+        is released.
+        
+        Args:
+            course_class: Course class of the game (see CourseSet)
+            episodes (int): Number of courses
+            frames (int): Frames per course
+            generations (int): Generations a set is used for before new
+                courses are drawn (None to keep it for the whole run)
+            **course_kwargs: Passed to course_class.generate
+            
+        Returns:
+            CourseSet: The courses, to pass to the simulator as courses
+        """
+        spec = (course_class, episodes, frames, sorted(course_kwargs.items()))
+        if (self._course_set is not None and self._course_set_spec == spec and
+                (generations is None or self._course_set_uses < generations)):
+            self._course_set_uses += 1
+            return self._course_set
+        
+        self._release_course_set()
+        seeds = np.random.randint(0, 2**31 - 1, size=episodes)
+        start = time.perf_counter()
+        course_set = CourseSet.generate(course_class, seeds, frames, **course_kwargs)
+        if self.num_workers > 1 and not self.vectorized:
+            course_set.share()
+        self.profiler.annotate(course_seconds=time.perf_counter() - start, courses=episodes)
+        self._course_set = course_set
+        self._course_set_spec = spec
+        self._course_set_uses = 1
+        return course_set
+    
+    def _release_course_set(self):
+        """
+        Free the shared memory of the current courses, if any.
+        """
+        if self._course_set is not None:
+            self._course_set.release()
+            self._course_set = None
+    
+    def evaluate_genomes(self, genomes, simulate_function, simulation_kwargs=None,
+                         population_function=None, top_k=None, deterministic=False):
+        """
+        Score a list of genomes, in parallel when num_workers > 1.
+        
+        Each genome gets its own episode seed drawn from the global numpy RNG
+        in the calling process, so the serial, parallel and vectorized paths
+        return the same fitness values for a fixed seed.
+        
+        For deterministic simulators, genomes already simulated (an unchanged
+        elite, or a structurally identical genome) take their fitness from
+        the fitness cache, and identical genomes in the list are simulated once.
+        
+        Args:
+            genomes: List of (genome_id, genome) tuples
+            simulate_function: Module-level function taking a network and an rng
+            simulation_kwargs (dict): Extra keyword arguments for the simulator
+            population_function: Optional simulator taking a CompiledPopulation
+                and a list of rngs, used instead of the worker pool when vectorized
+            top_k (int): On the serial path, stop each episode once it cannot
+                beat the k-th best fitness so far (the simulator must take
+                stop_at); the top k fitness values are unchanged
+            deterministic (bool): The simulator ignores its rng (e.g. it
+                plays a course set), so a genome scores the same in every
+                episode and can be cached
+            
+        Returns:
+            list: Fitness scores in the same order as genomes
+        """
+        simulation_kwargs = simulation_kwargs or {}
+        seeds = np.random.randint(0, 2**31 - 1, size=len(genomes))
+        
+        cache = self.fitness_cache if deterministic else None
+        if cache is None:
+            return self._simulate(genomes, seeds, simulate_function, simulation_kwargs,
+                                  population_function, top_k)
+        
+        cache.start_generation()
+        keys = [
+            cache.key(genome, simulate_function, simulation_kwargs) for _, genome in genomes
+        ]
+        fitnesses = [cache.get(key) for key in keys]
+        hits = sum(fitness is not None for fitness in fitnesses)
+        
+        # Simulate the first genome of each uncached episode
+        first = {}
+        for i, key in enumerate(keys):
+            if fitnesses[i] is None:
+                first.setdefault(key, i)
+        missing = list(first.values())
+        results = self._simulate([genomes[i] for i in missing], seeds[missing], simulate_function,
+                                 simulation_kwargs, population_function, top_k)
+        results = dict(zip((keys[i] for i in missing), results))
+        for i, key in enumerate(keys):
+            if fitnesses[i] is None:
+                fitnesses[i] = results[key]
+        
+        # Early-stopped episodes only give a lower bound, which can't be reused
+        if not top_k:
+            for key, fitness in results.items():
+                cache.put(key, fitness)
+        
+        self.profiler.annotate(fitness_cache_hits=hits, fitness_cache_simulated=len(missing),
+                               fitness_cache_duplicates=len(genomes) - hits - len(missing))
+        return fitnesses
+    
+    def _simulate(self, genomes, seeds, simulate_function, simulation_kwargs, population_function,
+                  top_k):
+        """
+        Simulate genomes with their episode seeds on the vectorized, serial or
+        worker pool path (see evaluate_genomes).
+        
+        Returns:
+            list: Fitness scores in the same order as genomes
+        """
+        if not genomes:
+            return []
+        
+        if self.vectorized and population_function is not None:
+            networks = CompiledPopulation.create([genome for _, genome in genomes], self.config)
+            rngs = [np.random.RandomState(int(seed)) for seed in seeds]
+            return population_function(networks, rngs=rngs, **simulation_kwargs).tolist()
+        
+        if (self.num_workers == 1 or len(genomes) < 2) and top_k:
+            best = TopK(top_k)
+            fitnesses = []
+            for (_, genome), seed in zip(genomes, seeds):
+                kwargs = dict(simulation_kwargs, stop_at=best.threshold())
+                fitness = _evaluate_genome(simulate_function, genome, self.config, kwargs, int(seed))
+                best.add(fitness)
+                fitnesses.append(fitness)
+            return fitnesses
+        
+        if self.num_workers == 1 or len(genomes) < 2:
+            return [
+                _evaluate_genome(simulate_function, genome, self.config, simulation_kwargs, int(seed))
+                for (_, genome), seed in zip(genomes, seeds)
+            ]
+        
+        jobs = [
+            (simulate_function, genome, None, simulation_kwargs, int(seed))
+            for (_, genome), seed in zip(genomes, seeds)
+        ]
+        chunksize = max(1, len(jobs) // (self.num_workers * 4))
+        return self._get_pool().starmap(_evaluate_genome, jobs, chunksize)
+    
+    def _get_pool(self):
+        """
+        Get the worker pool, starting it on first use.
+        
+        Returns:
+            multiprocessing.Pool: The evaluation worker pool
+        """
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                self.num_workers,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+        return self._pool
+    
+    def close(self):
+        """
+        Shut down the evaluation worker pool, if one was started, wait
+        for pending checkpoint writes and free the shared courses.
+        """
+        self.checkpoint_writer.flush()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._release_course_set()
+    
+    def get_inference_network(self, genome):
+        """
+        Get the compiled network for a genome, rebuilding it only when the
+        genome changes.
+        
+        The genome and its network are stored together in one attribute and
+        replaced in a single assignment, so concurrent callers always see a
+        matching pair and never a half-updated model.
+        
+        Args:
+            genome: The genome to run (usually the current best genome)
+            
+        Returns:
+            CompiledNetwork: The network for the genome
+        """
+        model = self._inference_model
+        if model is None or model[0] is not genome:
+            model = (genome, CompiledNetwork.create(genome, self.config))
+            self._inference_model = model
+        return model[1]
+    
+    def export_model(self, genome, **fields):
+        """
+        Serialize a genome for browser inference, rebuilding the export only
+        when the genome changes.
+        
+        Args:
+            genome: The genome to export (usually the current best genome)
+            **fields: Extra values for the model, e.g. input scaling
+            
+        Returns:
+            tuple: (model dict, ETag digest of its content)
+            
+        Raises:
+            ValueError: If the network can't be evaluated in the browser
+        """
+        exported = self._exported_model
+        if exported is None or exported[0] is not genome:
+            model = { **export_genome(genome, self.config), 'fitness': genome.fitness, **fields }
+            etag = hashlib.sha1(json.dumps(model, sort_keys=True).encode()).hexdigest()
+            exported = (genome, model, etag)
+            self._exported_model = exported
+        return exported[1], exported[2]
+    
     def update_metrics(self, generation_stats):
         """
         Update metrics for visualization.
         
         Args:
-            generation_stats: Statistics from the current generation
+            generation_stats (dict): 'best_genome' and 'mean' of the current generation
+        """
+        best_genome = generation_stats.get('best_genome')
+        self.best_fitness_history.append(best_genome.fitness if best_genome is not None else 0)
+        if 'mean' in generation_stats:
+            self.avg_fitness_history.append(float(generation_stats['mean']))
+        self.species_counts.append(len(self.population.species.species))
+    
+    def get_metrics(self, since=0):
+        """
+        Get the per-generation metrics added after a cursor.
+        
+        Args:
+            since (int): Number of generations the caller already has
+            
+        Returns:
+            dict: 'cursor' to pass next time, 'reset' if the caller's cursor
+                was ahead of the history, and the new 'generations'
+        """
+        cursor = self._metrics_cursor()
+        reset = not 0 <= since <= cursor
+        start = 0 if reset else since
+        
+        return {
+            'cursor': cursor,
+            'reset': reset,
+            'generations': [
+                {
+                    'generation': i + 1,
+                    'best_fitness': self.best_fitness_history[i],
+                    'avg_fitness': self.avg_fitness_history[i],
+                    'species_count': self.species_counts[i],
+                }
+                for i in range(start, cursor)
+            ]
+        }
+    
+    def _metrics_cursor(self):
+        """
+        Count the generations whose metrics are fully recorded.
+        
+        Returns:
+            int: Number of recorded generations
+        """
+        # update_metrics appends to each list in turn, so the shortest list
+        # marks the generations that are fully recorded
+        return min(len(self.best_fitness_history), len(self.avg_fitness_history),
+                   len(self.species_counts))
+    
+    def get_network_structure(self, genome):
+        """
+        Describe a genome's network for client-side drawing.
+        
+        Args:
+            genome: The genome to describe
+            
+        Returns:
+            dict: 'nodes' with their type, 'connections' with their weight
+                and the node/connection counts of the 'inference' network
+                before and after simplification, or None if there is no genome
         """
-        if hasattr(generation_stats, 'best_genome'):
-            self.best_fitness_history.append(generation_stats.best_genome.fitness)
-        if hasattr(generation_stats, 'mean'):
-            self.avg_fitness_history.append(generation_stats.mean)
-        if hasattr(self.stats, 'get_species_sizes'):
-            self.species_counts.append(len(self.stats.get_species_sizes()))
+        if genome is None:
+            return None
+        
+        input_keys = self.config.genome_config.input_keys
+        output_keys = self.config.genome_config.output_keys
+        nodes = [{'id': k, 'type': 'input'} for k in input_keys]
+        nodes += [{'id': k, 'type': 'output'} for k in output_keys]
+        nodes += [{'id': k, 'type': 'hidden'} for k in genome.nodes if k not in output_keys]
+        
+        return {
+            'nodes': nodes,
+            'connections': [
+                {'from': cg.key[0], 'to': cg.key[1], 'weight': cg.weight}
+                for cg in genome.connections.values() if cg.enabled
+            ],
+            'inference': self.get_inference_network(genome).report
+        }
+    
+    def chart_key(self, name, genome=None):
+        """
+        Get a digest of the data a chart is drawn from.
+        
+        History charts are keyed by their values, the network chart by the
+        genome's drawn structure (nodes and enabled weighted connections), so
+        an unchanged chart has an unchanged key across calls and restarts.
+        
+        Args:
+            name (str): 'fitness', 'species' or 'network'
+            genome: The genome drawn by the network chart
+            
+        Returns:
+            str: Hex digest identifying the chart's content
+        """
+        cursor = self._metrics_cursor()
+        if name == 'fitness':
+            data = (self.best_fitness_history[:cursor], self.avg_fitness_history[:cursor])
+        elif name == 'species':
+            data = self.species_counts[:cursor]
+        elif name == 'network':
+            data = None if genome is None else (
+                sorted(genome.nodes),
+                sorted((cg.key, cg.weight) for cg in genome.connections.values() if cg.enabled),
+            )
+        else:
+            raise ValueError(f"Unknown chart: {name}")
+        return hashlib.sha1(repr((name, data)).encode()).hexdigest()
+    
+    def charts_key(self, genome):
+        """
+        Get a digest covering the fitness, species and network charts.
+        
+        Args:
+            genome: The genome drawn by the network chart
+            
+        Returns:
+            str: Hex digest identifying all three charts
+        """
+        keys = [self.chart_key(name, genome) for name in ('fitness', 'species', 'network')]
+        return hashlib.sha1(''.join(keys).encode()).hexdigest()
+    
+    def _cached_chart(self, key, render):
+        """
+        Get a chart from the LRU render cache, rendering it on a miss.
+        
+        Args:
+            key (str): Digest of the data the chart is drawn from
+            render: Function returning the chart
+            
+        Returns:
+            The cached or freshly rendered chart
+        """
+        chart = self._chart_cache.get(key)
+        if chart is not None:
+            self._chart_cache.move_to_end(key)
+            return chart
+        
+        start = time.perf_counter()
+        chart = render()
+        self.profiler.record_chart(time.perf_counter() - start)
+        self._chart_cache[key] = chart
+        while len(self._chart_cache) > self.chart_cache_size:
+            self._chart_cache.popitem(last=False)
+        return chart
     
     def create_fitness_chart(self):
         """
@@ -159,15 +794,27 @@ class NEATAlgorithm:
         Returns:
             str: Base64 encoded PNG image of the chart
         """
-        fig = Figure(figsize=(10, 6))
-        canvas = FigureCanvas(fig)
+        cursor = self._metrics_cursor()
+        return self._cached_chart(self.chart_key('fitness'), lambda: self._render_fitness_chart(cursor))
+    
+    def _render_fitness_chart(self, cursor):
+        """
+        Render the fitness chart.
+        
+        Args:
+            cursor (int): Number of generations to draw
+            
+        Returns:
+            str: Base64 encoded PNG image of the chart
+        """
+        fig, canvas = _new_figure(figsize=(10, 6))
         ax = fig.add_subplot(111)
         
-        generations = list(range(1, len(self.best_fitness_history) + 1))
+        generations = list(range(1, cursor + 1))
         
-        ax.plot(generations, self.best_fitness_history, 'b-', label='Best Fitness')
+        ax.plot(generations, self.best_fitness_history[:cursor], 'b-', label='Best Fitness')
         if self.avg_fitness_history:
-            ax.plot(generations, self.avg_fitness_history, 'r-', label='Average Fitness')
+            ax.plot(generations, self.avg_fitness_history[:cursor], 'r-', label='Average Fitness')
         
         ax.set_xlabel('Generation')
         ax.set_ylabel('Fitness')
@@ -191,14 +838,27 @@ class NEATAlgorithm:
         """
         if not self.species_counts:
             return None
+        species_counts = self.species_counts[:self._metrics_cursor()]
+        return self._cached_chart(
+            self.chart_key('species'), lambda: self._render_species_chart(species_counts)
+        )
+    
+    def _render_species_chart(self, species_counts):
+        """
+        Render the species chart.
+        
+        Args:
+            species_counts (list): Species count per generation
             
-        fig = Figure(figsize=(10, 6))
-        canvas = FigureCanvas(fig)
+        Returns:
+            str: Base64 encoded PNG image of the chart
+        """
+        fig, canvas = _new_figure(figsize=(10, 6))
         ax = fig.add_subplot(111)
         
-        generations = list(range(1, len(self.species_counts) + 1))
+        generations = list(range(1, len(species_counts) + 1))
         
-        ax.plot(generations, self.species_counts, 'g-')
+        ax.plot(generations, species_counts, 'g-')
         ax.set_xlabel('Generation')
         ax.set_ylabel('Number of Species')
         ax.set_title('Species Count over Generations')
@@ -223,15 +883,24 @@ class NEATAlgorithm:
         """
         if genome is None:
             return None
-            
-        # Create the network
-        network = neat.nn.FeedForwardNetwork.create(genome, self.config)
+        return self._cached_chart(
+            self.chart_key('network', genome), lambda: self._render_network_structure_chart(genome)
+        )
+    
+    def _render_network_structure_chart(self, genome):
+        """
+        Render the network structure chart.
         
+        Args:
+            genome: The genome to visualize
+            
+        Returns:
+            str: Base64 encoded PNG image of the network structure
+        """
         # Get node and connection information
         node_names = {-1: 'Distance', -2: 'Height', -3: 'Speed', 0: 'Jump'}
         
-        fig = Figure(figsize=(12, 9))
-        canvas = FigureCanvas(fig)
+        fig, canvas = _new_figure(figsize=(12, 9))
         ax = fig.add_subplot(111)
         
         # Draw the network
@@ -244,6 +913,59 @@ class NEATAlgorithm:
         
         return f"data:image/png;base64,{data}"
 
+def _deep_size(obj, seen=None):
+    """
+    Approximate the memory used by an object and everything it references,
+    following containers and instance attributes. Shared objects are
+    counted once.
+    
+    Args:
+        obj: Root object
+        seen (set): Ids of objects already counted
+        
+    Returns:
+        int: Size in bytes
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, np.ndarray):
+            continue
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    return size
+
+def _new_figure(figsize):
+    """
+    Create a figure drawn by the Agg backend.
+    
+    matplotlib is imported here rather than at module level: it takes longer
+    to import than the rest of the NEAT stack combined and is only needed
+    once a chart is requested.
+    
+    Args:
+        figsize (tuple): Figure size in inches
+        
+    Returns:
+        tuple: (Figure, FigureCanvasAgg)
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+    
+    fig = Figure(figsize=figsize)
+    return fig, FigureCanvas(fig)
+
 def visualize_network(genome, config, ax=None, node_names=None):
     """
     Visualize the network structure of a genome.
@@ -255,6 +977,7 @@ def visualize_network(genome, config, ax=None, node_names=None):
         node_names: Dictionary mapping node IDs to names
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         fig = plt.figure(figsize=(12, 9))
         ax = fig.add_subplot(111)
     
@@ -0,0 +1,101 @@
+import random
+from collections import defaultdict
+
+from chess_engine import Board, move_to_uci
+
+# Main lines of common openings in UCI notation. Moves shared by several
+# lines get proportionally more weight
+OPENING_LINES = [
+    # Ruy Lopez
+    'e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4 g8f6 e1g1 f8e7',
+    # Italian Game
+    'e2e4 e7e5 g1f3 b8c6 f1c4 f8c5 c2c3 g8f6 d2d4',
+    # Scotch Game
+    'e2e4 e7e5 g1f3 b8c6 d2d4 e5d4 f3d4 g8f6',
+    # Petrov Defence
+    'e2e4 e7e5 g1f3 g8f6 f3e5 d7d6 e5f3 f6e4',
+    # Sicilian Najdorf
+    'e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6',
+    # Sicilian Sveshnikov
+    'e2e4 c7c5 g1f3 b8c6 d2d4 c5d4 f3d4 g8f6 b1c3 e7e5',
+    # Closed Sicilian
+    'e2e4 c7c5 b1c3 b8c6 g2g3 g7g6 f1g2 f8g7',
+    # French Defence
+    'e2e4 e7e6 d2d4 d7d5 b1c3 g8f6 c1g5 f8e7',
+    # Caro-Kann Defence
+    'e2e4 c7c6 d2d4 d7d5 b1c3 d5e4 c3e4 c8f5',
+    # Scandinavian Defence
+    'e2e4 d7d5 e4d5 d8d5 b1c3 d5a5',
+    # Queen's Gambit Declined
+    'd2d4 d7d5 c2c4 e7e6 b1c3 g8f6 c1g5 f8e7',
+    # Slav Defence
+    'd2d4 d7d5 c2c4 c7c6 g1f3 g8f6 b1c3 d5c4',
+    # Queen's Gambit Accepted
+    'd2d4 d7d5 c2c4 d5c4 g1f3 g8f6 e2e3 e7e6',
+    # King's Indian Defence
+    'd2d4 g8f6 c2c4 g7g6 b1c3 f8g7 e2e4 d7d6 g1f3 e8g8',
+    # Nimzo-Indian Defence
+    'd2d4 g8f6 c2c4 e7e6 b1c3 f8b4 e2e3 e8g8',
+    # Queen's Indian Defence
+    'd2d4 g8f6 c2c4 e7e6 g1f3 b7b6 g2g3 c8b7',
+    # Grunfeld Defence
+    'd2d4 g8f6 c2c4 g7g6 b1c3 d7d5 c4d5 f6d5 e2e4 d5c3 b2c3',
+    # Dutch Defence
+    'd2d4 f7f5 g2g3 g8f6 f1g2 e7e6',
+    # English Opening
+    'c2c4 e7e5 b1c3 g8f6 g1f3 b8c6 g2g3',
+    # Reti Opening
+    'g1f3 d7d5 g2g3 g8f6 f1g2 e7e6 e1g1 f8e7',
+]
+
+class OpeningBook:
+    """
+    Book moves for the opening, keyed by Zobrist hash so transpositions
+    between lines are found too.
+    """
+
+    def __init__(self, lines=OPENING_LINES, seed=None):
+        """
+        Build the book by playing out each line.
+
+        Args:
+            lines (list): Space-separated UCI move sequences from the start
+            seed (int): Seed for choosing between book moves
+
+        Raises:
+            ValueError: If a line contains an illegal move
+        """
+        self.rng = random.Random(seed)
+        # hash -> {packed move: weight}
+        self.positions = defaultdict(lambda: defaultdict(int))
+        for line in lines:
+            board = Board()
+            for uci in line.split():
+                move = board.parse_uci(uci)
+                self.positions[board.hash][move] += 1
+                board.make_move(move)
+        self.positions = {key: dict(moves) for key, moves in self.positions.items()}
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def choose(self, board):
+        """
+        Pick a book move for a position, weighted by how many lines play it.
+
+        Args:
+            board (Board): The position
+
+        Returns:
+            str: The move in UCI notation, or None if the position is not in the book
+        """
+        moves = self.positions.get(board.hash)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        move = self.rng.choices(list(moves), weights=list(moves.values()))[0]
+        return move_to_uci(move)
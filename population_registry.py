@@ -0,0 +1,293 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+class _Entry:
+    """
+    A resident AI and its bookkeeping.
+    """
+
+    def __init__(self, ai, now):
+        self.ai = ai
+        self.last_used = now
+        self.pins = 0
+        self.dirty = False
+        self.bytes = 0
+
+class PopulationRegistry:
+    """
+    Per-session game AIs, each training its own NEAT population.
+
+    AIs are created on a session's first request and kept in memory in
+    least recently used order. An AI is spilled to its session's checkpoint
+    directory (and dropped from memory) when it has been idle longer than
+    idle_timeout, or when there are more than max_resident AIs or their
+    estimated size exceeds max_bytes. The next request for the session
+    restores it from there. AIs leased for training are never spilled.
+    The registry's lock only guards its bookkeeping; AIs are built,
+    restored and spilled outside it.
+    """
+
+    def __init__(self, factory, spill_dir, max_resident=64, max_bytes=256 * 2**20,
+                 idle_timeout=900):
+        """
+        Initialize an empty registry.
+
+        Args:
+            factory: Function taking a game name and a checkpoint directory and
+                returning an AI restored from that directory
+            spill_dir (str): Directory holding one checkpoint directory per
+                game and session
+            max_resident (int): Most AIs kept in memory
+            max_bytes (int): Most estimated bytes of AIs kept in memory
+            idle_timeout (float): Seconds after which an unused AI is spilled
+        """
+        self.factory = factory
+        self.spill_dir = spill_dir
+        self.max_resident = max_resident
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+        # Counters for monitoring
+        self.hits = 0
+        self.creates = 0
+        self.reloads = 0
+        self.spills = 0
+
+    def checkpoint_dir(self, game, session):
+        """
+        Get the directory a session's AI for a game is spilled to.
+        """
+        return os.path.join(self.spill_dir, game, session)
+
+    def has(self, game, session):
+        """
+        Check whether a session has an AI for a game, resident or spilled.
+        """
+        with self._lock:
+            if (game, session) in self._entries or (game, session) in self._pending:
+                return True
+        return os.path.isdir(self.checkpoint_dir(game, session))
+
+    def resident(self, game):
+        """
+        Get the AIs of a game currently held in memory.
+
+        Returns:
+            list: The AIs, in least recently used order
+        """
+        with self._lock:
+            return [entry.ai for (entry_game, _), entry in self._entries.items() if entry_game == game]
+
+    def get(self, game, session):
+        """
+        Get a session's AI, creating or reloading it if it is not resident.
+
+        Args:
+            game (str): Game name
+            session (str): Session identifier (used in a path, so it must be
+                validated by the caller)
+
+        Returns:
+            The AI
+        """
+        return self._acquire(game, session).ai
+
+    @contextmanager
+    def lease(self, game, session, modifies=True):
+        """
+        Use a session's AI without it being spilled meanwhile.
+
+        Args:
+            game (str): Game name
+            session (str): Session identifier
+            modifies (bool): The AI's population changes, so it must be
+                checkpointed before it is next spilled
+
+        Yields:
+            The AI
+        """
+        entry = self._acquire(game, session, pin=True, modifies=modifies)
+        try:
+            yield entry.ai
+        finally:
+            size = entry.ai.neat_algorithm.memory_bytes()
+            with self._lock:
+                entry.pins -= 1
+                entry.bytes = size
+                entry.last_used = time.monotonic()
+                spills = self._enforce_limits()
+            self._write_spills(spills)
+
+    def _acquire(self, game, session, pin=False, modifies=False):
+        """
+        Get the entry for a key, loading it first if it is not resident.
+
+        Only the lookup and bookkeeping hold the lock. Creating or restoring
+        an AI, and spilling AIs to disk, happen outside it, so one session's
+        cold load does not hold up requests for resident AIs. A key being
+        loaded or spilled has an event in _pending, which other requests for
+        it wait on.
+        """
+        key = (game, session)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    now = time.monotonic()
+                    self.hits += 1
+                    entry.last_used = now
+                    self._entries.move_to_end(key)
+                    self._use(entry, pin, modifies)
+                    # Idle AIs are swept at most once a second on the hit path
+                    spills = self._enforce_limits(now) if now - self._last_sweep >= 1.0 else []
+                    break
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    spills = None
+                    break
+            pending.wait()
+
+        if spills is not None:
+            self._write_spills(spills)
+            return entry
+
+        try:
+            directory = self.checkpoint_dir(game, session)
+            reload = os.path.isdir(directory)
+            entry = _Entry(self.factory(game, directory), time.monotonic())
+            entry.bytes = entry.ai.neat_algorithm.memory_bytes()
+        except BaseException:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+            raise
+
+        with self._lock:
+            if reload:
+                self.reloads += 1
+            else:
+                self.creates += 1
+            self._entries[key] = entry
+            self._use(entry, pin, modifies)
+            del self._pending[key]
+            spills = self._enforce_limits()
+        pending.set()
+        self._write_spills(spills)
+        return entry
+
+    @staticmethod
+    def _use(entry, pin, modifies):
+        if pin:
+            entry.pins += 1
+        if modifies:
+            entry.dirty = True
+
+    def _enforce_limits(self, now=None):
+        """
+        Choose the AIs to spill: idle ones, then the least recently used
+        ones while over the count or size limit. They are removed from the
+        registry and marked pending; pass the result to _write_spills once
+        the lock is released. Must be called with the lock held.
+
+        Returns:
+            list: (key, entry, event) per AI to spill
+        """
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        spills = []
+        for key, entry in list(self._entries.items()):
+            if entry.pins == 0 and now - entry.last_used > self.idle_timeout:
+                spills.append(self._take(key))
+
+        resident_bytes = sum(entry.bytes for entry in self._entries.values())
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_resident and resident_bytes <= self.max_bytes:
+                break
+            # The most recently used AI stays, it is about to be used
+            if entry.pins == 0 and key != next(reversed(self._entries)):
+                resident_bytes -= entry.bytes
+                spills.append(self._take(key))
+        return spills
+
+    def _take(self, key):
+        """
+        Remove an AI about to be spilled, so requests for it wait until its
+        checkpoint is written. Must be called with the lock held.
+        """
+        event = self._pending[key] = threading.Event()
+        return key, self._entries.pop(key), event
+
+    def _write_spills(self, spills):
+        """
+        Write AIs' state to their checkpoint directories and drop them.
+        Must be called without the lock.
+        """
+        for key, entry, event in spills:
+            try:
+                neat_algorithm = entry.ai.neat_algorithm
+                if entry.dirty:
+                    neat_algorithm.save_checkpoint()
+                neat_algorithm.close()
+                if entry.dirty:
+                    neat_algorithm.prune_checkpoints(keep=1)
+            finally:
+                with self._lock:
+                    del self._pending[key]
+                    self.spills += 1
+                event.set()
+
+    def spill_all(self):
+        """
+        Spill every AI that is not leased, e.g. before shutting down.
+        """
+        with self._lock:
+            spills = [self._take(key) for key, entry in list(self._entries.items()) if entry.pins == 0]
+        self._write_spills(spills)
+
+    def stats(self):
+        """
+        Get the registry's size and activity.
+
+        Returns:
+            dict: Resident AIs (total and per game), their estimated bytes,
+                the limits, spilled session count and activity counters
+        """
+        with self._lock:
+            per_game = {}
+            for game, _ in self._entries:
+                per_game[game] = per_game.get(game, 0) + 1
+            resident_bytes = sum(entry.bytes for entry in self._entries.values())
+            leased = sum(1 for entry in self._entries.values() if entry.pins)
+            resident = len(self._entries)
+            resident_keys = set(self._entries)
+
+        spilled = 0
+        if os.path.isdir(self.spill_dir):
+            for game in os.listdir(self.spill_dir):
+                game_dir = os.path.join(self.spill_dir, game)
+                if os.path.isdir(game_dir):
+                    spilled += sum(1 for session in os.listdir(game_dir)
+                                   if (game, session) not in resident_keys)
+
+        return {
+            'resident': resident,
+            'resident_by_game': per_game,
+            'leased': leased,
+            'resident_bytes': resident_bytes,
+            'max_resident': self.max_resident,
+            'max_bytes': self.max_bytes,
+            'idle_timeout': self.idle_timeout,
+            'spilled': spilled,
+            'hits': self.hits,
+            'creates': self.creates,
+            'reloads': self.reloads,
+            'spills': self.spills,
+        }
@@ -0,0 +1,204 @@
+import mmap
+import os
+import struct
+import threading
+
+# File locking is only used while creating the file, and only where available
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MAGIC = b'ARCADEPC'
+VERSION = 1
+
+# magic, version, slot count, write clock
+HEADER = struct.Struct('<8sIIQ')
+# check (key ^ data), data, last use
+SLOT = struct.Struct('<QQQ')
+BUCKET_SIZE = 4
+
+MOVE_BITS, SCORE_BITS, DEPTH_BITS, BUDGET_BITS = 20, 20, 7, 17
+
+class PositionCache:
+    """
+    Persistent, fixed-size table of searched chess positions.
+
+    The table lives in a memory-mapped file, so every worker process that
+    opens the same path shares it and it survives restarts. Positions are
+    keyed by Zobrist hash into 4-slot buckets; a full bucket evicts its
+    least recently used slot.
+
+    Each slot stores key ^ data next to data, so a reader detects a slot
+    torn by a concurrent write in another process (the check no longer
+    matches) and treats it as a miss. No cross-process lock is needed.
+    """
+
+    def __init__(self, path, capacity=65536):
+        """
+        Open or create the cache file.
+
+        Args:
+            path (str): Cache file path
+            capacity (int): Number of positions kept, rounded up to a
+                multiple of the bucket size
+        """
+        self.path = path
+        self.n_buckets = max(1, -(-capacity // BUCKET_SIZE))
+        self.capacity = self.n_buckets * BUCKET_SIZE
+        self._lock = threading.Lock()
+
+        # Per-process counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._open()
+
+    def _open(self):
+        """
+        Map the file, (re)initializing it if it is missing or has another
+        layout.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        size = HEADER.size + self.capacity * SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(fd, 'r+b')
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            header = self._file.read(HEADER.size)
+            valid = (len(header) == HEADER.size and os.path.getsize(self.path) == size and
+                     HEADER.unpack(header)[:3] == (MAGIC, VERSION, self.capacity))
+            if not valid:
+                self._file.truncate(0)
+                self._file.truncate(size)
+                self._file.seek(0)
+                self._file.write(HEADER.pack(MAGIC, VERSION, self.capacity, 0))
+                self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), size)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def close(self):
+        """
+        Flush and unmap the file.
+        """
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    def _tick(self):
+        """
+        Advance the shared clock used to order slot uses.
+        """
+        clock = struct.unpack_from('<Q', self._map, 16)[0] + 1
+        struct.pack_into('<Q', self._map, 16, clock)
+        return clock
+
+    def _slots(self, key):
+        """
+        Offsets of the slots in a key's bucket.
+        """
+        start = HEADER.size + (key % self.n_buckets) * BUCKET_SIZE * SLOT.size
+        return range(start, start + BUCKET_SIZE * SLOT.size, SLOT.size)
+
+    def get(self, key, min_budget_ms=0):
+        """
+        Look up a position.
+
+        Args:
+            key (int): 64-bit Zobrist hash
+            min_budget_ms (int): Smallest search time budget accepted
+
+        Returns:
+            tuple: (move, score, depth, budget_ms), or None on a miss
+        """
+        with self._lock:
+            for offset in self._slots(key):
+                check, data, _ = SLOT.unpack_from(self._map, offset)
+                if data and check ^ data == key and _unpack(data)[3] >= min_budget_ms:
+                    SLOT.pack_into(self._map, offset, check, data, self._tick())
+                    self.hits += 1
+                    return _unpack(data)
+            self.misses += 1
+            return None
+
+    def put(self, key, move, score, depth, budget_ms):
+        """
+        Store a search result. An existing entry for the position is only
+        replaced by a search with at least the same time budget.
+
+        Args:
+            key (int): 64-bit Zobrist hash
+            move (int): Packed best move
+            score (int): Score for the side to move
+            depth (int): Depth the search completed
+            budget_ms (int): Time budget of the search in milliseconds
+        """
+        data = _pack(move, score, depth, budget_ms)
+        with self._lock:
+            target, oldest = None, None
+            for offset in self._slots(key):
+                check, old, used = SLOT.unpack_from(self._map, offset)
+                if old and check ^ old == key:
+                    if _unpack(old)[3] > budget_ms:
+                        return
+                    target = offset
+                    break
+                if not old:
+                    target = target if target is not None else offset
+                elif oldest is None or used < oldest[1]:
+                    oldest = (offset, used)
+
+            if target is None:
+                target = oldest[0]
+                self.evictions += 1
+            SLOT.pack_into(self._map, target, key ^ data, data, self._tick())
+            self.stores += 1
+
+    def stats(self):
+        """
+        Get usage counters for this process and the shared fill level.
+
+        Returns:
+            dict: hits, misses, hit_rate, stores, evictions, entries and capacity
+        """
+        with self._lock:
+            entries = sum(1 for _, data, _ in SLOT.iter_unpack(self._map[HEADER.size:]) if data)
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'capacity': self.capacity,
+        }
+
+def _pack(move, score, depth, budget_ms):
+    """
+    Pack a search result into 64 bits.
+    """
+    score = max(-(1 << (SCORE_BITS - 1)), min((1 << (SCORE_BITS - 1)) - 1, score))
+    return (move |
+            (score + (1 << (SCORE_BITS - 1))) << MOVE_BITS |
+            min(depth, (1 << DEPTH_BITS) - 1) << (MOVE_BITS + SCORE_BITS) |
+            min(budget_ms, (1 << BUDGET_BITS) - 1) << (MOVE_BITS + SCORE_BITS + DEPTH_BITS))
+
+def _unpack(data):
+    """
+    Unpack a search result packed by _pack.
+    """
+    return (
+        data & ((1 << MOVE_BITS) - 1),
+        ((data >> MOVE_BITS) & ((1 << SCORE_BITS) - 1)) - (1 << (SCORE_BITS - 1)),
+        (data >> (MOVE_BITS + SCORE_BITS)) & ((1 << DEPTH_BITS) - 1),
+        data >> (MOVE_BITS + SCORE_BITS + DEPTH_BITS),
+    )
@@ -0,0 +1,227 @@
+import cProfile
+import pstats
+import threading
+import time
+from collections import deque
+
+from neat.reporting import BaseReporter
+
+# Newer Pythons allow one active cProfile per process, so captures take turns
+_capture_lock = threading.Lock()
+
+class GenerationProfiler(BaseReporter):
+    """
+    NEAT reporter recording where each generation's time goes.
+
+    Added to the population before the other reporters, so a generation's
+    phases are:
+    - evaluation: start_generation to post_evaluate (the fitness function)
+    - reproduction: post_evaluate to end_generation (reproduction and speciation)
+    - checkpoint: snapshotting the population, when the checkpointer saves
+    - reporting: the other reporters' end_generation, less the checkpoint
+
+    A generation's record is closed by the next start_generation or by
+    finish(), which NEATAlgorithm.run_generation calls after each run.
+    Chart render times are recorded separately, since charts are rendered
+    by requests rather than by training.
+    """
+
+    def __init__(self, history=1000):
+        """
+        Initialize an empty profile.
+
+        Args:
+            history (int): Most generation records kept
+        """
+        self.checkpointer = None
+        self.records = deque(maxlen=history)
+        self.recorded = 0
+        self.charts = { 'renders': 0, 'total_seconds': 0.0, 'last_seconds': None, 'max_seconds': 0.0 }
+        self._current = None
+        self._mark = None
+        self._lock = threading.Lock()
+
+    def _checkpoint_seconds(self):
+        return self.checkpointer.snapshot_seconds if self.checkpointer is not None else 0.0
+
+    def start_generation(self, generation):
+        self.finish()
+        now = time.perf_counter()
+        self._current = {
+            'generation': generation,
+            'started_at': time.time(),
+            '_start': now,
+            '_checkpoint_start': self._checkpoint_seconds(),
+        }
+        self._mark = now
+
+    def post_evaluate(self, config, population, species, best_genome):
+        current = self._current
+        if current is None:
+            return
+        now = time.perf_counter()
+        evaluation = now - self._mark
+        self._mark = now
+
+        nodes = [len(genome.nodes) for genome in population.values()]
+        connections = [sum(1 for cg in genome.connections.values() if cg.enabled)
+                       for genome in population.values()]
+        current.update({
+            'evaluation_seconds': evaluation,
+            'evaluations': len(population),
+            'evaluations_per_second': len(population) / evaluation if evaluation > 0 else None,
+            'species': len(species.species),
+            'nodes_mean': sum(nodes) / len(nodes) if nodes else 0,
+            'nodes_max': max(nodes, default=0),
+            'connections_mean': sum(connections) / len(connections) if connections else 0,
+            'connections_max': max(connections, default=0),
+            'best_fitness': best_genome.fitness if best_genome is not None else None,
+        })
+
+    def end_generation(self, config, population, species_set):
+        current = self._current
+        if current is None:
+            return
+        now = time.perf_counter()
+        current['reproduction_seconds'] = now - self._mark
+        self._mark = now
+
+    def annotate(self, **values):
+        """
+        Add values to the record of the generation in progress, e.g. from
+        the fitness function.
+        """
+        current = self._current
+        if current is not None:
+            current.update(values)
+
+    def finish(self):
+        """
+        Close the record of the generation in progress, if any.
+        """
+        current = self._current
+        if current is None:
+            return
+        self._current = None
+        now = time.perf_counter()
+
+        checkpoint = self._checkpoint_seconds() - current.pop('_checkpoint_start')
+        total = now - current.pop('_start')
+        record = {
+            'evaluation_seconds': None,
+            'reproduction_seconds': None,
+            **current,
+            'checkpoint_seconds': checkpoint,
+            'total_seconds': total,
+        }
+        # Time after end_generation was spent in the remaining reporters
+        if 'reproduction_seconds' in current:
+            record['reporting_seconds'] = max(0.0, now - self._mark - checkpoint)
+        with self._lock:
+            self.records.append(record)
+            self.recorded += 1
+
+    def record_chart(self, seconds):
+        """
+        Add a chart render time.
+
+        Args:
+            seconds (float): Time the render took
+        """
+        with self._lock:
+            charts = self.charts
+            charts['renders'] += 1
+            charts['total_seconds'] += seconds
+            charts['last_seconds'] = seconds
+            charts['max_seconds'] = max(charts['max_seconds'], seconds)
+
+    def to_dict(self, since=0):
+        """
+        Get the generation records added after a cursor, with a summary.
+
+        Args:
+            since (int): Number of records the caller already has
+
+        Returns:
+            dict: 'cursor' to pass next time, the new 'generations', a
+                'summary' of the kept records (mean seconds per phase and
+                overall evaluations/sec) and the chart render 'charts' totals
+        """
+        with self._lock:
+            cursor = self.recorded
+            first = cursor - len(self.records)
+            start = max(since, first) if 0 <= since <= cursor else first
+            records = list(self.records)
+            generations = records[start - first:]
+            charts = dict(self.charts)
+
+        summary = { 'generations': len(records) }
+        for phase in ('evaluation', 'reproduction', 'checkpoint', 'reporting', 'total'):
+            values = [r[f'{phase}_seconds'] for r in records if r.get(f'{phase}_seconds') is not None]
+            summary[f'{phase}_seconds_mean'] = sum(values) / len(values) if values else None
+        evaluation = sum(r['evaluation_seconds'] or 0 for r in records)
+        evaluations = sum(r.get('evaluations', 0) for r in records)
+        summary['evaluations_per_second'] = evaluations / evaluation if evaluation > 0 else None
+
+        return {
+            'cursor': cursor,
+            'reset': not 0 <= since <= cursor,
+            'generations': generations,
+            'summary': summary,
+            'charts': charts,
+        }
+
+class ProfileCapture:
+    """
+    cProfile capture of a block of work, entered once per chunk (e.g. per
+    generation) so time spent waiting between chunks is left out.
+
+    Only the thread that enters the block is profiled; evaluation in worker
+    processes shows up as time waiting on the pool.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.seconds = 0.0
+
+    def __enter__(self):
+        _capture_lock.acquire()
+        self._start = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.seconds += time.perf_counter() - self._start
+        _capture_lock.release()
+        return False
+
+    def report(self, limit=25, sort='cumulative'):
+        """
+        Summarize the profile.
+
+        Args:
+            limit (int): Number of functions listed
+            sort (str): pstats sort key
+
+        Returns:
+            dict: Profiled seconds, total calls and the top functions with
+                their call count, own time and cumulative time
+        """
+        stats = pstats.Stats(self.profile)
+        stats.sort_stats(sort)
+        functions = []
+        for function in stats.fcn_list[:limit]:
+            calls, primitive_calls, own, cumulative, _ = stats.stats[function]
+            filename, line, name = function
+            functions.append({
+                'function': f"{filename}:{line}({name})" if line else name,
+                'calls': calls,
+                'own_seconds': own,
+                'cumulative_seconds': cumulative,
+            })
+        return {
+            'seconds': self.seconds,
+            'total_calls': stats.total_calls,
+            'functions': functions,
+        }
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+class StartupTimer:
+    """
+    Records how long each step of bringing the app up takes, relative to
+    when the timer was created (the start of the app import).
+    """
+
+    def __init__(self):
+        """
+        Start the clock.
+        """
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._phases = OrderedDict()
+        self._events = OrderedDict()
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        """
+        Get the seconds since the timer was created.
+        """
+        return time.perf_counter() - self._start
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of work.
+
+        Args:
+            name (str): Name the duration is recorded under
+        """
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phases[name] = {
+                    'start': start,
+                    'seconds': self.elapsed() - start,
+                    'thread': threading.current_thread().name,
+                }
+
+    def mark(self, name):
+        """
+        Record the time an event happened, the first time it happens.
+
+        Args:
+            name (str): Event name
+        """
+        with self._lock:
+            self._events.setdefault(name, self.elapsed())
+
+    def to_dict(self):
+        """
+        Get the recorded timings.
+
+        Returns:
+            dict: started_at, uptime, phases (start and duration of each,
+                in seconds) and events (seconds after start)
+        """
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'uptime': self.elapsed(),
+                'phases': {name: dict(phase) for name, phase in self._phases.items()},
+                'events': dict(self._events),
+            }
+
+class LazyModel:
+    """
+    Holds an object that is expensive to build and builds it on first use.
+
+    Attribute lookups are forwarded to the built object, so a LazyModel can
+    be used in its place. Concurrent first uses wait for a single build.
+    """
+
+    def __init__(self, name, factory, timer=None):
+        """
+        Initialize the holder without building anything.
+
+        Args:
+            name (str): Name the build time is recorded under
+            factory: Function returning the object
+            timer (StartupTimer): Timer to record the build in
+        """
+        self.name = name
+        self.factory = factory
+        self.timer = timer
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        """
+        Get the object, building it if this is the first use.
+
+        Returns:
+            The object returned by the factory
+        """
+        model = self._model
+        if model is None:
+            with self._lock:
+                if self._model is None:
+                    if self.timer is None:
+                        self._model = self.factory()
+                    else:
+                        with self.timer.phase(self.name):
+                            self._model = self.factory()
+                model = self._model
+        return model
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
@@ -31,15 +31,15 @@ const AiContent = `
                 <div class="row align-items-center justify-content-center">
                     <div class="d-flex flex-column p-2 w-25 gap-3" id="level-Buttons">
                         <button class="btn btn-secondary button-active" role="button"
-                            aria-pressed="true" data-depth="1">Beginner</button>
+                            aria-pressed="true" data-depth="1" data-level="beginner">Beginner</button>
                         <button class="btn btn-secondary " role="button" aria-pressed="true"
-                            data-depth="2">Intermediate</button>
+                            data-depth="2" data-level="intermediate">Intermediate</button>
                         <button class="btn btn-secondary " role="button" aria-pressed="true"
-                            data-depth="3">Advanced</button>
+                            data-depth="3" data-level="advanced">Advanced</button>
                         <button class="btn btn-secondary " role="button" aria-pressed="true"
-                            data-depth="4">Expert</button>
+                            data-depth="4" data-level="expert">Expert</button>
                         <button class="btn btn-secondary " role="button" aria-pressed="true"
-                            data-depth="4">Grandmaster </button>
+                            data-depth="4" data-level="grandmaster">Grandmaster </button>
                     </div>
                 </div>
                 <div class="text-align-center p-4">
@@ -107,6 +107,7 @@ let config = {
 board = Chessboard("myBoard", config);
 
 timer = null;
+let aiMatch = 0; // bumped on reset, so stale Computer vs Computer loops stop
 
 let weights = {
   p: 100,
@@ -389,9 +390,42 @@ function checkStatus(color) {
   return true;
 }
 
-// Calculates the best legal move for the given color.
+// Asks the server engine for the best legal move for the given color, so the
+// search doesn't block the UI thread. Resolves to [move, value].
 
 function getBestMove(game, color, currSum) {
+  let level = $("#level-Buttons .button-active").data("level");
+
+  return fetch("/api/chess/best_move", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ fen: game.fen(), level: level }),
+  })
+    .then((response) => {
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      return response.json();
+    })
+    .then((data) => {
+      $("#position-count").text(data.nodes);
+      $("#time").text(data.time.toFixed(3));
+      $("#positions-per-s").text(data.nps);
+
+      // Match the UCI move to chess.js's verbose move object
+      let move = game
+        .moves({ verbose: true })
+        .find((m) => m.from + m.to + (m.promotion || "") === data.move);
+      return [move || null, data.score];
+    })
+    .catch((error) => {
+      console.error("Server engine unavailable, searching locally:", error);
+      return getLocalBestMove(game, color, currSum);
+    });
+}
+
+// Calculates the best legal move for the given color in the browser. Used
+// when the server engine can't be reached.
+
+function getLocalBestMove(game, color, currSum) {
   positionCount = 0;
 
   let depth = parseInt($("#level-Buttons .button-active").data("depth"));
@@ -420,61 +454,67 @@ function getBestMove(game, color, currSum) {
 // Makes the best legal move for the given color.
 
 function makeBestMove(color) {
-  let move;
-  if (color === "b") {
-    move = getBestMove(game, color, globalSum)[0];
-  } else {
-    move = getBestMove(game, color, -globalSum)[0];
-  }
+  let fen = game.fen();
+  let currSum = color === "b" ? globalSum : -globalSum;
 
-  globalSum = evaluateBoard(game, move, globalSum, "b");
-  // updateAdvantage();
+  return getBestMove(game, color, currSum).then(([move]) => {
+    // The game was reset or changed while the engine was thinking
+    if (!move || game.fen() !== fen) return;
 
-  game.move(move);
-  board.position(game.fen());
+    globalSum = evaluateBoard(game, move, globalSum, "b");
+    // updateAdvantage();
 
-  if (color === "b") {
-    checkStatus("black");
+    game.move(move);
+    board.position(game.fen());
 
-    // Highlight black move
-    $board.find("." + squareClass).removeClass("highlight-black");
-    $board.find(".square-" + move.from).addClass("highlight-black");
-    squareToHighlight = move.to;
-    colorToHighlight = "black";
+    if (color === "b") {
+      checkStatus("black");
 
-    $board
-      .find(".square-" + squareToHighlight)
-      .addClass("highlight-" + colorToHighlight);
-  } else {
-    checkStatus("white");
+      // Highlight black move
+      $board.find("." + squareClass).removeClass("highlight-black");
+      $board.find(".square-" + move.from).addClass("highlight-black");
+      squareToHighlight = move.to;
+      colorToHighlight = "black";
 
-    // Highlight white move
-    $board.find("." + squareClass).removeClass("highlight-white");
-    $board.find(".square-" + move.from).addClass("highlight-white");
-    squareToHighlight = move.to;
-    colorToHighlight = "white";
+      $board
+        .find(".square-" + squareToHighlight)
+        .addClass("highlight-" + colorToHighlight);
+    } else {
+      checkStatus("white");
 
-    $board
-      .find(".square-" + squareToHighlight)
-      .addClass("highlight-" + colorToHighlight);
-  }
+      // Highlight white move
+      $board.find("." + squareClass).removeClass("highlight-white");
+      $board.find(".square-" + move.from).addClass("highlight-white");
+      squareToHighlight = move.to;
+      colorToHighlight = "white";
+
+      $board
+        .find(".square-" + squareToHighlight)
+        .addClass("highlight-" + colorToHighlight);
+    }
+  });
 }
 
 function compVsComp(color) {
+  let match = aiMatch;
   if (!checkStatus({ w: "white", b: "black" }[color])) {
     timer = window.setTimeout(function () {
-      makeBestMove(color);
-      if (color === "w") {
-        color = "b";
-      } else {
-        color = "w";
-      }
-      compVsComp(color);
+      makeBestMove(color).then(function () {
+        // Stop if the board was reset while the move was being searched
+        if (match !== aiMatch) return;
+        if (color === "w") {
+          color = "b";
+        } else {
+          color = "w";
+        }
+        compVsComp(color);
+      });
     }, 500);
   }
 }
 
 function reset() {
+  aiMatch++;
   game.reset();
   globalSum = 0;
   $board.find("." + squareClass).removeClass("highlight-white");
@@ -565,10 +605,11 @@ function showHint() {
   // Show hint (best move for white)
   if (showHint.classList.contains("active")) {
     // console.log("showing");
-    let move = getBestMove(game, "w", -globalSum)[0];
-
-    $board.find(".square-" + move.from).addClass("highlight-hint");
-    $board.find(".square-" + move.to).addClass("highlight-hint");
+    getBestMove(game, "w", -globalSum).then(([move]) => {
+      if (!move) return;
+      $board.find(".square-" + move.from).addClass("highlight-hint");
+      $board.find(".square-" + move.to).addClass("highlight-hint");
+    });
   }
 }
 
@@ -645,10 +686,11 @@ function onDrop(source, target) {
   if (isAi && !checkStatus("black")) {
     window.setTimeout(function () {
       // Make the best move for black
-      makeBestMove("b");
-      window.setTimeout(function () {
-        showHint();
-      }, 250);
+      makeBestMove("b").then(function () {
+        window.setTimeout(function () {
+          showHint();
+        }, 250);
+      });
     }, 250);
   }
 }
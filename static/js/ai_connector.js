@@ -6,6 +6,15 @@ document.addEventListener("DOMContentLoaded", function() {
     let currentGame = null;
     let aiDecisionInterval = null;
     
+    // WebSocket action stream (falls back to HTTP polling when unavailable)
+    let aiSocket = null;
+    let aiSocketSeq = 0;
+    let aiSocketPending = false;
+    let aiFrameRequest = null;
+    
+    // Exported model run in the browser, kept current by polling with its ETag
+    let modelPoller = null;
+    
     // Initialize the AI connector
     function initAIConnector() {
         // Determine which game we're on
@@ -56,6 +65,59 @@ document.addEventListener("DOMContentLoaded", function() {
         
         aiPlaying = true;
         
+        // Run the exported model locally when there is one, so no frame
+        // needs a server round trip
+        if (window.createModelPoller) {
+            modelPoller = modelPoller || window.createModelPoller(currentGame);
+            modelPoller.refresh().then(model => {
+                if (!aiPlaying) return;
+                if (model) {
+                    aiFrameRequest = requestAnimationFrame(localDecision);
+                } else {
+                    startServerDecisions();
+                }
+            });
+        } else {
+            startServerDecisions();
+        }
+    }
+    
+    // Ask the server for actions: a per-frame WebSocket stream, or HTTP polling
+    function startServerDecisions() {
+        if ('WebSocket' in window) {
+            openActionSocket();
+        } else {
+            startPolling();
+        }
+    }
+    
+    // Decide with the local model once per animation frame
+    function localDecision() {
+        if (!aiPlaying) return;
+        
+        // The model went away (e.g. the server can no longer export it)
+        const model = modelPoller && modelPoller.model;
+        if (!model) {
+            aiFrameRequest = null;
+            startServerDecisions();
+            return;
+        }
+        
+        const state = currentGame === 'dino' ? getDinoGameState() : getFlappyGameState();
+        if (state) {
+            const action = model.decide(state.gameState);
+            if (currentGame === 'dino') {
+                applyDinoAction(action);
+            } else {
+                applyFlappyAction(action);
+            }
+        }
+        
+        aiFrameRequest = requestAnimationFrame(localDecision);
+    }
+    
+    // Poll the action endpoint over HTTP
+    function startPolling() {
         // Clear any existing interval
         if (aiDecisionInterval) {
             clearInterval(aiDecisionInterval);
@@ -71,6 +133,65 @@ document.addEventListener("DOMContentLoaded", function() {
         }, 100); // Make decisions 10 times per second
     }
     
+    // Open a WebSocket that streams game states in and actions out every frame
+    function openActionSocket() {
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const socket = new WebSocket(`${protocol}//${window.location.host}/ws/${currentGame}`);
+        aiSocket = socket;
+        aiSocketPending = false;
+        
+        socket.onopen = function() {
+            aiFrameRequest = requestAnimationFrame(streamDecision);
+        };
+        
+        socket.onmessage = function(event) {
+            const data = JSON.parse(event.data);
+            
+            // Only the reply to the latest state is acted on
+            if (data.seq !== aiSocketSeq) return;
+            aiSocketPending = false;
+            
+            if (data.error) {
+                console.error(`AI stream error: ${data.error}`);
+            } else if (currentGame === 'dino') {
+                applyDinoAction(data.action);
+            } else if (currentGame === 'flappy') {
+                applyFlappyAction(data.action);
+            }
+        };
+        
+        socket.onclose = function() {
+            if (aiSocket !== socket) return;
+            aiSocket = null;
+            
+            // Server without WebSocket support, or connection lost
+            if (aiPlaying) {
+                console.warn('AI stream closed, falling back to HTTP polling');
+                startPolling();
+            }
+        };
+    }
+    
+    // Send the current game state once per animation frame
+    function streamDecision() {
+        if (!aiPlaying || !aiSocket) return;
+        
+        // Keep a single state in flight so replies never queue up
+        if (aiSocket.readyState === WebSocket.OPEN && !aiSocketPending) {
+            const state = currentGame === 'dino' ? getDinoGameState() : getFlappyGameState();
+            if (state) {
+                aiSocketSeq += 1;
+                aiSocketPending = true;
+                aiSocket.send(JSON.stringify({
+                    seq: aiSocketSeq,
+                    game_state: state.gameState
+                }));
+            }
+        }
+        
+        aiFrameRequest = requestAnimationFrame(streamDecision);
+    }
+    
     // Stop AI decision making
     function stopAI() {
         aiPlaying = false;
@@ -79,6 +200,22 @@ document.addEventListener("DOMContentLoaded", function() {
             clearInterval(aiDecisionInterval);
             aiDecisionInterval = null;
         }
+        
+        if (aiFrameRequest) {
+            cancelAnimationFrame(aiFrameRequest);
+            aiFrameRequest = null;
+        }
+        
+        if (aiSocket) {
+            const socket = aiSocket;
+            aiSocket = null;
+            socket.close();
+        }
+        
+        if (modelPoller) {
+            modelPoller.stop();
+            modelPoller = null;
+        }
     }
     
     // Train the AI
@@ -97,7 +234,17 @@ document.addEventListener("DOMContentLoaded", function() {
             trainButton.textContent = 'Training...';
         }
         
-        // Call the appropriate API endpoint
+        // Reset button state
+        function finishTraining() {
+            if (trainButton) {
+                trainButton.disabled = false;
+                trainButton.textContent = 'Train AI';
+            }
+            
+            aiTraining = false;
+        }
+        
+        // Queue a background training job
         fetch(`/api/${currentGame}/train`, {
             method: 'POST',
             headers: {
@@ -108,85 +255,87 @@ document.addEventListener("DOMContentLoaded", function() {
             }),
         })
         .then(response => response.json())
+        .then(job => waitForTrainingJob(job.job_id, trainButton))
+        .then(() => {
+            // Pick up the new best network without waiting for the next poll
+            if (modelPoller) {
+                modelPoller.refresh();
+            }
+            return updateCharts();
+        })
         .then(data => {
-            // Update charts
-            updateCharts(data);
-            
             // Update generation display
             const generationDisplay = currentGame === 'dino' ? 
                 document.getElementById('dino-generation') : 
                 document.getElementById('generation');
             
-            if (generationDisplay && data.generation) {
+            if (generationDisplay && data && data.generation) {
                 generationDisplay.textContent = data.generation;
             }
             
-            // Reset button state
-            if (trainButton) {
-                trainButton.disabled = false;
-                trainButton.textContent = 'Train AI';
-            }
-            
-            aiTraining = false;
+            finishTraining();
         })
         .catch(error => {
             console.error(`Error training ${currentGame} AI:`, error);
-            
-            // Reset button state
-            if (trainButton) {
-                trainButton.disabled = false;
-                trainButton.textContent = 'Train AI';
-            }
-            
-            aiTraining = false;
+            finishTraining();
         });
     }
     
-    // Update charts with data from the backend
-    function updateCharts(data) {
-        if (currentGame === 'dino') {
-            const fitnessChart = document.getElementById('dino-fitness-chart');
-            const speciesChart = document.getElementById('dino-species-chart');
-            const networkChart = document.getElementById('dino-network-chart');
-            
-            if (fitnessChart && data.fitness_chart) {
-                fitnessChart.src = data.fitness_chart;
-            }
-            
-            if (speciesChart && data.species_chart) {
-                speciesChart.src = data.species_chart;
+    // Poll a training job until it finishes, showing progress on the button
+    function waitForTrainingJob(jobId, trainButton) {
+        return new Promise((resolve, reject) => {
+            function poll() {
+                fetch(`/api/jobs/${jobId}`)
+                .then(response => response.json())
+                .then(job => {
+                    if (trainButton) {
+                        trainButton.textContent = `Training... ${job.generations_done}/${job.generations}`;
+                    }
+                    
+                    if (job.status === 'failed') {
+                        reject(new Error(job.error));
+                    } else if (job.status === 'completed' || job.status === 'cancelled') {
+                        resolve(job);
+                    } else {
+                        setTimeout(poll, 500);
+                    }
+                })
+                .catch(reject);
             }
             
-            if (networkChart && data.network_chart) {
-                networkChart.src = data.network_chart;
-            }
-        } else if (currentGame === 'flappy') {
-            const fitnessChart = document.getElementById('fitness-chart');
-            const speciesChart = document.getElementById('species-chart');
-            const networkChart = document.getElementById('network-chart');
-            
-            if (fitnessChart && data.fitness_chart) {
-                fitnessChart.src = data.fitness_chart;
-            }
-            
-            if (speciesChart && data.species_chart) {
-                speciesChart.src = data.species_chart;
-            }
-            
-            if (networkChart && data.network_chart) {
-                networkChart.src = data.network_chart;
-            }
+            poll();
+        });
+    }
+    
+    // Update charts after training. Pages drawing charts client-side only
+    // fetch the new generations, others fall back to the cached PNG export
+    function updateCharts() {
+        if (window.metricsCharts && window.metricsCharts[currentGame]) {
+            return window.metricsCharts[currentGame].refresh();
         }
+        
+        return fetch(`/api/${currentGame}/charts`)
+            .then(response => response.json())
+            .then(data => {
+                const prefix = currentGame === 'dino' ? 'dino-' : '';
+                ['fitness', 'species', 'network'].forEach(name => {
+                    const chart = document.getElementById(`${prefix}${name}-chart`);
+                    if (chart && data[`${name}_chart`]) {
+                        chart.src = data[`${name}_chart`];
+                    }
+                });
+                return data;
+            });
     }
     
-    // Make AI decision for Dino game
-    function makeAIDecisionForDino() {
+    // Get the Dino game state for the AI, or null if there is nothing to decide
+    function getDinoGameState() {
         // Only make decisions if the game is running
-        if (!window.gameStarted || window.gameOver) return;
+        if (!window.gameStarted || window.gameOver) return null;
         
         // Get game state
         const obstacles = window.obstacles || [];
-        if (obstacles.length === 0) return;
+        if (obstacles.length === 0) return null;
         
         // Find the next obstacle
         let nextObstacle = null;
@@ -197,13 +346,36 @@ document.addEventListener("DOMContentLoaded", function() {
             }
         }
         
-        if (!nextObstacle) return;
+        if (!nextObstacle) return null;
         
         // Calculate inputs for AI
         const distanceToObstacle = (nextObstacle.x - window.aiDino.x) / window.canvas.width;
         const heightOfObstacle = nextObstacle.height / window.canvas.height;
         const currentSpeed = window.gameSpeed / 20;
         
+        return {
+            nextObstacle: nextObstacle,
+            gameState: [
+                distanceToObstacle * 100, 
+                heightOfObstacle * 50, 
+                currentSpeed * 20
+            ]
+        };
+    }
+    
+    // Execute an AI action in the Dino game
+    function applyDinoAction(action) {
+        if (action && !window.aiDino.jumping) {
+            window.aiDino.jump();
+        }
+    }
+    
+    // Make AI decision for Dino game
+    function makeAIDecisionForDino() {
+        const state = getDinoGameState();
+        if (!state) return;
+        const nextObstacle = state.nextObstacle;
+        
         // Call the AI API to get the action
         fetch('/api/dino/action', {
             method: 'POST',
@@ -211,19 +383,13 @@ document.addEventListener("DOMContentLoaded", function() {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify({
-                game_state: [
-                    distanceToObstacle * 100, 
-                    heightOfObstacle * 50, 
-                    currentSpeed * 20
-                ]
+                game_state: state.gameState
             }),
         })
         .then(response => response.json())
         .then(data => {
             // Execute the action
-            if (data.action && !window.aiDino.jumping) {
-                window.aiDino.jump();
-            }
+            applyDinoAction(data.action);
         })
         .catch(error => {
             console.error('Error getting AI action:', error);
@@ -235,31 +401,54 @@ document.addEventListener("DOMContentLoaded", function() {
         });
     }
     
-    // Make AI decision for Flappy Bird game
-    function makeAIDecisionForFlappy() {
+    // Get the Flappy Bird game state for the AI, or null if there is nothing to decide
+    function getFlappyGameState() {
         // Only make decisions if the game is running
-        if (!window.gameStarted || window.gameOver) return;
+        if (!window.gameStarted || window.gameOver) return null;
         
         // Get game state
         const pipes = window.pipes || [];
-        if (pipes.length === 0) return;
+        if (pipes.length === 0) return null;
         
         // Find the next pipe
         let nextPipe = null;
         for (let i = 0; i < pipes.length; i++) {
-            if (pipes[i].x + pipes[i].width > window.aiBird.x) {
+            if (pipes[i].x + window.PIPE_WIDTH > window.aiBird.x) {
                 nextPipe = pipes[i];
                 break;
             }
         }
         
-        if (!nextPipe) return;
+        if (!nextPipe) return null;
         
         // Calculate inputs for AI
         const horizontalDistance = (nextPipe.x - window.aiBird.x) / window.canvas.width;
         const verticalDistanceTop = (window.aiBird.y - nextPipe.y) / window.canvas.height;
         const verticalDistanceBottom = (nextPipe.y + window.PIPE_GAP - window.aiBird.y) / window.canvas.height;
         
+        return {
+            nextPipe: nextPipe,
+            gameState: [
+                horizontalDistance * 500, 
+                verticalDistanceTop * 400, 
+                verticalDistanceBottom * 400
+            ]
+        };
+    }
+    
+    // Execute an AI action in the Flappy Bird game
+    function applyFlappyAction(action) {
+        if (action) {
+            window.aiBird.flap();
+        }
+    }
+    
+    // Make AI decision for Flappy Bird game
+    function makeAIDecisionForFlappy() {
+        const state = getFlappyGameState();
+        if (!state) return;
+        const nextPipe = state.nextPipe;
+        
         // Call the AI API to get the action
         fetch('/api/flappy/action', {
             method: 'POST',
@@ -267,19 +456,13 @@ document.addEventListener("DOMContentLoaded", function() {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify({
-                game_state: [
-                    horizontalDistance * 500, 
-                    verticalDistanceTop * 400, 
-                    verticalDistanceBottom * 400
-                ]
+                game_state: state.gameState
             }),
         })
         .then(response => response.json())
         .then(data => {
             // Execute the action
-            if (data.action) {
-                window.aiBird.flap();
-            }
+            applyFlappyAction(data.action);
         })
         .catch(error => {
             console.error('Error getting AI action:', error);
@@ -143,50 +143,7 @@ document.addEventListener("DOMContentLoaded", function() {
                 this.jumping = false;
             }
             
-            // AI decision making
-            if (obstacles.length > 0) {
-                // Find the next obstacle
-                let nextObstacle = null;
-                for (let i = 0; i < obstacles.length; i++) {
-                    if (obstacles[i].x + obstacles[i].width > this.x) {
-                        nextObstacle = obstacles[i];
-                        break;
-                    }
-                }
-                
-                if (nextObstacle) {
-                    // Calculate inputs for AI
-                    const distanceToObstacle = (nextObstacle.x - this.x) / canvas.width;
-                    const heightOfObstacle = nextObstacle.height / canvas.height;
-                    const currentSpeed = gameSpeed / 20;
-                    
-                    // Call the AI API to get the action
-                    if (nextObstacle.x - this.x < 200 && !this.jumping) {
-                        // For now, use a simple heuristic
-                        // In a real implementation, this would call the AI model
-                        this.jump();
-                        
-                        // Simulate API call to get AI action
-                        fetch('/api/dino/action', {
-                            method: 'POST',
-                            headers: {
-                                'Content-Type': 'application/json',
-                            },
-                            body: JSON.stringify({
-                                game_state: [distanceToObstacle * 100, heightOfObstacle * 50, currentSpeed * 20]
-                            }),
-                        })
-                        .then(response => response.json())
-                        .then(data => {
-                            // In a real implementation, we would use this action
-                            console.log('AI action:', data.action);
-                        })
-                        .catch(error => {
-                            console.error('Error getting AI action:', error);
-                        });
-                    }
-                }
-            }
+            // Jumps come from ai_connector.js, which runs the trained network
         },
         
         jump: function() {
@@ -565,33 +522,24 @@ document.addEventListener("DOMContentLoaded", function() {
         gameOver = false;
     }
     
-    // Update charts (placeholder)
+    // Update charts from the training metrics
     function updateCharts() {
-        // In a real implementation, this would fetch chart data from the backend
-        fetch('/api/placeholder_charts')
-            .then(response => response.json())
-            .then(data => {
-                const fitnessChart = document.getElementById('dino-fitness-chart');
-                const speciesChart = document.getElementById('dino-species-chart');
-                const networkChart = document.getElementById('dino-network-chart');
-                
-                if (fitnessChart && data.fitness_chart) {
-                    fitnessChart.src = data.fitness_chart;
-                }
-                
-                if (speciesChart && data.species_chart) {
-                    speciesChart.src = data.species_chart;
-                }
-                
-                if (networkChart && data.network_chart) {
-                    networkChart.src = data.network_chart;
-                }
-            })
-            .catch(error => {
-                console.error('Error updating charts:', error);
-            });
+        if (window.metricsCharts && window.metricsCharts.dino) {
+            window.metricsCharts.dino.refresh();
+        }
     }
     
+    // Live game state for ai_connector.js, which runs outside this closure
+    Object.defineProperties(window, {
+        canvas: { get: () => canvas, configurable: true },
+        gameStarted: { get: () => gameStarted, configurable: true },
+        gameOver: { get: () => gameOver, configurable: true },
+        gameSpeed: { get: () => gameSpeed, configurable: true },
+        obstacles: { get: () => obstacles, configurable: true },
+        dino: { get: () => dino, configurable: true },
+        aiDino: { get: () => aiDino, configurable: true }
+    });
+    
     // Initialize game
     if (canvas) {
         // Create initial clouds
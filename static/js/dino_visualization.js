@@ -6,15 +6,15 @@ document.addEventListener("DOMContentLoaded", function() {
     chartContainer.innerHTML = `
         <div class="chart">
             <h3>Fitness Over Generations</h3>
-            <img id="dino-fitness-chart" src="" alt="Fitness Chart">
+            <canvas id="dino-fitness-chart" width="500" height="300"></canvas>
         </div>
         <div class="chart">
             <h3>Species Count</h3>
-            <img id="dino-species-chart" src="" alt="Species Chart">
+            <canvas id="dino-species-chart" width="500" height="300"></canvas>
         </div>
         <div class="chart">
             <h3>Neural Network</h3>
-            <img id="dino-network-chart" src="" alt="Network Structure">
+            <canvas id="dino-network-chart" width="500" height="300"></canvas>
         </div>
     `;
     
@@ -76,11 +76,14 @@ document.addEventListener("DOMContentLoaded", function() {
             container.appendChild(statsContainer);
             container.appendChild(chartContainer);
             
-            // Initialize charts with placeholders
-            fetchPlaceholderCharts();
+            // Draw the charts from the training metrics
+            createMetricsCharts('dino', {
+                fitness: 'dino-fitness-chart',
+                species: 'dino-species-chart',
+                network: 'dino-network-chart'
+            }).refresh();
             
-            // Add event listeners
-            document.getElementById('dino-train-ai-button').addEventListener('click', trainDinoAI);
+            // Add event listeners (ai_connector.js handles the train button)
             document.getElementById('dino-start-button').addEventListener('click', startDinoGame);
             document.getElementById('dino-reset-button').addEventListener('click', resetDinoGame);
             
@@ -92,77 +95,6 @@ document.addEventListener("DOMContentLoaded", function() {
         }
     }
     
-    // Function to fetch placeholder charts
-    function fetchPlaceholderCharts() {
-        fetch('/api/placeholder_charts')
-            .then(response => response.json())
-            .then(data => {
-                const fitnessChart = document.getElementById('dino-fitness-chart');
-                const speciesChart = document.getElementById('dino-species-chart');
-                const networkChart = document.getElementById('dino-network-chart');
-                
-                if (fitnessChart && data.fitness_chart) {
-                    fitnessChart.src = data.fitness_chart;
-                }
-                
-                if (speciesChart && data.species_chart) {
-                    speciesChart.src = data.species_chart;
-                }
-                
-                if (networkChart && data.network_chart) {
-                    networkChart.src = data.network_chart;
-                }
-            })
-            .catch(error => {
-                console.error('Error fetching placeholder charts:', error);
-            });
-    }
-    
-    // Function to train Dino AI
-    function trainDinoAI() {
-        const trainButton = document.getElementById('dino-train-ai-button');
-        trainButton.disabled = true;
-        trainButton.textContent = 'Training...';
-        
-        fetch('/api/dino/train', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                generations: 5
-            }),
-        })
-        .then(response => response.json())
-        .then(data => {
-            // Update charts
-            if (data.fitness_chart) {
-                document.getElementById('dino-fitness-chart').src = data.fitness_chart;
-            }
-            
-            if (data.species_chart) {
-                document.getElementById('dino-species-chart').src = data.species_chart;
-            }
-            
-            if (data.network_chart) {
-                document.getElementById('dino-network-chart').src = data.network_chart;
-            }
-            
-            // Update generation display
-            document.getElementById('dino-generation').textContent = data.generation;
-            
-            // Reset button state
-            trainButton.disabled = false;
-            trainButton.textContent = 'Train AI';
-        })
-        .catch(error => {
-            console.error('Error training AI:', error);
-            // Reset button state
-            trainButton.disabled = false;
-            trainButton.textContent = 'Train AI';
-        });
-    }
-    
     // Function to start Dino game
     function startDinoGame() {
         // Access the gameStarted variable from dino.js and set it to true
@@ -264,25 +196,8 @@ document.addEventListener("DOMContentLoaded", function() {
     
     // Function to update real-time visualizations
     function updateDinoRealTimeVisualizations() {
-        fetch('/api/dino/visualizations')
-            .then(response => response.json())
-            .then(data => {
-                // Update charts if available
-                if (data.fitness_chart) {
-                    document.getElementById('dino-fitness-chart').src = data.fitness_chart;
-                }
-                
-                if (data.species_chart) {
-                    document.getElementById('dino-species-chart').src = data.species_chart;
-                }
-                
-                if (data.network_chart) {
-                    document.getElementById('dino-network-chart').src = data.network_chart;
-                }
-            })
-            .catch(error => {
-                console.error('Error updating visualizations:', error);
-            });
+        // Only the generations added since the last update are fetched
+        window.metricsCharts.dino.refresh();
     }
     
     // Initialize visualization components when the page loads
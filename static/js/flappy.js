@@ -127,30 +127,7 @@ document.addEventListener("DOMContentLoaded", function() {
                 this.velocity = 0;
             }
             
-            // AI decision making
-            if (pipes.length > 0) {
-                // Find the next pipe
-                let nextPipe = null;
-                for (let i = 0; i < pipes.length; i++) {
-                    if (pipes[i].x + PIPE_WIDTH > this.x) {
-                        nextPipe = pipes[i];
-                        break;
-                    }
-                }
-                
-                if (nextPipe) {
-                    // Calculate inputs for AI
-                    const horizontalDistance = (nextPipe.x - this.x) / canvas.width;
-                    const verticalDistanceTop = (this.y - nextPipe.y) / canvas.height;
-                    const verticalDistanceBottom = (nextPipe.y + PIPE_GAP - this.y) / canvas.height;
-                    
-                    // Simulate AI decision (placeholder for actual AI)
-                    // In a real implementation, this would call the AI model
-                    if (Math.random() < 0.05 && this.y > nextPipe.y + PIPE_GAP / 2 - 50) {
-                        this.flap();
-                    }
-                }
-            }
+            // Flaps come from ai_connector.js, which runs the trained network
         },
         
         flap: function() {
@@ -450,16 +427,7 @@ document.addEventListener("DOMContentLoaded", function() {
         resetGame();
     });
     
-    // Train AI button
-    document.getElementById("train-ai-button").addEventListener("click", function() {
-        // This would trigger AI training in a real implementation
-        // For now, we'll just simulate training by incrementing the generation
-        generation += 5;
-        document.getElementById("generation").textContent = generation;
-        
-        // Simulate updating charts
-        updateCharts();
-    });
+    // ai_connector.js handles the train button
     
     // Reset game
     function resetGame() {
@@ -473,13 +441,32 @@ document.addEventListener("DOMContentLoaded", function() {
         gameOver = false;
     }
     
-    // Update charts (placeholder)
+    // Update charts from the training metrics
     function updateCharts() {
-        // In a real implementation, this would fetch chart data from the backend
-        // For now, we'll just use placeholder images
-        document.getElementById("fitness-chart").src = "/static/images/placeholder_fitness.png";
-        document.getElementById("species-chart").src = "/static/images/placeholder_species.png";
-        document.getElementById("network-chart").src = "/static/images/placeholder_network.png";
+        if (window.metricsCharts && window.metricsCharts.flappy) {
+            window.metricsCharts.flappy.refresh();
+        }
+    }
+    
+    // Live game state for ai_connector.js, which runs outside this closure
+    Object.defineProperties(window, {
+        canvas: { get: () => canvas, configurable: true },
+        gameStarted: { get: () => gameStarted, configurable: true },
+        gameOver: { get: () => gameOver, configurable: true },
+        pipes: { get: () => pipes, configurable: true },
+        bird: { get: () => bird, configurable: true },
+        aiBird: { get: () => aiBird, configurable: true }
+    });
+    window.PIPE_GAP = PIPE_GAP;
+    window.PIPE_WIDTH = PIPE_WIDTH;
+    
+    // Draw the charts from the training metrics
+    if (window.createMetricsCharts) {
+        window.createMetricsCharts('flappy', {
+            fitness: 'fitness-chart',
+            species: 'species-chart',
+            network: 'network-chart'
+        });
     }
     
     // Initialize game
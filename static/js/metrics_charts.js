@@ -0,0 +1,174 @@
+// Client-side training charts drawn from the incremental /api/<game>/metrics feed
+(function() {
+    const NODE_COLORS = {
+        input: 'lightblue',
+        hidden: 'lightgray',
+        output: 'lightgreen'
+    };
+
+    // Charts registered per game, so other scripts can refresh them after training
+    window.metricsCharts = window.metricsCharts || {};
+
+    // Create the charts for a game and register them under window.metricsCharts
+    function createMetricsCharts(game, canvasIds) {
+        const charts = {
+            cursor: 0,
+            generations: [],
+            network: null,
+            refresh: refresh
+        };
+
+        // Fetch the generations added since the last refresh and redraw
+        function refresh() {
+            return fetch(`/api/${game}/metrics?since=${charts.cursor}`)
+                .then(response => response.json())
+                .then(data => {
+                    // The server's history was reset (e.g. restarted), start over
+                    if (data.reset) {
+                        charts.generations = [];
+                    }
+
+                    charts.generations = charts.generations.concat(data.generations);
+                    charts.cursor = data.cursor;
+                    charts.network = data.network;
+                    draw();
+                    return data;
+                })
+                .catch(error => {
+                    console.error(`Error fetching ${game} metrics:`, error);
+                });
+        }
+
+        function draw() {
+            const generations = charts.generations.map(g => g.generation);
+
+            drawLineChart(document.getElementById(canvasIds.fitness), 'Fitness over Generations', generations, [
+                { label: 'Best Fitness', color: 'blue', values: charts.generations.map(g => g.best_fitness) },
+                { label: 'Average Fitness', color: 'red', values: charts.generations.map(g => g.avg_fitness) }
+            ]);
+
+            drawLineChart(document.getElementById(canvasIds.species), 'Species Count over Generations', generations, [
+                { label: 'Species', color: 'green', values: charts.generations.map(g => g.species_count) }
+            ]);
+
+            drawNetwork(document.getElementById(canvasIds.network), charts.network);
+        }
+
+        window.metricsCharts[game] = charts;
+        return charts;
+    }
+
+    function clearCanvas(canvas, title) {
+        const ctx = canvas.getContext('2d');
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        ctx.fillStyle = 'black';
+        ctx.font = '14px sans-serif';
+        ctx.textAlign = 'center';
+        ctx.fillText(title, canvas.width / 2, 18);
+        return ctx;
+    }
+
+    // Draw one or more series against the generation number
+    function drawLineChart(canvas, title, xs, series) {
+        if (!canvas) return;
+
+        const ctx = clearCanvas(canvas, title);
+        const left = 45, right = canvas.width - 10, top = 30, bottom = canvas.height - 25;
+
+        if (xs.length === 0) {
+            ctx.fillStyle = 'gray';
+            ctx.fillText('No training data yet', canvas.width / 2, canvas.height / 2);
+            return;
+        }
+
+        const values = series.flatMap(s => s.values);
+        const minY = Math.min(0, ...values);
+        const maxY = Math.max(...values, minY + 1);
+        const minX = xs[0];
+        const maxX = Math.max(xs[xs.length - 1], minX + 1);
+        const px = x => left + (x - minX) / (maxX - minX) * (right - left);
+        const py = y => bottom - (y - minY) / (maxY - minY) * (bottom - top);
+
+        // Axes and labels
+        ctx.strokeStyle = '#ccc';
+        ctx.strokeRect(left, top, right - left, bottom - top);
+        ctx.fillStyle = 'black';
+        ctx.font = '11px sans-serif';
+        ctx.textAlign = 'right';
+        ctx.fillText(maxY.toFixed(0), left - 4, top + 8);
+        ctx.fillText(minY.toFixed(0), left - 4, bottom);
+        ctx.textAlign = 'center';
+        ctx.fillText(`Generation ${minX}`, left + 40, bottom + 16);
+        ctx.fillText(`${xs[xs.length - 1]}`, right - 10, bottom + 16);
+
+        series.forEach((s, i) => {
+            ctx.strokeStyle = s.color;
+            ctx.lineWidth = 2;
+            ctx.beginPath();
+            s.values.forEach((y, j) => {
+                if (j === 0) {
+                    ctx.moveTo(px(xs[j]), py(y));
+                } else {
+                    ctx.lineTo(px(xs[j]), py(y));
+                }
+            });
+            ctx.stroke();
+
+            // Legend
+            ctx.fillStyle = s.color;
+            ctx.textAlign = 'left';
+            ctx.fillText(s.label, left + 6, top + 14 + i * 14);
+        });
+    }
+
+    // Draw the network with inputs on the left, hidden nodes in the middle
+    // and outputs on the right
+    function drawNetwork(canvas, network) {
+        if (!canvas) return;
+
+        const ctx = clearCanvas(canvas, 'Neural Network Structure');
+        if (!network) {
+            ctx.fillStyle = 'gray';
+            ctx.fillText('No trained network yet', canvas.width / 2, canvas.height / 2);
+            return;
+        }
+
+        const columns = { input: 0.1, hidden: 0.5, output: 0.9 };
+        const positions = {};
+        ['input', 'hidden', 'output'].forEach(type => {
+            const nodes = network.nodes.filter(n => n.type === type);
+            nodes.forEach((node, i) => {
+                positions[node.id] = {
+                    x: columns[type] * canvas.width,
+                    y: 30 + (i + 1) / (nodes.length + 1) * (canvas.height - 30),
+                    node: node
+                };
+            });
+        });
+
+        // Green for positive weights, red for negative, width by magnitude
+        network.connections.forEach(c => {
+            const from = positions[c.from], to = positions[c.to];
+            if (!from || !to) return;
+            ctx.strokeStyle = c.weight > 0 ? 'green' : 'red';
+            ctx.lineWidth = Math.max(0.5, Math.min(4, Math.abs(c.weight)));
+            ctx.beginPath();
+            ctx.moveTo(from.x, from.y);
+            ctx.lineTo(to.x, to.y);
+            ctx.stroke();
+        });
+
+        Object.values(positions).forEach(p => {
+            ctx.fillStyle = NODE_COLORS[p.node.type];
+            ctx.beginPath();
+            ctx.arc(p.x, p.y, 12, 0, 2 * Math.PI);
+            ctx.fill();
+            ctx.fillStyle = 'black';
+            ctx.font = '10px sans-serif';
+            ctx.textAlign = 'center';
+            ctx.fillText(String(p.node.id), p.x, p.y + 3);
+        });
+    }
+
+    window.createMetricsCharts = createMetricsCharts;
+})();
@@ -0,0 +1,142 @@
+// Runs the trained Dino/Flappy network in the browser, from the model exported by /api/<game>/model
+(function() {
+    const MODEL_FORMAT = 1;
+
+    function clip(z, low, high) {
+        return Math.max(low, Math.min(high, z));
+    }
+
+    // Same definitions as neat-python's activation functions
+    const ACTIVATIONS = {
+        sigmoid: z => 1.0 / (1.0 + Math.exp(-clip(5.0 * z, -60.0, 60.0))),
+        tanh: z => Math.tanh(clip(2.5 * z, -60.0, 60.0)),
+        sin: z => Math.sin(clip(5.0 * z, -60.0, 60.0)),
+        gauss: z => Math.exp(-5.0 * clip(z, -3.4, 3.4) ** 2),
+        relu: z => z > 0.0 ? z : 0.0,
+        softplus: z => 0.2 * Math.log(1 + Math.exp(clip(5.0 * z, -60.0, 60.0))),
+        identity: z => z,
+        clamped: z => clip(z, -1.0, 1.0),
+        inv: z => z === 0.0 || !isFinite(1.0 / z) ? 0.0 : 1.0 / z,
+        log: z => Math.log(Math.max(1e-7, z)),
+        exp: z => Math.exp(clip(z, -60.0, 60.0)),
+        abs: z => Math.abs(z),
+        hat: z => Math.max(0.0, 1 - Math.abs(z)),
+        square: z => z ** 2,
+        cube: z => z ** 3
+    };
+
+    // Same definitions as neat-python's aggregation functions
+    const AGGREGATIONS = {
+        sum: x => x.reduce((a, b) => a + b, 0),
+        product: x => x.reduce((a, b) => a * b, 1.0),
+        max: x => Math.max(...x),
+        min: x => Math.min(...x),
+        maxabs: x => x.reduce((a, b) => Math.abs(b) > Math.abs(a) ? b : a),
+        median: x => {
+            const sorted = x.slice().sort((a, b) => a - b);
+            const middle = Math.floor(sorted.length / 2);
+            return sorted.length % 2 ? sorted[middle] : (sorted[middle - 1] + sorted[middle]) / 2.0;
+        },
+        mean: x => x.reduce((a, b) => a + b, 0) / x.length
+    };
+
+    class NeatModel {
+        constructor(data) {
+            if (data.format !== MODEL_FORMAT) {
+                throw new Error(`Unsupported model format ${data.format}`);
+            }
+            this.game = data.game;
+            this.inputScale = data.input_scale;
+            this.threshold = data.threshold;
+            this.nInputs = data.inputs;
+            this.outputs = data.outputs;
+            this.values = new Float64Array(data.inputs + data.nodes.length);
+            this.nodes = data.nodes.map(([activation, aggregation, bias, response, inputs, weights]) => ({
+                activation: ACTIVATIONS[activation],
+                // Sums are accumulated inline, without building the input list
+                aggregation: aggregation === 'sum' ? null : AGGREGATIONS[aggregation],
+                bias: bias,
+                response: response,
+                inputs: inputs,
+                weights: weights
+            }));
+        }
+
+        // Evaluate the network on already normalized inputs
+        activate(inputs) {
+            const values = this.values;
+            for (let i = 0; i < this.nInputs; i++) {
+                values[i] = inputs[i];
+            }
+            for (let n = 0; n < this.nodes.length; n++) {
+                const node = this.nodes[n];
+                let s;
+                if (node.aggregation === null) {
+                    s = 0;
+                    for (let j = 0; j < node.inputs.length; j++) {
+                        s += values[node.inputs[j]] * node.weights[j];
+                    }
+                } else {
+                    s = node.aggregation(node.inputs.map((column, j) => values[column] * node.weights[j]));
+                }
+                values[this.nInputs + n] = node.activation(node.bias + node.response * s);
+            }
+            return this.outputs.map(column => column < 0 ? 0.0 : values[column]);
+        }
+
+        // The action for a raw game state, as the server's get_action would return it
+        decide(gameState) {
+            const inputs = gameState.map((value, i) => value / this.inputScale[i]);
+            return this.activate(inputs)[0] > this.threshold;
+        }
+    }
+
+    // Keep a game's model current, revalidating with the last ETag so an
+    // unchanged model costs a 304 with no body
+    function createModelPoller(game, interval) {
+        const poller = {
+            model: null,
+            etag: null,
+            timer: null,
+            refresh: refresh,
+            stop: stop
+        };
+
+        function refresh() {
+            const headers = poller.etag ? { 'If-None-Match': poller.etag } : {};
+            return fetch(`/api/${game}/model`, { headers: headers, cache: 'no-cache' })
+                .then(response => {
+                    if (response.status === 304) return poller.model;
+                    if (!response.ok) {
+                        // No trained model yet, or one the browser can't run
+                        poller.model = null;
+                        poller.etag = null;
+                        return null;
+                    }
+                    const etag = response.headers.get('ETag');
+                    return response.json().then(data => {
+                        poller.model = new NeatModel(data);
+                        poller.etag = etag;
+                        return poller.model;
+                    });
+                })
+                .catch(error => {
+                    console.error(`Error fetching ${game} model:`, error);
+                    return poller.model;
+                });
+        }
+
+        function stop() {
+            if (poller.timer) {
+                clearInterval(poller.timer);
+                poller.timer = null;
+            }
+        }
+
+        poller.timer = setInterval(refresh, interval || 5000);
+        return poller;
+    }
+
+    window.NeatModel = NeatModel;
+    window.createModelPoller = createModelPoller;
+})();
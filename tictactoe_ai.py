@@ -0,0 +1,189 @@
+WIN_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+)
+
+# The 8 symmetries of the board (rotations and reflections), each as the
+# cell index that lands on cells 0..8
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),
+)
+
+# Transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+def check_winner(board):
+    """
+    Get the result of a board.
+
+    Args:
+        board: 9 cells holding 'X', 'O' or ''
+
+    Returns:
+        str: The winning symbol, 'Draw', or None if the game is not over
+    """
+    for a, b, c in WIN_LINES:
+        if board[a] and board[a] == board[b] == board[c]:
+            return board[a]
+    if all(cell for cell in board):
+        return 'Draw'
+    return None
+
+def canonical(board):
+    """
+    Get the representative of a board's symmetry class.
+
+    Args:
+        board (tuple): 9 cells
+
+    Returns:
+        tuple: The smallest of the board's 8 symmetric images
+    """
+    return min(tuple(board[i] for i in symmetry) for symmetry in SYMMETRIES)
+
+class TicTacToeSolver:
+    """
+    Perfect tic-tac-toe player.
+
+    Positions are searched with negamax and alpha-beta pruning. Results go in
+    a transposition table keyed by the canonical board and the player to
+    move, so each of the 8 symmetric images of a position is only searched
+    once. precompute() solves every position reachable with X moving first,
+    after which best_move is a dictionary lookup.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty solver.
+        """
+        # (canonical board, player to move) -> (value, flag)
+        self.transpositions = {}
+
+        # (board, player to move) -> (score, move), filled by precompute()
+        self.moves = {}
+
+        # Positions visited by _negamax, for benchmarking
+        self.nodes = 0
+
+    def precompute(self):
+        """
+        Solve every position reachable from the empty board with X first.
+
+        Returns:
+            int: Number of positions in the table (5,478)
+        """
+        stack = [(('',) * 9, 'X')]
+        while stack:
+            board, player = stack.pop()
+            if (board, player) in self.moves:
+                continue
+
+            opponent = 'O' if player == 'X' else 'X'
+            self.moves[(board, player)] = self._solve(board, player, opponent)
+
+            if check_winner(board) is None:
+                for idx in range(9):
+                    if not board[idx]:
+                        stack.append((board[:idx] + (player,) + board[idx + 1:], opponent))
+
+        return len(self.moves)
+
+    def best_move(self, board, ai_symbol, human_symbol):
+        """
+        Get the AI's best move, the lowest index among equally good moves.
+
+        Args:
+            board: 9 cells holding 'X', 'O' or ''
+            ai_symbol (str): Symbol of the player to move
+            human_symbol (str): Symbol of the other player
+
+        Returns:
+            tuple: (score, move) where score is 1 for a win, 0 for a draw and
+                -1 for a loss, and move is None if the game is over
+        """
+        board = tuple(cell or '' for cell in board)
+        result = self.moves.get((board, ai_symbol))
+        if result is None:
+            result = self._solve(board, ai_symbol, human_symbol)
+        return result
+
+    def _solve(self, board, player, opponent):
+        """
+        Search a position for its value and best move.
+        """
+        winner = check_winner(board)
+        if winner == player:
+            return 1, None
+        if winner == opponent:
+            return -1, None
+        if winner == 'Draw':
+            return 0, None
+
+        # With values limited to -1..1, the full window gives every child's
+        # exact value, so ties are broken by index as before
+        best_score, best_move = -2, None
+        for idx in range(9):
+            if not board[idx]:
+                child = board[:idx] + (player,) + board[idx + 1:]
+                score = -self._negamax(child, opponent, player, -1, 1)
+                if score > best_score:
+                    best_score, best_move = score, idx
+        return best_score, best_move
+
+    def _negamax(self, board, player, opponent, alpha, beta):
+        """
+        Get a position's value for the player to move.
+
+        Args:
+            board (tuple): 9 cells
+            player (str): Symbol of the player to move
+            opponent (str): Symbol of the other player
+            alpha (int): Value the player is already guaranteed
+            beta (int): Value the opponent is already guaranteed
+
+        Returns:
+            int: The exact value if it lies inside (alpha, beta), otherwise a
+                bound on the same side of the window
+        """
+        self.nodes += 1
+        winner = check_winner(board)
+        if winner is not None:
+            return 0 if winner == 'Draw' else (1 if winner == player else -1)
+
+        key = (canonical(board), player)
+        entry = self.transpositions.get(key)
+        if entry is not None:
+            value, flag = entry
+            if (flag == EXACT or (flag == LOWER and value >= beta) or
+                    (flag == UPPER and value <= alpha)):
+                return value
+
+        original_alpha = alpha
+        best = -2
+        for idx in range(9):
+            if not board[idx]:
+                child = board[:idx] + (player,) + board[idx + 1:]
+                value = -self._negamax(child, opponent, player, -beta, -alpha)
+                if value > best:
+                    best = value
+                    if value > alpha:
+                        alpha = value
+                        if alpha >= beta:
+                            break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transpositions[key] = (best, flag)
+        return best
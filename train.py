@@ -0,0 +1,189 @@
+"""
+Train the Dino or Flappy Bird AI from the command line, without the web app.
+
+No charts are rendered. Progress, generations/sec and evaluations/sec are
+printed as training runs, and the population is checkpointed at the end
+(and on Ctrl-C) in the compact format. When the output directory is the
+app's checkpoint directory, the web server restores the result at its next
+start.
+
+Usage:
+    python train.py dino --generations 200 --seed 1 --workers 4
+    python train.py flappy --generations 50 --vectorized --checkpoint-dir runs/flappy
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+from evaluation_budget import EvaluationBudget
+
+GAMES = {
+    'dino': ('dino_ai', 'DinoGameAI'),
+    'flappy': ('flappy_ai', 'FlappyBirdAI'),
+}
+
+def build_ai(game, args):
+    """
+    Create the game's AI from the command-line options.
+    """
+    module, name = GAMES[game]
+    ai_class = getattr(__import__(module), name)
+    start_frames, frames_per_generation = args.curriculum or (None, 0)
+    budget = EvaluationBudget(
+        max_frames=args.max_frames,
+        max_seconds=args.max_seconds,
+        top_k=args.top_k,
+        start_frames=start_frames,
+        frames_per_generation=frames_per_generation,
+        episodes=args.episodes or None,
+        course_generations=args.course_generations or None,
+    )
+    return ai_class(
+        config_file=args.config,
+        num_workers=args.workers,
+        seed=args.seed,
+        vectorized=args.vectorized,
+        restore=args.resume,
+        checkpoint_dir=args.checkpoint_dir,
+        budget=budget,
+    )
+
+def curriculum(value):
+    """
+    Parse a START:STEP curriculum option.
+    """
+    try:
+        start, step = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected START:STEP, e.g. 200:50')
+    return start, step
+
+def train(ai, generations, report_every=1, quiet=True):
+    """
+    Train one generation at a time, printing progress.
+
+    Args:
+        ai: DinoGameAI or FlappyBirdAI
+        generations (int): Generations to run
+        report_every (int): Generations between progress lines
+        quiet (bool): Hide the per-generation output of NEAT and the AI
+
+    Returns:
+        dict: generations, evaluations, seconds and best_fitness
+    """
+    neat_algorithm = ai.neat_algorithm
+    evaluations = 0
+    done = 0
+    start = time.perf_counter()
+    try:
+        for done in range(1, generations + 1):
+            population_size = len(neat_algorithm.population.population)
+            output = io.StringIO() if quiet else sys.stdout
+            with contextlib.redirect_stdout(output):
+                ai.train(1)
+            evaluations += population_size
+
+            if done % report_every == 0 or done == generations:
+                elapsed = time.perf_counter() - start
+                print(f"generation {ai.current_generation:5d}  best {ai.best_fitness:10.2f}  "
+                      f"{done / elapsed:7.2f} gen/s  {evaluations / elapsed:9.1f} eval/s",
+                      flush=True)
+    except KeyboardInterrupt:
+        done -= 1
+        print("Interrupted, saving progress")
+
+    return {
+        'generations': done,
+        'evaluations': evaluations,
+        'seconds': time.perf_counter() - start,
+        'best_fitness': ai.best_fitness,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('game', choices=sorted(GAMES))
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for a reproducible run, which starts a fresh population')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes evaluating genomes in parallel')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='simulate the whole population at once (about 2x faster for dino and '
+                             '1.2x for flappy on shared courses, break-even on one course per genome)')
+    parser.add_argument('--checkpoint-dir', default='checkpoints',
+                        help='where checkpoints and the best genome are written')
+    parser.add_argument('--fresh', dest='resume', action='store_false',
+                        help='start a new population instead of resuming the latest checkpoint')
+    parser.add_argument('--keep-checkpoints', type=int, default=None,
+                        help='delete all but this many of the newest checkpoints at the end')
+    parser.add_argument('--max-frames', type=int, default=1000,
+                        help='longest episode per genome')
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='longest wall time per episode')
+    parser.add_argument('--top-k', type=int, default=None,
+                        help='stop episodes that cannot beat the top k of their generation '
+                             '(serial evaluation only)')
+    parser.add_argument('--curriculum', type=curriculum, default=None, metavar='START:STEP',
+                        help='start with START frames per episode and add STEP per generation')
+    parser.add_argument('--episodes', type=int, default=3,
+                        help='courses shared by every genome of a generation '
+                             '(0 for one course per genome)')
+    parser.add_argument('--course-generations', type=int, default=10,
+                        help='generations that play the same courses before new ones are drawn '
+                             '(0 to keep them for the whole run)')
+    parser.add_argument('--config', default='neat_config.txt')
+    parser.add_argument('--report-every', type=int, default=1)
+    parser.add_argument('--verbose', action='store_true',
+                        help='show the NEAT reporter output for every generation')
+    args = parser.parse_args(argv)
+    if args.generations < 1:
+        parser.error('--generations must be at least 1')
+    if args.report_every < 1:
+        parser.error('--report-every must be at least 1')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.max_frames < 1:
+        parser.error('--max-frames must be at least 1')
+    if args.max_seconds is not None and args.max_seconds <= 0:
+        parser.error('--max-seconds must be positive')
+    if args.top_k is not None and args.top_k < 1:
+        parser.error('--top-k must be at least 1')
+    if args.episodes < 0:
+        parser.error('--episodes must be at least 0')
+    if args.course_generations < 0:
+        parser.error('--course-generations must be at least 0')
+
+    # A resumed population has its own random state, so a seed only makes a
+    # run reproducible from the start
+    if args.seed is not None:
+        args.resume = False
+
+    ai = build_ai(args.game, args)
+    neat_algorithm = ai.neat_algorithm
+    print(f"Training {args.game} for {args.generations} generations from generation "
+          f"{neat_algorithm.population.generation} ({args.workers} worker(s), "
+          f"{'vectorized' if args.vectorized else 'per genome'})")
+
+    result = train(ai, args.generations, args.report_every, quiet=not args.verbose)
+
+    # Checkpoint the final population; the best genome was saved as it improved
+    path = neat_algorithm.save_checkpoint()
+    neat_algorithm.close()
+    if args.keep_checkpoints is not None:
+        neat_algorithm.prune_checkpoints(keep=max(1, args.keep_checkpoints))
+
+    seconds = max(result['seconds'], 1e-9)
+    print(f"{result['generations']} generations, {result['evaluations']} evaluations in "
+          f"{seconds:.1f}s: {result['generations'] / seconds:.2f} gen/s, "
+          f"{result['evaluations'] / seconds:.1f} eval/s")
+    print(f"Best fitness {result['best_fitness']:.2f}")
+    print(f"Checkpoint: {path}")
+    if os.path.exists(neat_algorithm.best_genome_path()):
+        print(f"Best genome: {neat_algorithm.best_genome_path()}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
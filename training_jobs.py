@@ -0,0 +1,222 @@
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from profiling import ProfileCapture
+
+class TrainingJob:
+    """
+    A request to train one game AI for a number of generations.
+    """
+
+    def __init__(self, job_id, game, generations, session=None, profile=False):
+        """
+        Initialize the job.
+
+        Args:
+            job_id (str): Unique job identifier
+            game (str): Name of the game AI to train
+            generations (int): Number of generations to run
+            session (str): Session whose AI is trained
+            profile (bool): Run the training under cProfile and add the
+                summary to the result
+        """
+        self.job_id = job_id
+        self.game = game
+        self.session = session
+        self.generations = generations
+        self.profile = profile
+        self.generations_done = 0
+        self.status = 'queued'
+        self.error = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'cancelled', 'failed')
+
+    def to_dict(self):
+        """
+        Get a JSON-serializable view of the job.
+
+        Returns:
+            dict: Job id, status, progress and result
+        """
+        return {
+            'job_id': self.job_id,
+            'game': self.game,
+            'status': self.status,
+            'generations': self.generations,
+            'generations_done': self.generations_done,
+            'profile': self.profile,
+            'progress': self.generations_done / self.generations if self.generations else 1.0,
+            'error': self.error,
+            'result': self.result,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+class TrainingJobManager:
+    """
+    Runs training jobs in the background, one worker thread per AI with
+    queued jobs.
+
+    Jobs for the same AI (game and session) are queued and run one at a
+    time, so two train requests never race on the same NEAT population.
+    Jobs for different AIs run side by side, at most max_concurrent
+    generations at a time, taking turns a generation at a time. Request
+    threads only enqueue jobs and read their status, so action requests
+    keep being served while AIs train.
+    """
+
+    def __init__(self, lease_ai, games, max_concurrent=2, max_finished_jobs=100):
+        """
+        Initialize the manager.
+
+        Args:
+            lease_ai: Function taking a game name and a session and returning
+                a context manager that yields the AI (with train(generations),
+                current_generation and best_fitness) for the job's duration
+            games: Names of the games that can be trained
+            max_concurrent (int): Most generations trained at the same time
+            max_finished_jobs (int): Finished jobs kept for status queries
+        """
+        self.lease_ai = lease_ai
+        self.games = set(games)
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = OrderedDict()
+        self._queues = {}
+        self._slots = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(self, game, generations, session=None, profile=False):
+        """
+        Queue a training job.
+
+        Args:
+            game (str): Name of the game AI to train
+            generations (int): Number of generations to run
+            session (str): Session whose AI is trained
+            profile (bool): Capture a cProfile summary of the training
+
+        Returns:
+            TrainingJob: The queued job
+        """
+        if game not in self.games:
+            raise KeyError(game)
+
+        key = (game, session)
+        with self._lock:
+            job = TrainingJob(f"{game}-{next(self._ids)}", game, generations, session, profile)
+            self._jobs[job.job_id] = job
+            self._prune()
+            # A worker exists exactly while its AI has queued jobs
+            if key not in self._queues:
+                self._queues[key] = queue.Queue()
+                worker = threading.Thread(
+                    target=self._work, args=(key,), name=f'train-{game}', daemon=True
+                )
+                worker.start()
+            self._queues[key].put(job)
+
+        return job
+
+    def get(self, job_id):
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): The job identifier
+
+        Returns:
+            TrainingJob: The job, or None if unknown
+        """
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs never start, a running job stops after its
+        current generation.
+
+        Args:
+            job_id (str): The job identifier
+
+        Returns:
+            TrainingJob: The job, or None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_requested.set()
+        return job
+
+    def _prune(self):
+        """
+        Drop the oldest finished jobs beyond max_finished_jobs.
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def _work(self, key):
+        """
+        Run an AI's queued jobs one after another, then exit.
+        """
+        jobs = self._queues[key]
+        while True:
+            with self._lock:
+                if jobs.empty():
+                    del self._queues[key]
+                    return
+                job = jobs.get()
+            self._run(job)
+
+    def _run(self, job):
+        """
+        Train an AI one generation at a time so the job can report progress
+        and be cancelled between generations.
+        """
+        if job.cancel_requested.is_set():
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            return
+
+        job.status = 'running'
+        job.started_at = time.time()
+        status = 'completed'
+        # Only the generations themselves are profiled, not waiting for a slot
+        capture = ProfileCapture() if job.profile else None
+        try:
+            with self.lease_ai(job.game, job.session) as ai:
+                try:
+                    for _ in range(job.generations):
+                        if job.cancel_requested.is_set():
+                            status = 'cancelled'
+                            break
+                        with self._slots, capture or nullcontext():
+                            ai.train(1)
+                        job.generations_done += 1
+                finally:
+                    # Publish the result before the status so pollers never
+                    # see a finished job without one
+                    result = {
+                        'generation': ai.current_generation,
+                        'best_fitness': ai.best_fitness,
+                    }
+                    if capture is not None:
+                        result['profile'] = capture.report()
+                    job.result = result
+        except Exception as e:
+            status = 'failed'
+            job.error = str(e)
+
+        job.finished_at = time.time()
+        job.status = status